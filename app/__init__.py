@@ -7,6 +7,7 @@ import warnings
 
 from flask import Flask
 
+from .cache import init_cache, init_response_cache
 from .config import get_config
 from .encoder import CustomJSONProvider
 from .exceptions import register_error_handlers
@@ -45,6 +46,9 @@ def create_app(config_class=None):
     # 配置自定义 JSON 提供者
     app.json = CustomJSONProvider(app)
 
+    # 初始化扩展（缓存、线程池等）
+    init_extensions(app)
+
     # 注册异常处理器
     register_error_handlers(app)
 
@@ -54,6 +58,50 @@ def create_app(config_class=None):
     return app
 
 
+def init_extensions(app):
+    """
+    初始化应用扩展
+
+    Args:
+        app: Flask 应用实例
+    """
+    from app.api import init_batch
+    from app.history import init_history
+    from app.jobs import init_jobs
+    from app.prewarm import init_prewarm
+    from app.snapshot import init_snapshots
+    from app.subscriptions import init_subscriptions
+    from app.upstream import init_limiter, init_registry, load_akshare
+
+    load_akshare(app)
+    init_registry(app)
+    init_cache(app)
+    init_response_cache(app)
+    init_history(app)
+    init_snapshots(app)
+    init_limiter(app)
+    init_batch(app)
+    init_jobs(app)
+    init_prewarm(app)
+    init_subscriptions(app)
+
+    # gunicorn preload 模式下后台线程无法跨 fork 保留，由工作进程启动后调用 start_background_tasks
+    if not app.config.get('DEFER_BACKGROUND_TASKS', False):
+        start_background_tasks(app)
+
+
+def start_background_tasks(app):
+    """
+    启动后台线程（缓存预热调度）
+
+    Args:
+        app: Flask 应用实例
+    """
+    prewarmer = app.extensions['akgate_prewarmer']
+    if app.config.get('PREWARM_ENABLED', False) and prewarmer.tasks:
+        prewarmer.start()
+
+
 def register_blueprints(app):
     """
     注册所有蓝图
@@ -63,6 +111,11 @@ def register_blueprints(app):
     """
     from app.api import api
     from app.health import health
+    from app.jobs import jobs
+    from app.metrics import metrics
 
     app.register_blueprint(api, url_prefix='/api')
     app.register_blueprint(health)
+    app.register_blueprint(jobs)
+    if app.config.get('METRICS_ENABLED', True):
+        app.register_blueprint(metrics)
@@ -1,2 +1,4 @@
 from .views import api
-
+from .batch import init_batch
+from . import jobs  # noqa: F401  注册异步调用路由
+from . import subscribe  # noqa: F401  注册订阅推送路由
@@ -0,0 +1,146 @@
+"""
+批量调用模块
+
+``POST /api/_batch`` 在一次请求中执行多个 akshare 调用，
+各调用在有界线程池中并行执行，逐项返回结果或错误
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import Response, current_app, request
+
+from app.exceptions import APIError, InvalidParameterError
+from app.logging_config import get_logger
+from .params import is_enabled
+from .query import Query
+from .views import api, apply_query, dumps_result, fetch_result, prepare_call
+
+logger = get_logger('batch')
+
+
+def init_batch(app):
+    """
+    初始化批量调用线程池
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_batch_executor'] = ThreadPoolExecutor(
+        max_workers=app.config.get('BATCH_MAX_WORKERS', 8),
+        thread_name_prefix='akgate-batch',
+    )
+
+
+def parse_batch_items(payload) -> list:
+    """
+    解析并校验批量请求体
+
+    请求体可以是调用列表，也可以是 ``{"items": [...]}``，
+    每项形如 ``{"function": "stock_zh_a_hist", "params": {"symbol": "000001"}}``
+
+    Args:
+        payload: 解析后的 JSON 请求体
+
+    Returns:
+        (函数名, 参数字典) 元组列表
+
+    Raises:
+        InvalidParameterError: 请求体格式不合法或调用数超过上限
+    """
+    items = payload.get('items') if isinstance(payload, dict) else payload
+    if not isinstance(items, list) or not items:
+        raise InvalidParameterError("Batch request must contain a non-empty list of items")
+
+    max_items = current_app.config.get('BATCH_MAX_ITEMS', 500)
+    if len(items) > max_items:
+        raise InvalidParameterError(f"Batch request exceeds the limit of {max_items} items")
+
+    calls = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('function'), str):
+            raise InvalidParameterError(f"Item {index}: 'function' must be a string")
+        params = item.get('params') or {}
+        if not isinstance(params, dict):
+            raise InvalidParameterError(f"Item {index}: 'params' must be an object")
+        if any(isinstance(value, (list, dict)) for value in params.values()):
+            raise InvalidParameterError(f"Item {index}: parameter values must be scalars")
+        calls.append((item['function'], params))
+    return calls
+
+
+def run_batch_item(app, index: int, func_name: str, raw_params: dict) -> str:
+    """
+    在应用上下文中执行单个调用，并编码为 JSON 对象字符串
+
+    Args:
+        app: Flask 应用实例
+        index: 调用在请求中的序号
+        func_name: 函数名称
+        raw_params: 调用参数，下划线开头的查询条件参数同样适用
+
+    Returns:
+        JSON 对象字符串
+    """
+    with app.app_context():
+        meta = {'index': index, 'function': func_name}
+        try:
+            func, params, options = prepare_call(func_name, raw_params)
+            query = Query.from_options(options)
+            lookup = fetch_result(func_name, func, params)
+            result, _ = apply_query(lookup.value, query)
+            data = dumps_result(result)
+            meta.update({'status': 200, 'cache': lookup.status})
+            return _encode_item(meta, 'data', data)
+        except APIError as e:
+            meta['status'] = e.status_code
+            return _encode_item(meta, 'error', app.json.dumps(e.to_dict()))
+        except Exception as e:
+            logger.error(f"Batch item error: {func_name} - {e}", exc_info=True)
+            meta['status'] = 500
+            error = {'error': True, 'error_code': 'INTERNAL_ERROR', 'message': 'Internal server error'}
+            return _encode_item(meta, 'error', app.json.dumps(error))
+
+
+def _encode_item(meta: dict, name: str, value: str) -> str:
+    # 直接拼接已编码的数据，避免对大结果做二次解析和编码
+    head = current_app.json.dumps(meta)
+    return f'{head[:-1]}, "{name}": {value}}}'
+
+
+@api.route("/_batch", methods=['POST'])
+def call_batch():
+    """
+    批量调用 akshare 函数
+
+    Query Parameters:
+        _stream: 为 1 时以 NDJSON 流式返回，每项完成即输出（顺序为完成顺序）
+
+    Returns:
+        ``{"count": n, "results": [...]}``，results 按请求顺序排列，
+        每项包含 index / function / status，以及 data 或 error
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        raise InvalidParameterError("Request body must be JSON")
+    calls = parse_batch_items(payload)
+
+    app = current_app._get_current_object()
+    executor = app.extensions['akgate_batch_executor']
+    futures = [
+        executor.submit(run_batch_item, app, index, func_name, params)
+        for index, (func_name, params) in enumerate(calls)
+    ]
+    logger.info(f"Batch call: {len(calls)} items")
+
+    stream = (
+        is_enabled(request.args.get('_stream', ''))
+        or request.accept_mimetypes.best == 'application/x-ndjson'
+    )
+    if stream:
+        def generate():
+            for future in as_completed(futures):
+                yield future.result() + '\n'
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    results = [future.result() for future in futures]
+    body = f'{{"count": {len(results)}, "results": [{", ".join(results)}]}}'
+    return Response(body, mimetype='application/json')
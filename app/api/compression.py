@@ -0,0 +1,134 @@
+"""
+响应压缩模块
+
+按 Accept-Encoding 协商 zstd / br / gzip 压缩，brotli 与 zstandard 为可选依赖，
+未安装时不参与协商
+"""
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# 已压缩或压缩收益很低的 MIME 类型
+INCOMPRESSIBLE_MIMETYPES = {
+    'application/vnd.apache.parquet',
+}
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31 输出带 gzip 头的数据流
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return (
+            self._compressor.compress(data)
+            + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _compressors() -> dict:
+    compressors = {'gzip': _GzipCompressor}
+    if brotli is not None:
+        compressors['br'] = _BrotliCompressor
+    if zstandard is not None:
+        compressors['zstd'] = _ZstdCompressor
+    return compressors
+
+
+COMPRESSORS = _compressors()
+
+
+def negotiate_encoding(accept_encodings, encodings) -> str | None:
+    """
+    协商内容编码，优先选择客户端权重最高的编码，权重相同时按服务端优先级
+
+    Args:
+        accept_encodings: 请求的 Accept-Encoding（如 ``request.accept_encodings``）
+        encodings: 服务端按优先级排列的可用编码
+
+    Returns:
+        选中的编码名称，客户端不接受任何可用编码时返回 None
+    """
+    best, best_quality = None, 0
+    for encoding in encodings:
+        if encoding not in COMPRESSORS:
+            continue
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    压缩完整响应体
+
+    Args:
+        data: 原始数据
+        encoding: 编码名称（gzip / br / zstd）
+        level: 压缩级别
+
+    Returns:
+        压缩后的数据
+    """
+    if encoding == 'gzip':
+        # 固定 mtime，相同内容得到相同的压缩结果
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def compress_stream(chunks, encoding: str, level: int):
+    """
+    逐块压缩流式响应，每块压缩后立即输出，客户端可边接收边解压
+
+    Args:
+        chunks: 原始数据块迭代器（str 或 bytes）
+        encoding: 编码名称（gzip / br / zstd）
+        level: 压缩级别
+
+    Yields:
+        压缩后的数据块
+    """
+    compressor = COMPRESSORS[encoding](level)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if chunk:
+            yield compressor.compress(chunk)
+    yield compressor.finish()
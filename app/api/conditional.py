@@ -0,0 +1,119 @@
+"""
+条件请求与响应压缩模块
+
+为函数调用响应添加基于内容哈希的强 ETag，If-None-Match 命中时返回 304，
+并按 Accept-Encoding 压缩响应体
+"""
+import hashlib
+
+from flask import Response, current_app, request
+
+from app.metrics import phase
+from .compression import INCOMPRESSIBLE_MIMETYPES, compress, compress_stream, negotiate_encoding
+
+# 304 响应保留的头部
+NOT_MODIFIED_HEADERS = (
+    'ETag', 'Vary', 'X-Cache', 'Age', 'Warning', 'X-Total-Count', 'X-Snapshot-Version',
+)
+
+
+def finalize_response(response: Response) -> Response:
+    """
+    协商压缩并处理条件请求
+
+    - 非流式响应：按响应体哈希生成 ETag（不同压缩编码的表示带编码后缀），
+      If-None-Match 命中时返回不含响应体的 304；未命中且响应体不小于
+      COMPRESSION_MIN_SIZE 时压缩
+    - 流式响应：无法预先得到完整内容，不生成 ETag，逐块压缩
+
+    Args:
+        response: 状态码为 200 的响应
+
+    Returns:
+        处理后的响应
+    """
+    config = current_app.config
+    add_encoding_vary(response)
+    encoding = negotiate_response_encoding(response.mimetype)
+    level = config.get('COMPRESSION_LEVELS', {}).get(encoding, -1)
+
+    if response.is_streamed:
+        if encoding is not None:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers['Content-Encoding'] = encoding
+            response.headers.pop('Content-Length', None)
+        return response
+
+    body = response.get_data()
+    if len(body) < config.get('COMPRESSION_MIN_SIZE', 1024):
+        encoding = None
+
+    if config.get('ETAG_ENABLED', True):
+        digest = hashlib.sha1(body).hexdigest()
+        response.set_etag(digest if encoding is None else f"{digest}-{encoding}")
+        if request.if_none_match.contains_weak(response.get_etag()[0]):
+            return not_modified(response)
+
+    if encoding is not None:
+        with phase('compress'):
+            response.set_data(compress(body, encoding, level))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def add_encoding_vary(response: Response) -> None:
+    """可压缩的响应按 Accept-Encoding 协商，添加 Vary: Accept-Encoding"""
+    config = current_app.config
+    if config.get('COMPRESSION_ENABLED', True) and response.mimetype not in INCOMPRESSIBLE_MIMETYPES:
+        response.vary.add('Accept-Encoding')
+
+
+def negotiate_response_encoding(mimetype: str) -> str | None:
+    """
+    按 Accept-Encoding 协商响应的压缩编码
+
+    Args:
+        mimetype: 响应 MIME 类型
+
+    Returns:
+        压缩编码，不压缩时返回 None
+    """
+    config = current_app.config
+    if not config.get('COMPRESSION_ENABLED', True) or mimetype in INCOMPRESSIBLE_MIMETYPES:
+        return None
+    return negotiate_encoding(
+        request.accept_encodings, config.get('COMPRESSION_ENCODINGS', ('gzip',)),
+    )
+
+
+def revalidate(response: Response) -> Response:
+    """
+    处理已带 ETag 的响应（如响应体缓存命中）的条件请求
+
+    Args:
+        response: 已完成压缩与 ETag 处理的响应
+
+    Returns:
+        If-None-Match 命中时返回 304，否则原样返回
+    """
+    etag = response.get_etag()[0]
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return not_modified(response)
+    return response
+
+
+def not_modified(response: Response) -> Response:
+    """
+    构造 304 响应，保留 ETag 与缓存相关头部
+
+    Args:
+        response: 原始响应
+
+    Returns:
+        不含响应体的 304 响应
+    """
+    result = Response(status=304)
+    for name in NOT_MODIFIED_HEADERS:
+        if name in response.headers:
+            result.headers[name] = response.headers[name]
+    return result
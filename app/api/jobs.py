@@ -0,0 +1,41 @@
+"""
+异步调用模块
+
+``POST /api/<func_name>/jobs`` 立即返回任务 ID，调用在后台执行，
+通过 ``GET /jobs/<job_id>`` 查询状态与结果
+"""
+from flask import jsonify, request, url_for
+
+from app.jobs import get_job_manager
+from .query import Query
+from .views import api, apply_query, fetch_result, prepare_call
+
+
+@api.route("/<func_name>/jobs", methods=['POST'])
+def submit_job(func_name: str):
+    """
+    提交异步调用任务
+
+    Args:
+        func_name: 函数名称
+
+    Query Parameters:
+        任意 akshare 函数支持的参数，以及 _columns / _where 等结果查询条件
+
+    Returns:
+        202 状态码与任务信息，Location 响应头指向任务状态地址
+    """
+    func, params, options = prepare_call(func_name, request.args)
+    query = Query.from_options(options)
+
+    def runner(job):
+        lookup = fetch_result(func_name, func, params)
+        result, _ = apply_query(lookup.value, query)
+        return result
+
+    job = get_job_manager().submit(runner, func_name, params, options)
+    location = url_for('jobs.get_job', job_id=job.id)
+    response = jsonify({**job.to_dict(), 'location': location})
+    response.status_code = 202
+    response.headers['Location'] = location
+    return response
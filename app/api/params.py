@@ -0,0 +1,206 @@
+"""
+请求参数模块
+
+将查询参数拆分为 akshare 函数参数与网关保留参数，
+并按 akshare 函数签名转换、规范化参数
+"""
+import re
+from datetime import datetime
+
+from app.cache.policy import parse_date
+from app.exceptions import InvalidParameterError
+
+# 以下划线开头的查询参数为网关保留参数，不会传递给 akshare 函数
+RESERVED_PREFIX = '_'
+
+# 日期类参数的默认值格式，规范化时按默认值的格式输出
+DATE_FORMATS = (
+    (re.compile(r'^\d{8}$'), '%Y%m%d'),
+    (re.compile(r'^\d{4}-\d{2}-\d{2}$'), '%Y-%m-%d'),
+)
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+def parse_param_value(value):
+    """
+    转换单个参数值
+
+    URL 参数全为字符串，'True'/'False' 需还原为 bool 以匹配 akshare 函数签名
+
+    Args:
+        value: 原始参数值
+
+    Returns:
+        转换后的参数值
+    """
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered == 'true':
+            return True
+        if lowered == 'false':
+            return False
+    return value
+
+
+def is_enabled(value) -> bool:
+    """判断开关类保留参数（如 ``_stream=1``）是否开启"""
+    return str(value).lower() in TRUE_VALUES
+
+
+def split_params(args) -> tuple[dict, dict]:
+    """
+    拆分请求参数
+
+    Args:
+        args: 查询参数（如 ``request.args``）
+
+    Returns:
+        (akshare 函数参数, 网关保留参数) 元组，均保持原始值，
+        函数参数由 canonicalize_params 按签名转换
+    """
+    params = {}
+    options = {}
+    for name, value in args.items():
+        if name.startswith(RESERVED_PREFIX):
+            options[name] = value
+        else:
+            params[name] = value
+    return params, options
+
+
+def canonicalize_params(info, params: dict, case_insensitive=(), gateway_dates=()) -> dict:
+    """
+    按函数签名转换并规范化参数
+
+    - 按类型注解（无注解时按默认值类型）转换 int / float / bool，字符串去除首尾空白
+    - 日期类参数统一为默认值的格式（如 ``2024-01-31`` → ``20240131``）
+    - case_insensitive 中默认值为小写字符串的参数转为小写（如 ``period=Daily`` → ``daily``），
+      默认值含大写字母（如 ``period='5Y'``）或无默认值的参数保持原样
+    - 补全有默认值的参数，使语义相同的请求得到相同的缓存键
+    - gateway_dates 中不在签名内的日期参数由网关处理（统一为 ``YYYYMMDD``），不视为未知参数
+    - 未知参数与缺少的必填参数在调用上游前报错
+
+    签名无法解析的函数只做 ``'true'/'false'`` 转换；接受 ``**kwargs`` 的函数保留额外参数
+
+    Args:
+        info: 函数描述（FunctionInfo），为 None 时不按签名处理
+        params: 原始参数
+        case_insensitive: 不区分大小写的参数名
+        gateway_dates: 由网关处理的日期参数名（如上游不支持日期区间的历史行情函数的 start_date）
+
+    Returns:
+        规范化后的参数
+
+    Raises:
+        InvalidParameterError: 未知参数、缺少必填参数或取值无法转换
+    """
+    if info is None or info.params is None:
+        return {name: parse_param_value(value) for name, value in params.items()}
+
+    known = {param.name: param for param in info.params}
+    gateway = [name for name in gateway_dates if name not in known]
+    unknown = [name for name in params if name not in known and name not in gateway]
+    if unknown and not info.var_keyword:
+        accepted = ', '.join(known) or '(none)'
+        raise InvalidParameterError(
+            f"Unknown parameter(s) for {info.name}: {', '.join(sorted(unknown))}. "
+            f"Accepted: {accepted}"
+        )
+
+    canonical = {}
+    for param in info.params:
+        if param.name in params:
+            value = coerce_param(param, params[param.name])
+            if param.name in case_insensitive and isinstance(value, str) and _lowercase_default(param):
+                value = value.lower()
+            canonical[param.name] = value
+        elif param.required:
+            raise InvalidParameterError(f"Missing required parameter for {info.name}: {param.name}")
+        elif param.default is None or isinstance(param.default, (str, int, float, bool)):
+            canonical[param.name] = param.default
+
+    for name in gateway:
+        if name in params:
+            canonical[name] = _gateway_date(name, params[name])
+    for name in unknown:
+        canonical[name] = parse_param_value(params[name])
+    return canonical
+
+
+def coerce_param(param, value):
+    """
+    按参数描述转换单个参数值
+
+    Args:
+        param: 参数描述（ParamInfo）
+        value: 原始参数值（查询参数为字符串，批量调用可能为 JSON 标量）
+
+    Returns:
+        转换后的参数值
+
+    Raises:
+        InvalidParameterError: 取值无法转换为目标类型
+    """
+    target = _target_type(param)
+    if target is None:
+        return parse_param_value(value)
+    if target is str:
+        return _normalize_date(param, str(value).strip())
+    if isinstance(value, target) and not (target is int and isinstance(value, bool)):
+        return value
+    if target is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+
+    text = str(value).strip()
+    if target is bool:
+        lowered = text.lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+        raise InvalidParameterError(f"Invalid value for '{param.name}': expected a boolean")
+    try:
+        return target(text)
+    except ValueError:
+        raise InvalidParameterError(
+            f"Invalid value for '{param.name}': expected {target.__name__}"
+        ) from None
+
+
+def _lowercase_default(param) -> bool:
+    # 只有默认值本身为小写时才能确定上游按小写取值，如 'daily'、''；'5Y'、'LAST10' 等需保持大小写
+    return isinstance(param.default, str) and param.default == param.default.lower()
+
+
+def _target_type(param):
+    # bool 是 int 的子类，需先判断
+    for candidate in (bool, int, float, str):
+        if param.annotation is candidate:
+            return candidate
+    if param.required or param.default is None:
+        return None
+    for candidate in (bool, int, float, str):
+        if isinstance(param.default, candidate):
+            return candidate
+    return None
+
+
+def _gateway_date(name: str, value) -> str:
+    parsed = parse_date(str(value).strip())
+    if parsed is None:
+        raise InvalidParameterError(f"Invalid date for '{name}': {value}")
+    return datetime(parsed.year, parsed.month, parsed.day).strftime('%Y%m%d')
+
+
+def _normalize_date(param, text: str) -> str:
+    if 'date' not in param.name or not isinstance(param.default, str) or not text:
+        return text
+    for pattern, fmt in DATE_FORMATS:
+        if pattern.match(param.default):
+            parsed = parse_date(text)
+            if parsed is None:
+                raise InvalidParameterError(f"Invalid date for '{param.name}': {text}")
+            return datetime(parsed.year, parsed.month, parsed.day).strftime(fmt)
+    return text
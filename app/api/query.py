@@ -0,0 +1,191 @@
+"""
+结果查询模块
+
+在序列化前对 DataFrame 结果做列投影、行过滤、排序和分页，
+查询条件通过下划线开头的保留参数传入：
+
+- ``_columns=日期,收盘``：只返回指定列
+- ``_where=收盘>10;代码=000001``：过滤行，多个条件以分号分隔，均需满足
+- ``_sort=-成交量,代码``：排序，``-`` 前缀表示降序
+- ``_offset=100&_limit=50``：分页
+"""
+import re
+
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_datetime64_any_dtype, is_numeric_dtype
+
+from app.cache.policy import parse_date
+from app.exceptions import InvalidParameterError
+
+QUERY_OPTIONS = ('_columns', '_where', '_sort', '_offset', '_limit')
+
+# 运算符按长度排列，保证 '>=' 优先于 '>' 匹配
+_PREDICATE = re.compile(r'^(?P<column>.+?)(?P<op>!=|>=|<=|=|>|<|~)(?P<value>.*)$')
+
+
+class Query:
+    """结果查询条件"""
+
+    def __init__(self, columns: list = None, where: list = None, sort: list = None,
+                 offset: int = 0, limit: int = None):
+        """
+        Args:
+            columns: 要返回的列
+            where: (列名, 运算符, 值) 过滤条件列表
+            sort: (列名, 是否升序) 排序条件列表
+            offset: 跳过的行数
+            limit: 最多返回的行数
+        """
+        self.columns = columns or []
+        self.where = where or []
+        self.sort = sort or []
+        self.offset = offset
+        self.limit = limit
+
+    @classmethod
+    def from_options(cls, options: dict) -> 'Query':
+        """
+        从保留参数解析查询条件
+
+        Args:
+            options: 网关保留参数
+
+        Returns:
+            Query 实例
+
+        Raises:
+            InvalidParameterError: 参数格式不合法
+        """
+        return cls(
+            columns=_split(options.get('_columns')),
+            where=[_parse_predicate(item) for item in _split(options.get('_where'), ';')],
+            sort=[
+                (item[1:], False) if item.startswith('-') else (item, True)
+                for item in _split(options.get('_sort'))
+            ],
+            offset=_parse_int(options, '_offset', 0),
+            limit=_parse_int(options, '_limit', None),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.columns or self.where or self.sort or self.offset or self.limit is not None)
+
+    @property
+    def key(self) -> str:
+        """规范化的查询条件表示，由全部解析后的字段生成，用于区分缓存的响应体"""
+        return repr(sorted(vars(self).items()))
+
+    def apply(self, df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+        """
+        对 DataFrame 执行查询，不修改原 DataFrame
+
+        Args:
+            df: DataFrame
+
+        Returns:
+            (查询结果, 过滤后分页前的总行数) 元组
+
+        Raises:
+            InvalidParameterError: 引用了不存在的列或值类型不匹配
+        """
+        self._check_columns(df, [column for column, _, _ in self.where])
+        self._check_columns(df, [column for column, _ in self.sort])
+        self._check_columns(df, self.columns)
+
+        for column, op, value in self.where:
+            df = df[_evaluate(df[column], op, value, column)]
+        total = len(df)
+
+        if self.sort:
+            df = df.sort_values(
+                by=[column for column, _ in self.sort],
+                ascending=[ascending for _, ascending in self.sort],
+                kind='stable',
+            )
+
+        if self.offset or self.limit is not None:
+            stop = None if self.limit is None else self.offset + self.limit
+            df = df.iloc[self.offset:stop]
+
+        if self.columns:
+            df = df[self.columns]
+
+        return df, total
+
+    @staticmethod
+    def _check_columns(df: pd.DataFrame, columns: list) -> None:
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise InvalidParameterError(f"Unknown columns: {', '.join(missing)}")
+
+
+def _split(value: str | None, separator: str = ',') -> list:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+
+def _parse_int(options: dict, name: str, default):
+    value = options.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise InvalidParameterError(f"{name} must be an integer")
+    if number < 0:
+        raise InvalidParameterError(f"{name} must not be negative")
+    return number
+
+
+def _parse_predicate(text: str) -> tuple:
+    match = _PREDICATE.match(text)
+    if not match:
+        raise InvalidParameterError(f"Invalid _where predicate: {text}")
+    return match.group('column').strip(), match.group('op'), match.group('value').strip()
+
+
+def _coerce(series: pd.Series, value: str, column: str):
+    """将条件值转换为与列类型可比较的值"""
+    try:
+        if is_bool_dtype(series):
+            return value.lower() in ('1', 'true')
+        if is_numeric_dtype(series):
+            return float(value)
+        if is_datetime64_any_dtype(series):
+            timestamp = pd.Timestamp(value)
+            if series.dt.tz is not None and timestamp.tz is None:
+                timestamp = timestamp.tz_localize(series.dt.tz)
+            return timestamp
+    except (ValueError, TypeError):
+        raise InvalidParameterError(f"Invalid value for column '{column}': {value}")
+
+    if infer_dtype(series, skipna=True) == 'date':
+        parsed = parse_date(value)
+        if parsed is None:
+            raise InvalidParameterError(f"Invalid date for column '{column}': {value}")
+        return parsed
+
+    return value
+
+
+def _evaluate(series: pd.Series, op: str, value: str, column: str) -> pd.Series:
+    if op == '~':
+        return series.astype(str).str.contains(value, regex=False, na=False)
+
+    target = _coerce(series, value, column)
+    try:
+        if op == '=':
+            return series == target
+        if op == '!=':
+            return series != target
+        if op == '>':
+            return series > target
+        if op == '>=':
+            return series >= target
+        if op == '<':
+            return series < target
+        return series <= target
+    except TypeError:
+        raise InvalidParameterError(f"Cannot compare column '{column}' with {value}")
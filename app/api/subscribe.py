@@ -0,0 +1,63 @@
+"""
+订阅推送模块
+
+``GET /api/<func_name>/subscribe`` 以 Server-Sent Events 推送函数结果：
+相同函数与参数的订阅共享一个数据源，网关按 SUBSCRIBE_INTERVAL 轮询一次上游，
+结果变化时向全部订阅者推送
+"""
+from flask import Response, current_app, request
+
+from app.exceptions import InvalidParameterError, UnsupportedFormatError
+from .query import Query
+from .views import api, prepare_call
+
+
+@api.route("/<func_name>/subscribe", methods=['GET'])
+def subscribe(func_name: str):
+    """
+    订阅函数结果
+
+    Args:
+        func_name: 函数名称
+
+    Query Parameters:
+        任意 akshare 函数支持的参数
+
+    Request Headers:
+        Last-Event-ID: 重连时已收到的最后一个版本号，快照类函数仍保留该版本时只推送差异
+
+    Returns:
+        ``text/event-stream`` 响应，事件类型：
+
+        - snapshot: ``{"version": ..., "data": [...]}`` 全量结果
+        - delta: 快照类函数与上一版本的差异，格式与 ``_since`` 响应一致
+        - error: 上游调用失败，格式与错误响应一致
+    """
+    from app.subscriptions import get_subscription_hub
+
+    func, params, options = prepare_call(func_name, request.args)
+    if not Query.from_options(options).is_empty:
+        raise InvalidParameterError("Query options are not available for subscriptions")
+    if options.get('_format', 'json') != 'json':
+        raise UnsupportedFormatError("Subscriptions are only available in json format")
+
+    hub = get_subscription_hub()
+    subscriber = hub.subscribe(func_name, func, params, request.headers.get('Last-Event-ID'))
+    heartbeat = current_app.config.get('SUBSCRIBE_HEARTBEAT', 15)
+
+    def events():
+        try:
+            yield f"retry: {int(hub.interval * 1000)}\n\n"
+            while True:
+                event = subscriber.next_event(timeout=heartbeat)
+                # 空闲时发送注释行，保持连接并及时发现客户端断开
+                yield event if event is not None else ': keepalive\n\n'
+        finally:
+            hub.unsubscribe(subscriber)
+
+    # 事件流不访问请求上下文，无需在整个订阅期间保留
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # 禁止反向代理缓冲事件流
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -3,23 +3,61 @@ API 视图模块
 
 提供 akshare 函数的 REST API 接口
 """
-import akshare as ak
 import pandas as pd
 import requests.exceptions
-from flask import Blueprint, jsonify, request, current_app
-
+from flask import Blueprint, Response, g, jsonify, request, current_app
+
+from app.cache import (
+    CacheLookup,
+    get_cache,
+    get_response_cache,
+    make_cache_key,
+    make_response_key,
+)
+from app.encoder import (
+    FORMAT_MIMETYPES,
+    check_format,
+    negotiate_format,
+    to_arrow_ipc,
+    to_columns,
+    to_parquet,
+)
+from app.history import get_history_store
 from app.logging_config import get_logger
+from app.metrics import (
+    IN_FLIGHT,
+    UPSTREAM_SECONDS,
+    instrument_call,
+    phase,
+    set_function_label,
+)
+from app.snapshot import get_snapshot_store
+from app.upstream import get_limiter, get_registry
 from app.exceptions import (
     FunctionNotFoundError,
     FunctionNotAllowedError,
     InvalidParameterError,
     DataFetchError,
+    UnsupportedFormatError,
+)
+from .conditional import (
+    add_encoding_vary,
+    finalize_response,
+    negotiate_response_encoding,
+    revalidate,
 )
+from .params import canonicalize_params, is_enabled, split_params
+from .profiling import profile_view
+from .query import Query
 
 logger = get_logger('api')
 
 api = Blueprint('api', __name__)
 
+# 函数列表分页大小
+DEFAULT_LIST_LIMIT = 100
+MAX_LIST_LIMIT = 1000
+
 
 def validate_function_name(func_name: str) -> None:
     """
@@ -79,10 +117,153 @@ def get_akshare_function(func_name: str):
     Raises:
         FunctionNotFoundError: 函数不存在
     """
-    if not hasattr(ak, func_name):
+    info = get_registry().get(func_name)
+    if info is None:
         raise FunctionNotFoundError(func_name)
 
-    return getattr(ak, func_name)
+    return info.func
+
+
+def resolve_function(func_name: str):
+    """
+    验证函数名、检查白名单并获取 akshare 函数
+
+    Args:
+        func_name: 函数名称
+
+    Returns:
+        akshare 函数对象
+    """
+    with phase('validate'):
+        validate_function_name(func_name)
+        check_function_allowed(func_name)
+    with phase('lookup'):
+        func = get_akshare_function(func_name)
+    set_function_label(func_name)
+    return func
+
+
+def prepare_call(func_name: str, args) -> tuple:
+    """
+    解析函数并按其签名规范化调用参数
+
+    Args:
+        func_name: 函数名称
+        args: 原始参数（查询参数或参数字典），包含下划线开头的保留参数
+
+    Returns:
+        (akshare 函数对象, 规范化后的函数参数, 网关保留参数) 元组
+
+    Raises:
+        InvalidParameterError: 函数名或参数不合法
+    """
+    func = resolve_function(func_name)
+    raw_params, options = split_params(args)
+    with phase('validate'):
+        if current_app.config.get('PARAM_CANONICALIZE', True):
+            params = canonicalize_params(
+                get_registry().get(func_name),
+                raw_params,
+                case_insensitive=current_app.config.get('PARAM_CASE_INSENSITIVE', ()),
+                gateway_dates=get_history_store().gateway_params(func_name),
+            )
+        else:
+            params = canonicalize_params(None, raw_params)
+    return func, params, options
+
+
+def fetch_result(func_name: str, func, params: dict) -> CacheLookup:
+    """
+    获取函数结果，优先读取缓存，并发相同调用合并执行
+
+    Args:
+        func_name: 函数名称
+        func: akshare 函数对象
+        params: 调用参数
+
+    Returns:
+        CacheLookup 实例
+    """
+    with IN_FLIGHT.labels(func_name).track_inprogress(), phase('fetch'):
+        return get_cache().get_or_load(
+            func_name, params, lambda: load_function(func_name, func, params)
+        )
+
+
+def load_function(func_name: str, func, params: dict):
+    """
+    调用 akshare 函数，已知的历史行情函数只拉取未覆盖的日期区间
+
+    Args:
+        func_name: 函数名称
+        func: akshare 函数对象
+        params: 调用参数
+
+    Returns:
+        akshare 函数返回值
+    """
+    return get_history_store().load(
+        func_name, params, lambda call_params: invoke_function(func_name, func, call_params)
+    )
+
+
+def apply_query(result, query: Query) -> tuple:
+    """
+    对结果执行查询条件
+
+    Args:
+        result: akshare 函数返回值
+        query: 查询条件
+
+    Returns:
+        (查询结果, 过滤后总行数) 元组，无查询条件时总行数为 None
+
+    Raises:
+        InvalidParameterError: 对非表格结果使用查询条件
+    """
+    if query.is_empty:
+        return result, None
+    if not isinstance(result, pd.DataFrame):
+        raise InvalidParameterError("Query options are only available for tabular results")
+    with phase('query'):
+        return query.apply(result)
+
+
+def invoke_function(func_name: str, func, params: dict):
+    """
+    在上游限流范围内调用 akshare 函数，并将异常转换为 API 异常
+
+    Args:
+        func_name: 函数名称
+        func: akshare 函数对象
+        params: 调用参数
+
+    Returns:
+        akshare 函数返回值
+
+    Raises:
+        InvalidParameterError: 参数错误
+        DataFetchError: 数据获取失败
+        UpstreamBusyError: 上游排队等待超时
+    """
+    with UPSTREAM_SECONDS.labels(func_name).time(), phase('upstream'):
+        with get_limiter().limit(func_name):
+            return _call_upstream(func_name, func, params)
+
+
+def _call_upstream(func_name: str, func, params: dict):
+    try:
+        logger.info(f"API call: {func_name} - params: {params}")
+        return func(**params)
+    except TypeError as e:
+        logger.warning(f"Parameter error: {func_name} - {e}")
+        raise InvalidParameterError(f"Invalid parameters: {str(e)}")
+    except requests.exceptions.ConnectionError as e:
+        logger.warning(f"Connection error: {func_name} - {e}")
+        raise DataFetchError("Upstream service unavailable, please retry later", status_code=503)
+    except Exception as e:
+        logger.error(f"Data fetch error: {func_name} - {e}")
+        raise DataFetchError(f"Failed to fetch data: {str(e)}")
 
 
 def convert_result(result) -> list | dict | None:
@@ -113,77 +294,264 @@ def convert_result(result) -> list | dict | None:
     return str(result)
 
 
-@api.route("/<func_name>", methods=['GET'])
-def call_function(func_name: str):
+def dumps_result(result) -> str:
     """
-    调用 akshare 函数
+    将结果编码为 JSON 字符串
+
+    Args:
+        result: akshare 函数返回值
+
+    Returns:
+        JSON 字符串
+    """
+    if isinstance(result, pd.DataFrame):
+        # DataFrame 按列直接编码，不经过逐行转换
+        with phase('encode'):
+            return current_app.json.dumps_frame(result)
+    with phase('convert'):
+        data = convert_result(result)
+    with phase('encode'):
+        return current_app.json.dumps(data)
+
+
+def make_data_response(result, fmt: str, stream: bool = False) -> Response:
+    """
+    按输出格式构造响应
+
+    Args:
+        result: akshare 函数返回值
+        fmt: 格式名称（json / ndjson / columns / arrow / parquet）
+        stream: 是否分批流式输出 DataFrame 的 JSON 结果
+
+    Returns:
+        Flask 响应对象
+    """
+    check_format(fmt, result)
+    batch_rows = current_app.config.get('STREAM_BATCH_ROWS', 5000)
+
+    if fmt == 'ndjson':
+        return Response(
+            current_app.json.iter_frame_lines(result, batch_rows),
+            mimetype=FORMAT_MIMETYPES['ndjson'],
+        )
+
+    if fmt == 'arrow':
+        with phase('encode'):
+            return Response(to_arrow_ipc(result), mimetype=FORMAT_MIMETYPES['arrow'])
+    if fmt == 'parquet':
+        with phase('encode'):
+            return Response(to_parquet(result), mimetype=FORMAT_MIMETYPES['parquet'])
+    if fmt == 'columns':
+        with phase('convert'):
+            data = to_columns(result)
+        with phase('encode'):
+            return Response(current_app.json.dumps(data), mimetype=FORMAT_MIMETYPES['columns'])
+    if stream and isinstance(result, pd.DataFrame):
+        return Response(
+            current_app.json.iter_frame(result, batch_rows),
+            mimetype='application/json',
+        )
+
+    return Response(dumps_result(result), mimetype='application/json')
+
+
+def make_delta_response(func_name: str, params: dict, snapshot, since: str, fmt: str,
+                        query: Query) -> Response:
+    """
+    构造快照差异响应
 
     Args:
         func_name: 函数名称
+        params: 调用参数
+        snapshot: 当前快照版本，函数不按快照管理或结果无法比较时为 None
+        since: 客户端已有的版本号
+        fmt: 格式名称，仅支持 json
+        query: 查询条件，差异响应不支持查询条件
 
-    Query Parameters:
-        任意 akshare 函数支持的参数
+    Returns:
+        JSON 响应：``{"version", "since", "full", "inserted", "updated", "deleted"}``
+
+    Raises:
+        InvalidParameterError: 函数不支持快照版本或同时使用了查询条件
+        UnsupportedFormatError: 非 JSON 格式
+    """
+    if not get_snapshot_store().tracks(func_name):
+        raise InvalidParameterError(f"_since is not available for {func_name}")
+    if not query.is_empty:
+        raise InvalidParameterError("_since cannot be combined with query options")
+    if fmt != 'json':
+        raise UnsupportedFormatError("_since is only available for json format")
+    if snapshot is None:
+        raise InvalidParameterError(f"Result of {func_name} cannot be versioned")
+
+    with phase('query'):
+        delta = get_snapshot_store().delta(func_name, params, snapshot, since)
+    with phase('encode'):
+        body = dumps_delta(delta)
+    return Response(body, mimetype='application/json')
+
+
+def dumps_delta(delta) -> str:
+    """
+    将快照差异编码为 JSON 字符串
+
+    只编码变化的行，外层字段直接拼接
+
+    Args:
+        delta: 快照差异（app.snapshot.Delta）
 
     Returns:
-        JSON 格式的函数返回数据
+        ``{"version", "since", "full", "inserted", "updated", "deleted"}`` JSON 字符串
     """
-    # 验证函数名
-    validate_function_name(func_name)
+    provider = current_app.json
+    return (
+        f'{{"version": {provider.dumps(delta.version)}, '
+        f'"since": {provider.dumps(delta.since)}, '
+        f'"full": {provider.dumps(delta.full)}, '
+        f'"inserted": {provider.dumps_frame(delta.inserted)}, '
+        f'"updated": {provider.dumps_frame(delta.updated)}, '
+        f'"deleted": {provider.dumps(delta.deleted)}}}'
+    )
 
-    # 检查白名单
-    check_function_allowed(func_name)
 
-    # 获取函数
-    func = get_akshare_function(func_name)
+@api.route("/<func_name>", methods=['GET'])
+@profile_view
+@instrument_call
+def call_function(func_name: str):
+    """
+    调用 akshare 函数
 
-    # 调用函数
-    try:
-        # 将参数转换为普通字典，并对布尔值字符串做类型转换
-        # （URL 参数全为字符串，'True'/'False' 需还原为 bool 以匹配 akshare 函数签名）
-        params = {
-            k: (True if v.lower() == 'true' else False if v.lower() == 'false' else v)
-            for k, v in request.args.items()
-        }
-        logger.info(f"API call: {func_name} - params: {params}")
-        result = func(**params)
-    except TypeError as e:
-        logger.warning(f"Parameter error: {func_name} - {e}")
-        raise InvalidParameterError(f"Invalid parameters: {str(e)}")
-    except requests.exceptions.ConnectionError as e:
-        logger.warning(f"Connection error: {func_name} - {e}")
-        raise DataFetchError("Upstream service unavailable, please retry later", status_code=503)
-    except Exception as e:
-        logger.error(f"Data fetch error: {func_name} - {e}")
-        raise DataFetchError(f"Failed to fetch data: {str(e)}")
+    Args:
+        func_name: 函数名称
 
-    # 转换结果
-    data = convert_result(result)
+    Query Parameters:
+        任意 akshare 函数支持的参数
+        _format: 输出格式（json / ndjson / columns / arrow / parquet），也可通过 Accept 请求头协商
+        _stream: 为 1 时分批流式输出 JSON 数组（ndjson 格式总是流式输出）
+        _columns / _where / _sort / _offset / _limit: 结果查询条件，见 app.api.query
+        _profile: 为 1 且启用 PROFILING_ENABLED 时返回本次请求的 cProfile 分析报告
+        _since: 快照类函数的已有版本号（X-Snapshot-Version），只返回新增、更新与删除的行
 
-    record_count = len(data) if isinstance(data, list) else 1
-    logger.info(f"API success: {func_name} - records: {record_count}")
+    Request Headers:
+        If-None-Match: 与响应 ETag 一致时返回 304
+        Accept-Encoding: 协商 zstd / br / gzip 压缩
 
-    return jsonify(data)
+    Returns:
+        指定格式的函数返回数据
+    """
+    # 验证函数名、检查白名单、获取函数并按签名规范化参数
+    func, params, options = prepare_call(func_name, request.args)
+
+    # 协商输出格式
+    fmt = negotiate_format(options.get('_format'), request.accept_mimetypes)
+    g.akgate_format = fmt
+    query = Query.from_options(options)
+
+    # 调用函数（优先读取缓存）
+    lookup = fetch_result(func_name, func, params)
+
+    # 行情快照类函数记录版本，客户端带 _since 时只返回变化的行
+    snapshot = None
+    store = get_snapshot_store()
+    if query.is_empty and store.tracks(func_name):
+        snapshot = store.record(func_name, params, lookup.value)
+    since = options.get('_since')
+    stream = is_enabled(options.get('_stream', ''))
+
+    # 结果来自结果缓存的非流式响应，优先使用已编码的响应体
+    response_key = cached = None
+    responses = get_response_cache()
+    if responses.enabled and lookup.stored_at is not None and since is None \
+            and not stream and fmt != 'ndjson':
+        encoding = negotiate_response_encoding(FORMAT_MIMETYPES[fmt])
+        response_key = make_response_key(make_cache_key(func_name, params), fmt, query.key, encoding)
+        cached = responses.get(response_key, lookup.stored_at)
+
+    if cached is not None:
+        response = cached.to_response()
+        add_encoding_vary(response)
+        logger.info(f"API success: {func_name} - format: {fmt} - cache: {lookup.status} - encoded")
+    elif since is not None:
+        response = make_delta_response(func_name, params, snapshot, since, fmt, query)
+        logger.info(f"API success: {func_name} - delta since: {since} - cache: {lookup.status}")
+    else:
+        result, total = apply_query(lookup.value, query)
+
+        record_count = len(result) if isinstance(result, (pd.DataFrame, list)) else 1
+        logger.info(
+            f"API success: {func_name} - records: {record_count} - "
+            f"format: {fmt} - cache: {lookup.status}"
+        )
+
+        # 转换结果
+        response = make_data_response(result, fmt, stream=stream)
+        if total is not None:
+            response.headers['X-Total-Count'] = str(total)
+    if snapshot is not None:
+        response.headers['X-Snapshot-Version'] = snapshot.version
+    response.headers['X-Cache'] = lookup.status
+    response.headers['Age'] = str(lookup.age)
+    if lookup.warning:
+        response.headers['Warning'] = lookup.warning
+    # 未指定 _format 时同一 URL 按 Accept 返回不同格式，共享缓存需按 Accept 区分
+    if not options.get('_format'):
+        response.vary.add('Accept')
+
+    if cached is not None:
+        return revalidate(response)
+
+    # 添加 ETag、处理 If-None-Match 并协商压缩
+    response = finalize_response(response)
+    if response_key is not None and response.status_code == 200:
+        responses.set(response_key, lookup.stored_at, response)
+    return response
 
 
 @api.route("/", methods=['GET'])
 def list_functions():
     """
-    列出可用的函数
+    列出可用的函数及其参数
 
     当启用白名单时，只返回白名单中的函数
-    否则返回提示信息
+
+    Query Parameters:
+        q: 函数名或说明包含的关键字（不区分大小写）
+        prefix: 函数名前缀
+        offset / limit: 分页，limit 默认 100，最大 1000
     """
     config = current_app.config
-
-    if config.get('ENABLE_FUNCTION_WHITELIST', False):
+    whitelist = config.get('ENABLE_FUNCTION_WHITELIST', False)
+    offset = _parse_page_arg('offset', 0)
+    limit = min(_parse_page_arg('limit', DEFAULT_LIST_LIMIT), MAX_LIST_LIMIT)
+
+    functions = get_registry().search(
+        query=request.args.get('q'),
+        prefix=request.args.get('prefix'),
+        names=config.get('ALLOWED_FUNCTIONS', set()) if whitelist else None,
+    )
+    page = {
+        'functions': [info.to_dict() for info in functions[offset:offset + limit]],
+        'count': len(functions),
+        'offset': offset,
+        'limit': limit,
+    }
+
+    if whitelist:
         allowed_functions = sorted(config.get('ALLOWED_FUNCTIONS', set()))
-        return jsonify({
-            'available_functions': allowed_functions,
-            'count': len(allowed_functions),
-        })
+        return jsonify({'available_functions': allowed_functions, **page})
 
     return jsonify({
         'message': 'Function whitelist is disabled. All akshare functions are available.',
         'hint': 'Use /api/<function_name> to call any akshare function.',
         'documentation': 'https://akshare.akfamily.xyz/',
+        **page,
     })
+
+
+def _parse_page_arg(name: str, default: int) -> int:
+    value = request.args.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise InvalidParameterError(f"Invalid {name}: {value}")
+    return int(value)
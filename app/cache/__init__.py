@@ -0,0 +1,47 @@
+"""
+结果缓存模块
+"""
+from .base import CacheBackend, CacheEntry
+from .compact import CompactFrame, pack, unpack
+from .keys import make_cache_key
+from .memory import MemoryCache
+from .policy import TTLPolicy
+from .responses import (
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+    init_response_cache,
+    make_response_key,
+)
+from .service import (
+    CacheLookup,
+    ResultCache,
+    create_backend,
+    get_cache,
+    init_cache,
+)
+from .singleflight import SingleFlight
+from .sqlite import SQLiteCache
+
+__all__ = [
+    'CacheBackend',
+    'CacheEntry',
+    'CacheLookup',
+    'CachedResponse',
+    'CompactFrame',
+    'MemoryCache',
+    'ResponseCache',
+    'ResultCache',
+    'SQLiteCache',
+    'SingleFlight',
+    'TTLPolicy',
+    'create_backend',
+    'get_cache',
+    'get_response_cache',
+    'init_cache',
+    'init_response_cache',
+    'make_cache_key',
+    'make_response_key',
+    'pack',
+    'unpack',
+]
@@ -0,0 +1,78 @@
+"""
+缓存后端接口模块
+"""
+import time
+
+
+class CacheEntry:
+    """
+    缓存条目
+
+    ``expires_at`` 之前为新鲜数据；之后直到 ``stale_until`` 仍保留在后端，
+    可作为过期数据在后台刷新期间或上游出错时使用
+    """
+
+    __slots__ = ('value', 'stored_at', 'expires_at', 'stale_until', 'size')
+
+    def __init__(self, value, stored_at: float, expires_at: float, size: int,
+                 stale_until: float = None):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.stale_until = expires_at if stale_until is None else stale_until
+        self.size = size
+
+    def is_expired(self, now: float = None) -> bool:
+        return (now or time.time()) >= self.expires_at
+
+    def is_retained(self, now: float = None) -> bool:
+        return (now or time.time()) < self.stale_until
+
+    def age(self, now: float = None) -> int:
+        return max(int((now or time.time()) - self.stored_at), 0)
+
+
+class CacheBackend:
+    """
+    缓存后端基类
+
+    后端负责条目的存取、过期与容量淘汰，需保证线程安全
+    """
+
+    name = 'base'
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        获取仍在保留期内的缓存条目（可能已过期，需检查 ``is_expired``）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存条目，不存在或超出保留期时返回 None
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: int, stale_ttl: int = 0) -> CacheEntry | None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 新鲜期（秒）
+            stale_ttl: 新鲜期结束后继续保留的时间（秒）
+
+        Returns:
+            写入的缓存条目，值超过容量上限时返回 None
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
@@ -0,0 +1,224 @@
+"""
+DataFrame 紧凑存储模块
+
+缓存中的 DataFrame 按列打包，减少 Python 对象开销：
+
+- 数值、布尔、时间列保留 NumPy 数组
+- 重复值较多的字符串列（如 ``名称``、``板块``）按字典编码：唯一值数组 + 最小宽度的整数编码
+- 其他字符串列（如 ``代码``、``日期``）拼接为一个字符串 + 结束偏移数组，
+  省去每个字符串约 50 字节的对象头
+- 可选按列 zlib 压缩，压缩后不足原大小 80% 时才保留
+
+读取时按需还原为与原 DataFrame 完全一致的对象
+"""
+import sys
+import weakref
+import zlib
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+# 唯一值占比不超过该值的字符串列按字典编码
+DICTIONARY_RATIO = 0.5
+# 压缩后不足原大小的该比例时才保留压缩结果
+COMPRESS_RATIO = 0.8
+COMPRESS_LEVEL = 1
+
+# 对象与容器的固定开销估计
+_OBJECT_OVERHEAD = 64
+
+
+class _Column:
+    """一列打包后的数据"""
+
+    __slots__ = ('kind', 'data', 'extra', 'dtype', 'compressed')
+
+    def __init__(self, kind: str, data, extra=None, dtype=None):
+        """
+        Args:
+            kind: array（原样保存的数组）/ dictionary（字典编码）/ text（拼接字符串）
+            data: array 为数组，dictionary 为整数编码，text 为拼接后的字符串
+            extra: dictionary 为唯一值数组，text 为结束偏移数组
+            dtype: 压缩后还原 NumPy 数组所需的类型
+        """
+        self.kind = kind
+        self.data = data
+        self.extra = extra
+        self.dtype = dtype
+        self.compressed = False
+
+    @property
+    def nbytes(self) -> int:
+        size = _OBJECT_OVERHEAD
+        if self.compressed or isinstance(self.data, (str, bytes)):
+            size += sys.getsizeof(self.data)
+        else:
+            size += _array_bytes(self.data)
+        if self.kind == 'dictionary':
+            size += _array_bytes(self.extra)
+        elif self.kind == 'text':
+            size += self.extra.nbytes
+        return size
+
+    def compress(self) -> None:
+        """压缩数值数组或拼接字符串，收益不足时保持原样"""
+        if self.kind == 'text':
+            raw = self.data.encode('utf-8')
+        elif isinstance(self.data, np.ndarray) and self.data.dtype.kind in 'biufM':
+            raw = np.ascontiguousarray(self.data).tobytes()
+            self.dtype = self.data.dtype
+        else:
+            return
+        packed = zlib.compress(raw, COMPRESS_LEVEL)
+        if len(packed) < len(raw) * COMPRESS_RATIO:
+            self.data = packed
+            self.compressed = True
+
+    def restore(self):
+        """还原为可用于构造 DataFrame 的列数组"""
+        data = self.data
+        if self.compressed:
+            raw = zlib.decompress(data)
+            if self.kind == 'text':
+                data = raw.decode('utf-8')
+            else:
+                data = np.frombuffer(raw, dtype=self.dtype)
+
+        if self.kind == 'dictionary':
+            return self.extra.take(data)
+        if self.kind == 'text':
+            values = np.empty(len(self.extra), dtype=object)
+            ends = self.extra.tolist()
+            values[:] = [data[start:end] for start, end in zip([0, *ends[:-1]], ends)]
+            return values
+        return data
+
+
+class CompactFrame:
+    """按列打包的 DataFrame"""
+
+    __slots__ = ('columns', 'index', 'packed', 'nbytes', '_frame')
+
+    def __init__(self, columns: pd.Index, index: pd.Index, packed: list):
+        """
+        Args:
+            columns: 原列名
+            index: 原索引
+            packed: 各列打包后的数据
+        """
+        self.columns = columns
+        self.index = index
+        self.packed = packed
+        self.nbytes = (
+            _OBJECT_OVERHEAD
+            + int(columns.memory_usage(deep=True))
+            + int(index.memory_usage(deep=True))
+            + sum(column.nbytes for column in packed)
+        )
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, compress: bool = False) -> 'CompactFrame':
+        """
+        打包 DataFrame
+
+        Args:
+            frame: DataFrame
+            compress: 是否按列 zlib 压缩（读取时需解压，以 CPU 换内存）
+
+        Returns:
+            打包结果
+        """
+        packed = []
+        for i in range(frame.shape[1]):
+            column = _pack_column(frame.iloc[:, i])
+            if compress:
+                column.compress()
+            packed.append(column)
+        return cls(frame.columns, frame.index, packed)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        还原为 DataFrame
+
+        上次还原的结果仍被引用（如快照版本存储持有）时直接返回该对象，
+        与未打包时缓存命中返回同一对象的行为一致
+        """
+        frame = self._frame() if self._frame is not None else None
+        if frame is None:
+            frame = pd.DataFrame(
+                {i: column.restore() for i, column in enumerate(self.packed)},
+                index=self.index,
+            )
+            frame.columns = self.columns
+            self._frame = weakref.ref(frame)
+        return frame
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getstate__(self):
+        # SQLite 后端需要序列化，弱引用不可序列化
+        return self.columns, self.index, self.packed, self.nbytes
+
+    def __setstate__(self, state):
+        self.columns, self.index, self.packed, self.nbytes = state
+        self._frame = None
+
+
+def pack(value, compress: bool = False):
+    """
+    打包缓存值，非空 DataFrame 转为 CompactFrame，其他值原样返回
+
+    Args:
+        value: 缓存值
+        compress: 是否压缩
+
+    Returns:
+        打包后的值
+    """
+    if isinstance(value, pd.DataFrame) and value.shape[1] > 0 and len(value) > 0:
+        return CompactFrame.from_frame(value, compress)
+    return value
+
+
+def unpack(value):
+    """还原 pack 的结果"""
+    if isinstance(value, CompactFrame):
+        return value.to_frame()
+    return value
+
+
+def _pack_column(series: pd.Series) -> _Column:
+    if not isinstance(series.dtype, np.dtype):
+        return _Column('array', series.array)
+    values = series.to_numpy()
+    if values.base is not None:
+        # 列通常是原 DataFrame 二维数据块的视图，复制后不再引用整个数据块
+        values = values.copy()
+    if values.dtype != object or infer_dtype(values, skipna=False) != 'string':
+        return _Column('array', values)
+
+    codes, uniques = pd.factorize(values)
+    if len(uniques) <= len(values) * DICTIONARY_RATIO:
+        codes = codes.astype(_code_dtype(len(uniques)))
+        return _Column('dictionary', codes, np.asarray(uniques, dtype=object))
+
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    ends = np.cumsum(lengths)
+    offset_dtype = np.int32 if len(ends) == 0 or ends[-1] < np.iinfo(np.int32).max else np.int64
+    return _Column('text', ''.join(values), ends.astype(offset_dtype))
+
+
+def _code_dtype(size: int):
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _array_bytes(values) -> int:
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return int(pd.Series(values).memory_usage(index=False, deep=True))
+    return int(values.nbytes)
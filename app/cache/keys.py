@@ -0,0 +1,46 @@
+"""
+缓存键模块
+
+将函数名与请求参数规范化为稳定的缓存键
+"""
+
+
+def normalize_params(params: dict) -> tuple:
+    """
+    规范化请求参数
+
+    按参数名排序，并将取值统一为字符串表示，
+    使语义相同但顺序不同的请求得到相同结果
+
+    Args:
+        params: 请求参数
+
+    Returns:
+        (参数名, 参数值) 元组组成的有序元组
+    """
+    normalized = []
+    for name in sorted(params):
+        value = params[name]
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif value is None:
+            value = ''
+        else:
+            value = str(value).strip()
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+def make_cache_key(func_name: str, params: dict) -> str:
+    """
+    生成缓存键
+
+    Args:
+        func_name: 函数名称
+        params: 请求参数
+
+    Returns:
+        形如 ``func_name?a=1&b=2`` 的缓存键
+    """
+    query = '&'.join(f"{name}={value}" for name, value in normalize_params(params))
+    return f"{func_name}?{query}"
@@ -0,0 +1,121 @@
+"""
+内存缓存模块
+
+按条目数和总字节数进行 LRU 淘汰的进程内缓存
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from .base import CacheBackend, CacheEntry
+
+
+def estimate_size(value) -> int:
+    """
+    估算缓存值占用的字节数
+
+    Args:
+        value: 缓存值
+
+    Returns:
+        估算的字节数
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    # CompactFrame、CachedResponse 等自行记录占用的对象
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class MemoryCache(CacheBackend):
+    """线程安全的 LRU 内存缓存"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.is_retained():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value, ttl: int, stale_ttl: int = 0) -> CacheEntry | None:
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return None
+
+        now = time.time()
+        entry = CacheEntry(
+            value, stored_at=now, expires_at=now + ttl, size=size,
+            stale_until=now + ttl + stale_ttl,
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._total_bytes += size
+            self._evict()
+        return entry
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'backend': self.name,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
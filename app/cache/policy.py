@@ -0,0 +1,114 @@
+"""
+缓存过期策略模块
+
+按函数名或通配符前缀/后缀解析缓存 TTL
+"""
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+
+
+class TTLPolicy:
+    """缓存 TTL 策略"""
+
+    def __init__(self, default_ttl: int = 60, rules: dict = None,
+                 historical_ttl: int = 0, historical_params: tuple = ()):
+        """
+        Args:
+            default_ttl: 未匹配任何规则时的 TTL（秒）
+            rules: 函数名或通配符模式到 TTL 的映射，如 ``{'*_spot_em': 5}``
+            historical_ttl: 截止日期早于今天的历史查询使用的 TTL（秒），0 表示不启用
+            historical_params: 表示截止日期的参数名
+        """
+        self.default_ttl = default_ttl
+        self.rules = dict(rules or {})
+        self.historical_ttl = historical_ttl
+        self.historical_params = tuple(historical_params)
+
+    @classmethod
+    def from_config(cls, config) -> 'TTLPolicy':
+        """根据应用配置创建策略"""
+        return cls(
+            default_ttl=config.get('CACHE_DEFAULT_TTL', 60),
+            rules=config.get('CACHE_TTL_RULES', {}),
+            historical_ttl=config.get('CACHE_HISTORICAL_TTL', 0),
+            historical_params=config.get('CACHE_HISTORICAL_PARAMS', ('end_date',)),
+        )
+
+    def match_rule(self, func_name: str) -> int | None:
+        """
+        查找函数对应的规则 TTL
+
+        精确匹配优先，其次选择最长（最具体）的通配符模式
+
+        Args:
+            func_name: 函数名称
+
+        Returns:
+            匹配的 TTL，无匹配时返回 None
+        """
+        if func_name in self.rules:
+            return self.rules[func_name]
+
+        matched = [
+            pattern for pattern in self.rules
+            if fnmatchcase(func_name, pattern)
+        ]
+        if not matched:
+            return None
+        return self.rules[max(matched, key=len)]
+
+    def resolve(self, func_name: str, params: dict) -> int:
+        """
+        解析本次调用的 TTL
+
+        Args:
+            func_name: 函数名称
+            params: 请求参数
+
+        Returns:
+            TTL（秒），0 表示不缓存
+        """
+        ttl = self.match_rule(func_name)
+        if ttl is None:
+            ttl = self.default_ttl
+
+        # 截止日期已过去的历史数据不会再变化，可以缓存更久
+        if self.historical_ttl and ttl > 0 and self._is_historical(params):
+            ttl = max(ttl, self.historical_ttl)
+
+        return max(int(ttl), 0)
+
+    def _is_historical(self, params: dict) -> bool:
+        for name in self.historical_params:
+            end_date = parse_date(params.get(name))
+            if end_date is not None:
+                return end_date < date.today()
+        return False
+
+
+def parse_date(value) -> date | None:
+    """
+    解析 akshare 常用的日期参数格式
+
+    支持 ``20240131``、``2024-01-31``、``2024/01/31``、``2024-01-31 15:00:00``
+
+    Args:
+        value: 参数值
+
+    Returns:
+        解析后的日期，无法解析时返回 None
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    for fmt in ('%Y%m%d', '%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,146 @@
+"""
+响应体缓存模块
+
+缓存函数调用的最终响应体（已编码、已压缩的字节），按 (函数, 参数, 输出格式, 查询条件, 压缩编码)
+区分。每个响应体记录其来源结果缓存条目的写入时间，结果刷新后旧响应体不再使用，
+命中时直接返回字节与预先计算的 ETag、Content-Length，不再还原、转换或编码 DataFrame
+"""
+import threading
+
+from flask import Response, current_app
+
+from .memory import MemoryCache
+
+# 随响应体保存的头部，其余头部（X-Cache、Age、Vary 等）每次请求重新设置
+STORED_HEADERS = ('ETag', 'Content-Encoding', 'X-Total-Count')
+
+# 响应体最长保留时间（秒），结果刷新后的旧响应体最终由 LRU 淘汰
+RETAIN_SECONDS = 24 * 3600
+
+
+class CachedResponse:
+    """一个已编码的响应"""
+
+    __slots__ = ('stored_at', 'body', 'mimetype', 'headers', 'nbytes')
+
+    def __init__(self, stored_at: float, body: bytes, mimetype: str, headers: list):
+        """
+        Args:
+            stored_at: 来源结果缓存条目的写入时间
+            body: 响应体（已压缩）
+            mimetype: 响应 MIME 类型
+            headers: 保存的响应头部
+        """
+        self.stored_at = stored_at
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = headers
+        self.nbytes = len(body) + sum(len(name) + len(value) for name, value in headers)
+
+    def to_response(self) -> Response:
+        """构造响应，Content-Length 由响应体长度直接得出"""
+        return Response(self.body, mimetype=self.mimetype, headers=self.headers)
+
+
+class ResponseCache:
+    """已编码响应体缓存"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 enabled: bool = True):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数
+            enabled: 是否启用
+        """
+        self.enabled = enabled
+        self.store = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'ResponseCache':
+        """根据应用配置创建缓存"""
+        return cls(
+            max_entries=config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024),
+            max_bytes=config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+            enabled=config.get('RESPONSE_CACHE_ENABLED', True),
+        )
+
+    def get(self, key: str, stored_at: float) -> CachedResponse | None:
+        """
+        获取由指定结果缓存条目生成的响应
+
+        Args:
+            key: 响应键（make_response_key 的返回值）
+            stored_at: 当前结果缓存条目的写入时间
+
+        Returns:
+            已编码的响应，不存在或来自已刷新的结果时返回 None
+        """
+        entry = self.store.get(key)
+        cached = entry.value if entry is not None else None
+        if cached is None or cached.stored_at != stored_at:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return cached
+
+    def set(self, key: str, stored_at: float, response: Response) -> None:
+        """
+        保存最终响应
+
+        Args:
+            key: 响应键
+            stored_at: 响应来源结果缓存条目的写入时间
+            response: 已完成压缩与 ETag 处理的非流式响应
+        """
+        headers = [
+            (name, response.headers[name]) for name in STORED_HEADERS if name in response.headers
+        ]
+        cached = CachedResponse(stored_at, response.get_data(), response.mimetype, headers)
+        self.store.set(key, cached, RETAIN_SECONDS)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {'hits': self.hits, 'misses': self.misses}
+        return {'enabled': self.enabled, **counters, **self.store.stats()}
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def make_response_key(cache_key: str, fmt: str, query_key: str, encoding: str | None) -> str:
+    """
+    生成响应键
+
+    Args:
+        cache_key: 结果缓存键（make_cache_key 的返回值）
+        fmt: 输出格式
+        query_key: 查询条件的规范表示（Query.key），由调用方按解析后的查询条件生成
+        encoding: 协商得到的压缩编码，不压缩时为 None
+
+    Returns:
+        响应键
+    """
+    return f"{cache_key}#{fmt}#{query_key}#{encoding or 'identity'}"
+
+
+def init_response_cache(app):
+    """
+    初始化应用的响应体缓存
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_responses'] = ResponseCache.from_config(app.config)
+
+
+def get_response_cache() -> ResponseCache:
+    """获取当前应用的响应体缓存"""
+    return current_app.extensions['akgate_responses']
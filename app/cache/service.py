@@ -0,0 +1,285 @@
+"""
+结果缓存服务模块
+
+在 akshare 函数调用前提供带 TTL 的结果缓存，
+支持 stale-while-revalidate（过期后短时间内先返回旧数据并在后台刷新）
+与 stale-if-error（上游出错时回退到最近一次成功结果）
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.exceptions import APIError
+from app.logging_config import get_logger
+from .base import CacheBackend
+from .compact import pack, unpack
+from .keys import make_cache_key
+from .memory import MemoryCache
+from .policy import TTLPolicy
+from .singleflight import SingleFlight
+from .sqlite import SQLiteCache
+
+logger = get_logger('cache')
+
+# 过期数据对应的 Warning 响应头（RFC 7234）
+WARNING_STALE = '110 - "Response is Stale"'
+WARNING_REVALIDATION_FAILED = '111 - "Revalidation Failed"'
+
+
+class CacheLookup:
+    """一次缓存查询的结果"""
+
+    __slots__ = ('_value', 'status', 'age', 'warning', 'stored_at')
+
+    def __init__(self, value, status: str, age: int = 0, warning: str = None,
+                 stored_at: float = None):
+        """
+        Args:
+            value: 函数返回值或缓存中的打包值
+            status: 缓存状态（HIT / MISS / STALE / BYPASS）
+            age: 缓存条目已存在的秒数
+            warning: 返回过期数据时的 Warning 响应头
+            stored_at: 缓存条目的写入时间，标识结果来自哪一次加载；未写入缓存时为 None
+        """
+        self._value = value
+        self.status = status
+        self.age = age
+        self.warning = warning
+        self.stored_at = stored_at
+
+    @property
+    def value(self):
+        """函数返回值，打包的 DataFrame 在首次访问时还原"""
+        self._value = unpack(self._value)
+        return self._value
+
+
+class ResultCache:
+    """akshare 调用结果缓存"""
+
+    def __init__(self, store: CacheBackend, policy: TTLPolicy, enabled: bool = True,
+                 stale_while_revalidate: int = 0, stale_if_error: int = 0,
+                 refresh_workers: int = 2, compact: bool = True, compress: bool = False):
+        """
+        Args:
+            store: 缓存后端
+            policy: TTL 策略
+            enabled: 是否启用缓存
+            stale_while_revalidate: 过期后仍可直接返回旧数据并后台刷新的时间（秒）
+            stale_if_error: 过期后上游出错时仍可回退到旧数据的时间（秒）
+            refresh_workers: 后台刷新线程数
+            compact: 是否将 DataFrame 按列打包后存储
+            compress: 打包时是否按列压缩
+        """
+        self.store = store
+        self.policy = policy
+        self.enabled = enabled
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.compact = compact
+        self.compress = compress
+        self.singleflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.refreshes = 0
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix='akgate-refresh'
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'ResultCache':
+        """根据应用配置创建缓存"""
+        return cls(
+            store=create_backend(config),
+            policy=TTLPolicy.from_config(config),
+            enabled=config.get('CACHE_ENABLED', True),
+            stale_while_revalidate=config.get('CACHE_STALE_WHILE_REVALIDATE', 0),
+            stale_if_error=config.get('CACHE_STALE_IF_ERROR', 0),
+            refresh_workers=config.get('CACHE_REFRESH_WORKERS', 2),
+            compact=config.get('CACHE_COMPACT', True),
+            compress=config.get('CACHE_COMPACT_COMPRESS', False),
+        )
+
+    def get_or_load(self, func_name: str, params: dict, loader) -> CacheLookup:
+        """
+        读取缓存，未命中时调用 loader 加载并写入缓存
+
+        相同键的并发未命中请求会合并为一次 loader 调用；
+        loader 抛出的异常不会被缓存，会传播给所有等待者。
+        条目过期后：
+        - 在 stale-while-revalidate 窗口内直接返回旧数据，并在后台刷新一次
+        - 在 stale-if-error 窗口内，若刷新时上游出错（5xx），返回旧数据
+
+        Args:
+            func_name: 函数名称
+            params: 请求参数
+            loader: 无参可调用对象，返回函数结果，需在应用上下文中调用
+
+        Returns:
+            CacheLookup 实例
+        """
+        key = make_cache_key(func_name, params)
+        ttl = self.policy.resolve(func_name, params) if self.enabled else 0
+        if ttl <= 0:
+            value, _ = self.singleflight.do(key, loader)
+            return CacheLookup(value, 'BYPASS')
+
+        entry = self.store.get(key)
+        if entry is not None and not entry.is_expired():
+            self._count('hits')
+            logger.debug(f"Cache hit: {key}")
+            return CacheLookup(entry.value, 'HIT', entry.age(), stored_at=entry.stored_at)
+
+        if entry is not None and self._within(entry, self.stale_while_revalidate):
+            self._count('stale')
+            self._schedule_refresh(key, loader, ttl)
+            return CacheLookup(
+                entry.value, 'STALE', entry.age(), WARNING_STALE, entry.stored_at,
+            )
+
+        self._count('misses')
+        try:
+            (value, stored_at), _ = self.singleflight.do(
+                key, lambda: self._load(key, loader, ttl)
+            )
+        except APIError as e:
+            if e.status_code < 500 or entry is None or not self._within(entry, self.stale_if_error):
+                raise
+            self._count('stale')
+            logger.warning(f"Serving stale result after upstream error: {key} - {e.message}")
+            return CacheLookup(
+                entry.value, 'STALE', entry.age(), WARNING_REVALIDATION_FAILED, entry.stored_at,
+            )
+        return CacheLookup(value, 'MISS', stored_at=stored_at)
+
+    def warm(self, func_name: str, params: dict, loader, ttl: int = None) -> bool:
+        """
+        预热缓存：没有新鲜条目时调用 loader 加载并写入
+
+        Args:
+            func_name: 函数名称
+            params: 请求参数
+            loader: 无参可调用对象，返回函数结果，需在应用上下文中调用
+            ttl: 覆盖策略 TTL（秒），默认使用策略解析结果
+
+        Returns:
+            是否实际调用了 loader
+        """
+        if not self.enabled:
+            return False
+        ttl = self.policy.resolve(func_name, params) if ttl is None else ttl
+        if ttl <= 0:
+            return False
+
+        key = make_cache_key(func_name, params)
+        entry = self.store.get(key)
+        if entry is not None and not entry.is_expired():
+            return False
+        self.singleflight.do(key, lambda: self._load(key, loader, ttl))
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'refreshes': self.refreshes,
+            }
+        return {
+            'enabled': self.enabled,
+            **counters,
+            **self.store.stats(),
+            'singleflight': self.singleflight.stats(),
+        }
+
+    @property
+    def stale_ttl(self) -> int:
+        """条目在新鲜期结束后需要继续保留的时间"""
+        return max(self.stale_while_revalidate, self.stale_if_error)
+
+    def _load(self, key: str, loader, ttl: int) -> tuple:
+        # 上一轮合并调用可能在本次未命中后刚写入缓存
+        cached = self.store.get(key)
+        if cached is not None and not cached.is_expired():
+            return unpack(cached.value), cached.stored_at
+        value = loader()
+        stored = pack(value, self.compress) if self.compact else value
+        entry = self.store.set(key, stored, ttl, self.stale_ttl)
+        return value, entry.stored_at if entry is not None else None
+
+    def _schedule_refresh(self, key: str, loader, ttl: int) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+        app = current_app._get_current_object()
+        self._refresher.submit(self._refresh, app, key, loader, ttl)
+
+    def _refresh(self, app, key: str, loader, ttl: int) -> None:
+        try:
+            with app.app_context():
+                self.singleflight.do(key, lambda: self._load(key, loader, ttl))
+            logger.debug(f"Cache refreshed: {key}")
+        except Exception as e:
+            logger.warning(f"Background refresh failed: {key} - {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    @staticmethod
+    def _within(entry, window: int) -> bool:
+        return window > 0 and time.time() < entry.expires_at + window
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def create_backend(config) -> CacheBackend:
+    """
+    根据配置创建缓存后端
+
+    Args:
+        config: 应用配置
+
+    Returns:
+        缓存后端实例
+
+    Raises:
+        ValueError: 未知的后端类型
+    """
+    backend = config.get('CACHE_BACKEND', 'memory')
+    max_entries = config.get('CACHE_MAX_ENTRIES', 1024)
+    max_bytes = config.get('CACHE_MAX_BYTES', 256 * 1024 * 1024)
+
+    if backend == 'memory':
+        return MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+    if backend == 'sqlite':
+        return SQLiteCache(
+            path=config.get('CACHE_SQLITE_PATH', '/tmp/akgate/cache.sqlite3'),
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+        )
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def init_cache(app):
+    """
+    初始化应用的结果缓存
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_cache'] = ResultCache.from_config(app.config)
+
+
+def get_cache() -> ResultCache:
+    """获取当前应用的结果缓存"""
+    return current_app.extensions['akgate_cache']
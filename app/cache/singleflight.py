@@ -0,0 +1,82 @@
+"""
+请求合并模块
+
+相同键的并发调用只执行一次，其余调用等待并共享其结果或异常
+"""
+import threading
+
+
+class _Call:
+    """一次进行中的调用"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """线程级请求合并器"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn) -> tuple:
+        """
+        执行 fn，若相同 key 的调用正在进行则等待其完成
+
+        Args:
+            key: 调用键
+            fn: 无参可调用对象
+
+        Returns:
+            (结果, 是否为合并调用) 元组
+
+        Raises:
+            fn 抛出的异常，所有等待者都会收到同一个异常
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
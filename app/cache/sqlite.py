@@ -0,0 +1,192 @@
+"""
+SQLite 缓存模块
+
+基于本地 SQLite 文件的共享缓存，供同一主机上的多个 gunicorn 工作进程共用
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from .base import CacheBackend, CacheEntry
+
+# 命中时最近访问时间的刷新间隔（秒）。每次刷新都是一次写事务，会与其他进程的读写争用 SQLite 的写锁，
+# LRU 淘汰只需要粗粒度的访问时间
+TOUCH_INTERVAL = 5.0
+
+# 表结构版本，结构变化时重建缓存表（缓存数据可以丢弃）
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+DROP TABLE IF EXISTS cache_entries;
+CREATE TABLE cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX idx_cache_entries_accessed ON cache_entries (accessed_at);
+CREATE INDEX idx_cache_entries_stale ON cache_entries (stale_until);
+"""
+
+
+class SQLiteCache(CacheBackend):
+    """
+    跨进程共享的 SQLite 缓存
+
+    值以 pickle 形式存储；按最近访问时间进行 LRU 淘汰，访问时间距上次刷新超过
+    touch_interval 秒时才写回，读请求通常不需要获取写锁。
+    每个线程（以及 fork 后的每个进程）使用独立连接
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: str, max_entries: int = 1024,
+                 max_bytes: int = 256 * 1024 * 1024, timeout: float = 30.0,
+                 touch_interval: float = TOUCH_INTERVAL):
+        """
+        Args:
+            path: 数据库文件路径
+            max_entries: 最大条目数
+            max_bytes: 最大总字节数
+            timeout: 等待数据库锁的超时时间（秒）
+            touch_interval: 命中时刷新最近访问时间的最小间隔（秒）
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.evictions = 0
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._migrate()
+
+    def get(self, key: str) -> CacheEntry | None:
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT value, stored_at, expires_at, stale_until, accessed_at, size '
+            'FROM cache_entries WHERE key = ?',
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, stored_at, expires_at, stale_until, accessed_at, size = row
+        if now >= stale_until:
+            with conn:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE key = ? AND stale_until <= ?',
+                    (key, now),
+                )
+            return None
+
+        if now - accessed_at >= self.touch_interval:
+            with conn:
+                conn.execute('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return CacheEntry(pickle.loads(value), stored_at, expires_at, size, stale_until)
+
+    def set(self, key: str, value, ttl: int, stale_ttl: int = 0) -> CacheEntry | None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(data)
+        if size > self.max_bytes:
+            return None
+
+        now = time.time()
+        stale_until = now + ttl + stale_ttl
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries '
+                '(key, value, stored_at, expires_at, stale_until, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(data), now, now + ttl, stale_until, now, size),
+            )
+            conn.execute('DELETE FROM cache_entries WHERE stale_until <= ?', (now,))
+            self._evict(conn)
+        return CacheEntry(value, now, now + ttl, size, stale_until)
+
+    def delete(self, key: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM cache_entries')
+
+    def stats(self) -> dict:
+        entries, total_bytes = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+        ).fetchone()
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'entries': entries,
+            'bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self):
+        return self.stats()['entries']
+
+    def _evict(self, conn) -> None:
+        entries, total_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries'
+        ).fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # 按最近访问时间从旧到新删除，直到满足容量限制
+        rows = conn.execute(
+            'SELECT key, size FROM cache_entries ORDER BY accessed_at'
+        ).fetchall()
+        victims = []
+        for key, size in rows:
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            entries -= 1
+            total_bytes -= size
+        conn.executemany('DELETE FROM cache_entries WHERE key = ?', victims)
+        self.evictions += len(victims)
+
+    def _migrate(self) -> None:
+        # 多个工作进程可能同时启动，在写事务中检查并重建表结构
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                for statement in _SCHEMA.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork 后的子进程不能复用父进程的连接
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.conn = self._connect()
+            self._local.pid = pid
+        return self._local.conn
@@ -3,9 +3,24 @@
 
 支持通过环境变量覆盖默认配置
 """
+import json
 import os
 
 
+def _parse_ttl_rules(value: str) -> dict:
+    """
+    解析缓存 TTL 规则字符串
+
+    格式: ``pattern=seconds,pattern=seconds``，如 ``*_spot_em=5,*_hist=300``
+    """
+    rules = {}
+    for item in value.split(','):
+        pattern, sep, ttl = item.partition('=')
+        if sep and pattern.strip() and ttl.strip().isdigit():
+            rules[pattern.strip()] = int(ttl)
+    return rules
+
+
 class Config:
     """基础配置类"""
 
@@ -16,6 +31,12 @@ class Config:
     # API 配置
     API_PREFIX = '/api'
 
+    # akshare 导入模式：eager（创建应用时导入，配合 gunicorn preload 由工作进程共享）
+    # 或 lazy（首次调用 API 时导入，健康检查端点可立即响应）
+    AKSHARE_IMPORT_MODE = os.getenv('AKSHARE_IMPORT_MODE', 'eager')
+    # 是否推迟启动后台线程（缓存预热），gunicorn preload 模式下由工作进程启动后调用 start_background_tasks
+    DEFER_BACKGROUND_TASKS = os.getenv('DEFER_BACKGROUND_TASKS', 'false').lower() == 'true'
+
     # 安全配置：是否启用函数白名单限制
     # 设置为 False 时允许调用所有 akshare 函数（不推荐用于生产环境）
     ENABLE_FUNCTION_WHITELIST = os.getenv('ENABLE_FUNCTION_WHITELIST', 'false').lower() == 'true'
@@ -44,6 +65,201 @@ class Config:
         'macro_china_ppi',
     }
 
+    # 是否按 akshare 函数签名转换参数类型、规范化日期格式、补全默认值，并拒绝未知参数
+    PARAM_CANONICALIZE = os.getenv('PARAM_CANONICALIZE', 'true').lower() == 'true'
+    # 不区分大小写的参数，规范化时转为小写；只对默认值为小写字符串的函数生效（如 period='daily'），
+    # 默认值含大写字母（如 period='5Y'、'LAST10'）的函数保持原值
+    PARAM_CASE_INSENSITIVE = tuple(
+        name.strip() for name in os.getenv('PARAM_CASE_INSENSITIVE', 'period,adjust').split(',')
+        if name.strip()
+    )
+
+    # 缓存预热配置：按调度规则在后台提前调用热门函数并写入结果缓存
+    PREWARM_ENABLED = os.getenv('PREWARM_ENABLED', 'false').lower() == 'true'
+    # cron 表达式使用的时区
+    PREWARM_TIMEZONE = os.getenv('PREWARM_TIMEZONE', 'Asia/Shanghai')
+    # 同时执行的预热调用数与每次执行前的最大随机延迟（秒）
+    PREWARM_MAX_CONCURRENCY = int(os.getenv('PREWARM_MAX_CONCURRENCY', 2))
+    PREWARM_JITTER = float(os.getenv('PREWARM_JITTER', 5))
+    # 预热任务：function、params，cron（分 时 日 月 周）或 interval（秒）二选一，
+    # 可选 ttl 覆盖缓存 TTL（秒）。可通过环境变量 PREWARM_SCHEDULE 以 JSON 格式设置
+    PREWARM_SCHEDULE = json.loads(os.getenv('PREWARM_SCHEDULE', 'null')) or [
+        # 开盘时预热实时行情，使用常规行情 TTL，避免开盘后仍返回盘前快照
+        {'function': 'stock_zh_a_spot_em', 'cron': '30 9 * * 1-5'},
+        {'function': 'fund_etf_spot_em', 'cron': '30 9 * * 1-5'},
+        # 指数成分股每日更新一次
+        {'function': 'index_stock_cons', 'params': {'symbol': '000300'}, 'cron': '0 9 * * 1-5'},
+    ]
+
+    # 结果缓存配置
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() == 'true'
+    # 缓存后端：memory（进程内）或 sqlite（本地文件，多个工作进程共享）
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', '/tmp/akgate/cache.sqlite3')
+    # 最大缓存条目数与总字节数，超出时按 LRU 淘汰
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    # 未匹配任何规则时的 TTL（秒）
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 60))
+    # 按函数名或通配符设置 TTL（秒），0 表示不缓存；精确匹配优先，其次最长模式
+    # 可通过环境变量 CACHE_TTL_RULES 设置，如 "*_spot_em=5,*_hist=300"
+    CACHE_TTL_RULES = _parse_ttl_rules(os.getenv('CACHE_TTL_RULES', '')) or {
+        '*_spot': 5,
+        '*_spot_em': 5,
+        '*_spot_sina': 5,
+        '*_hist': 300,
+        '*_hist_*': 60,
+        'macro_*': 3600,
+        'stock_info_a_code_name': 3600,
+        'index_stock_cons': 3600,
+    }
+    # 截止日期早于今天的历史查询不会再变化，使用更长的 TTL
+    CACHE_HISTORICAL_TTL = int(os.getenv('CACHE_HISTORICAL_TTL', 24 * 3600))
+    CACHE_HISTORICAL_PARAMS = ('end_date',)
+    # 过期后仍直接返回旧数据并在后台刷新的时间窗口（秒），0 表示不启用
+    CACHE_STALE_WHILE_REVALIDATE = int(os.getenv('CACHE_STALE_WHILE_REVALIDATE', 30))
+    # 过期后上游出错时回退到最近一次成功结果的时间窗口（秒），0 表示不启用
+    CACHE_STALE_IF_ERROR = int(os.getenv('CACHE_STALE_IF_ERROR', 600))
+    # 后台刷新线程数
+    CACHE_REFRESH_WORKERS = int(os.getenv('CACHE_REFRESH_WORKERS', 2))
+    # DataFrame 按列打包后存储（字符串列字典编码或拼接），读取时还原
+    CACHE_COMPACT = os.getenv('CACHE_COMPACT', 'true').lower() == 'true'
+    # 打包时按列 zlib 压缩，内存约再减半，读取时需解压
+    CACHE_COMPACT_COMPRESS = os.getenv('CACHE_COMPACT_COMPRESS', 'false').lower() == 'true'
+
+    # 响应体缓存：按输出格式、查询条件与压缩编码保存最终响应字节，结果缓存命中时直接返回
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+    # 历史行情增量获取：按 (函数, symbol, period, adjust) 保存已获取的 K 线，只拉取未覆盖的日期区间
+    HISTORY_ENABLED = os.getenv('HISTORY_ENABLED', 'true').lower() == 'true'
+    # 最多保留的序列数，超出时按 LRU 淘汰
+    HISTORY_MAX_SERIES = int(os.getenv('HISTORY_MAX_SERIES', 256))
+    # 函数描述：date_column 日期列，upstream_range 为 False 表示上游不支持日期参数
+    # （网关接受 start_date/end_date 但不传给上游，拉取完整序列后切片），require 限定可增量获取的参数取值
+    # （前复权数据会随除权整体变化，周线、月线的边界 K 线会随区间变化）
+    HISTORY_FUNCTIONS = json.loads(os.getenv('HISTORY_FUNCTIONS', 'null')) or {
+        'stock_zh_a_hist': {
+            'date_column': '日期',
+            'require': {'period': ['daily'], 'adjust': ['', 'hfq']},
+        },
+        'fund_etf_hist_em': {
+            'date_column': '日期',
+            'require': {'period': ['daily'], 'adjust': ['', 'hfq']},
+        },
+        'index_zh_a_hist': {
+            'date_column': '日期',
+            'require': {'period': ['daily']},
+        },
+        'futures_zh_daily_sina': {
+            'date_column': 'date',
+            'upstream_range': False,
+        },
+    }
+
+    # 历史行情本地列式存储：已定稿的 K 线按 函数/symbol/年份 写入 Feather 文件，重启后直接读取
+    HISTORY_LAKE_ENABLED = os.getenv('HISTORY_LAKE_ENABLED', 'false').lower() == 'true'
+    HISTORY_LAKE_PATH = os.getenv('HISTORY_LAKE_PATH', '/tmp/akgate/lake')
+    # 总字节数预算，超出时按最近访问时间淘汰整条序列
+    HISTORY_LAKE_MAX_BYTES = int(os.getenv('HISTORY_LAKE_MAX_BYTES', 1024 * 1024 * 1024))
+
+    # 快照版本：行情快照类函数按主键列保留最近的版本，客户端带 _since=<版本号> 时只返回变化的行
+    SNAPSHOT_ENABLED = os.getenv('SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    # 函数名到主键列的映射，可通过环境变量 SNAPSHOT_FUNCTIONS 以 JSON 格式设置
+    SNAPSHOT_FUNCTIONS = json.loads(os.getenv('SNAPSHOT_FUNCTIONS', 'null')) or {
+        'stock_zh_a_spot_em': '代码',
+        'fund_etf_spot_em': '代码',
+    }
+    # 每组参数保留的版本数
+    SNAPSHOT_MAX_VERSIONS = int(os.getenv('SNAPSHOT_MAX_VERSIONS', 8))
+    # 最多保留的参数组数，超出时按 LRU 淘汰
+    SNAPSHOT_MAX_SERIES = int(os.getenv('SNAPSHOT_MAX_SERIES', 64))
+
+    # 流式输出时每批编码的行数
+    STREAM_BATCH_ROWS = int(os.getenv('STREAM_BATCH_ROWS', 5000))
+
+    # 上游限流配置
+    UPSTREAM_LIMIT_ENABLED = os.getenv('UPSTREAM_LIMIT_ENABLED', 'true').lower() == 'true'
+    # 排队最长等待时间（秒），超时返回 503 UPSTREAM_BUSY
+    UPSTREAM_MAX_WAIT = float(os.getenv('UPSTREAM_MAX_WAIT', 30))
+    # 分摊分组限额的工作进程数：限流状态在进程内，各进程使用 1/UPSTREAM_WORKERS 的限额
+    # gunicorn.conf.py 默认设置为 GUNICORN_WORKERS
+    UPSTREAM_WORKERS = int(os.getenv('UPSTREAM_WORKERS', 1))
+    # 上游分组：函数名通配符、最大并发数、每秒调用数与突发数（0 表示不限制），按顺序匹配
+    # 限额为所有工作进程合计值
+    # 可通过环境变量 UPSTREAM_LIMITS 以 JSON 格式设置
+    UPSTREAM_LIMITS = json.loads(os.getenv('UPSTREAM_LIMITS', 'null')) or {
+        'eastmoney': {
+            'patterns': ['*_em', '*_em_*', 'stock_zh_a_hist', 'index_zh_a_hist'],
+            'max_concurrency': 4,
+            'rate': 5,
+            'burst': 10,
+        },
+        'sina': {
+            'patterns': ['*_sina', '*_sina_*'],
+            'max_concurrency': 2,
+            'rate': 2,
+            'burst': 5,
+        },
+    }
+
+    # 批量调用配置：线程池大小与单次请求最大调用数
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 8))
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 500))
+
+    # 异步任务配置：并发数、排队上限、结果保留时间（秒）与保留数量
+    JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', 2))
+    JOB_MAX_QUEUE = int(os.getenv('JOB_MAX_QUEUE', 100))
+    JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 3600))
+    JOB_MAX_RETAINED = int(os.getenv('JOB_MAX_RETAINED', 100))
+    # 任务状态存储：memory（只能在提交任务的进程中查询）或 sqlite（本地文件中的独立表，多个工作进程共享），
+    # 默认与 CACHE_BACKEND 一致；sqlite 存储中已完成任务的总字节预算，超出时淘汰最早完成的任务
+    JOB_BACKEND = os.getenv('JOB_BACKEND', CACHE_BACKEND)
+    JOB_SQLITE_PATH = os.getenv('JOB_SQLITE_PATH', '/tmp/akgate/jobs.sqlite3')
+    JOB_STORE_MAX_BYTES = int(os.getenv('JOB_STORE_MAX_BYTES', 1024 * 1024 * 1024))
+
+    # 是否为函数调用响应添加基于内容哈希的 ETag，并对 If-None-Match 返回 304
+    ETAG_ENABLED = os.getenv('ETAG_ENABLED', 'true').lower() == 'true'
+    # 响应压缩：按 Accept-Encoding 协商，服务端按 COMPRESSION_ENCODINGS 的顺序优先选择
+    # br 需要安装 brotli，zstd 需要安装 zstandard（pip install ".[compression]"）
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_ENCODINGS = tuple(
+        name.strip() for name in os.getenv('COMPRESSION_ENCODINGS', 'zstd,br,gzip').split(',')
+        if name.strip()
+    )
+    # 小于该字节数的响应不压缩
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    # 各编码的压缩级别
+    COMPRESSION_LEVELS = {
+        'gzip': int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)),
+        'br': int(os.getenv('COMPRESSION_BR_LEVEL', 4)),
+        'zstd': int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3)),
+    }
+
+    # 订阅推送：相同函数与参数的订阅共享一个数据源，按间隔（秒）轮询上游
+    SUBSCRIBE_INTERVAL = float(os.getenv('SUBSCRIBE_INTERVAL', 3))
+    # 每个进程最多同时保持的订阅连接数，gthread 模式下每个连接占用一个线程，需不大于 GUNICORN_THREADS
+    SUBSCRIBE_MAX_CLIENTS = int(os.getenv('SUBSCRIBE_MAX_CLIENTS', 256))
+    # 并发轮询的数据源数
+    SUBSCRIBE_MAX_WORKERS = int(os.getenv('SUBSCRIBE_MAX_WORKERS', 4))
+    # 每个连接的待发送事件上限，客户端消费过慢时丢弃积压并改为推送最新全量数据
+    SUBSCRIBE_QUEUE_SIZE = int(os.getenv('SUBSCRIBE_QUEUE_SIZE', 16))
+    # 空闲连接的心跳间隔（秒）
+    SUBSCRIBE_HEARTBEAT = float(os.getenv('SUBSCRIBE_HEARTBEAT', 15))
+
+    # 是否开放 /metrics（Prometheus 指标）端点
+    # 多进程部署时需设置环境变量 PROMETHEUS_MULTIPROC_DIR，gunicorn.conf.py 默认已设置
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # 是否在响应中添加 Server-Timing 头（validate / lookup / fetch / upstream / query / convert / encode 各阶段耗时）
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    # 是否允许通过 _profile=1 获取单次请求的 cProfile 分析报告（有额外开销，建议仅在排查时开启）
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    # 分析报告的排序字段与输出行数
+    PROFILING_SORT = os.getenv('PROFILING_SORT', 'cumulative')
+    PROFILING_TOP_N = int(os.getenv('PROFILING_TOP_N', 40))
+
     # 日志配置
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -66,6 +282,7 @@ class TestingConfig(Config):
     """测试环境配置"""
     TESTING = True
     DEBUG = True
+    AKSHARE_IMPORT_MODE = 'lazy'
 
 
 # 配置映射
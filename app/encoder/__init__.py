@@ -1 +1,9 @@
 from .json_provider import CustomJSONProvider
+from .formats import (
+    FORMAT_MIMETYPES,
+    check_format,
+    negotiate_format,
+    to_arrow_ipc,
+    to_columns,
+    to_parquet,
+)
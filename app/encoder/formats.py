@@ -0,0 +1,138 @@
+"""
+输出格式模块
+
+支持 JSON（按行）、NDJSON、列式 JSON、Arrow IPC 流和 Parquet 输出，
+列式格式直接按列转换 DataFrame，不逐行构造字典
+"""
+import io
+
+import pandas as pd
+
+from app.exceptions import UnsupportedFormatError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+# 格式名称到 MIME 类型的映射
+FORMAT_MIMETYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'columns': 'application/vnd.akgate.columns+json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# 额外接受的 MIME 类型别名
+MIMETYPE_ALIASES = {
+    'application/x-parquet': 'parquet',
+    'application/vnd.apache.arrow.file': 'arrow',
+}
+
+# 仅适用于 DataFrame 结果的格式
+TABULAR_FORMATS = {'ndjson', 'columns', 'arrow', 'parquet'}
+
+# 需要 pyarrow 的格式
+ARROW_FORMATS = {'arrow', 'parquet'}
+
+
+def negotiate_format(requested: str | None, accept_mimetypes) -> str:
+    """
+    协商输出格式
+
+    ``_format`` 查询参数优先，其次根据 ``Accept`` 请求头选择，默认 JSON
+
+    Args:
+        requested: ``_format`` 参数值
+        accept_mimetypes: ``request.accept_mimetypes``
+
+    Returns:
+        格式名称
+
+    Raises:
+        UnsupportedFormatError: 请求的格式不受支持
+    """
+    if requested:
+        fmt = requested.lower()
+        if fmt not in FORMAT_MIMETYPES:
+            raise UnsupportedFormatError(f"Unsupported format: {requested}")
+        return fmt
+
+    candidates = ['application/json', *FORMAT_MIMETYPES.values(), *MIMETYPE_ALIASES]
+    best = accept_mimetypes.best_match(candidates, default='application/json')
+    if best in MIMETYPE_ALIASES:
+        return MIMETYPE_ALIASES[best]
+    for fmt, mimetype in FORMAT_MIMETYPES.items():
+        if mimetype == best:
+            return fmt
+    return 'json'
+
+
+def check_format(fmt: str, result) -> None:
+    """
+    检查结果能否以指定格式输出
+
+    Args:
+        fmt: 格式名称
+        result: akshare 函数返回值
+
+    Raises:
+        UnsupportedFormatError: 结果不是 DataFrame 或缺少 pyarrow
+    """
+    if fmt in TABULAR_FORMATS and not isinstance(result, pd.DataFrame):
+        raise UnsupportedFormatError(f"Format '{fmt}' is only available for tabular results")
+    if fmt in ARROW_FORMATS and pa is None:
+        raise UnsupportedFormatError(f"Format '{fmt}' requires pyarrow to be installed")
+
+
+def to_columns(df: pd.DataFrame) -> dict:
+    """
+    将 DataFrame 转换为列式结构
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        ``{"columns": [...], "data": {列名: [...]}}``
+    """
+    columns = [str(column) for column in df.columns]
+    return {
+        'columns': columns,
+        'data': {
+            name: df.iloc[:, i].tolist()
+            for i, name in enumerate(columns)
+        },
+    }
+
+
+def to_arrow_table(df: pd.DataFrame):
+    """
+    将 DataFrame 转换为 Arrow Table
+
+    Raises:
+        UnsupportedFormatError: 列中包含无法转换为 Arrow 类型的值
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, ValueError, TypeError) as e:
+        raise UnsupportedFormatError(f"Result cannot be encoded as Arrow: {e}")
+
+
+def to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """将 DataFrame 编码为 Arrow IPC 流"""
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(df: pd.DataFrame) -> bytes:
+    """将 DataFrame 编码为 Parquet"""
+    table = to_arrow_table(df)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
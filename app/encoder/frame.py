@@ -0,0 +1,177 @@
+"""
+DataFrame JSON 编码模块
+
+按列将 DataFrame 编码为 JSON 片段，再按行模板拼接，
+输出与 ``CustomJSONProvider.dumps(df.to_dict('records'))`` 逐字节一致，
+但避免了逐行构造字典和逐值调用 ``default`` 回调
+"""
+from datetime import date
+from json.encoder import encode_basestring
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+from pandas.core.dtypes.cast import maybe_box_native
+
+_DATE_FORMAT = '%Y-%m-%d'
+_NAT = np.iinfo(np.int64).min
+
+
+def can_encode_records(df: pd.DataFrame) -> bool:
+    """
+    判断 DataFrame 能否走按列编码路径
+
+    列名必须全部为唯一的字符串，否则 ``to_dict('records')`` 的键语义无法按模板复现
+    """
+    return df.columns.is_unique and all(isinstance(column, str) for column in df.columns)
+
+
+def encode_records(df: pd.DataFrame, dumps_value) -> str:
+    """
+    将 DataFrame 编码为按行的 JSON 数组
+
+    Args:
+        df: DataFrame，列名需满足 ``can_encode_records``
+        dumps_value: 单值编码函数，用于无法按列处理的值
+
+    Returns:
+        JSON 字符串
+    """
+    if df.empty:
+        return '[]'
+    return '[' + ', '.join(iter_encoded_rows(df, dumps_value)) + ']'
+
+
+def iter_encoded_rows(df: pd.DataFrame, dumps_value):
+    """
+    逐行返回 DataFrame 的 JSON 对象字符串
+
+    Args:
+        df: DataFrame，列名需满足 ``can_encode_records``
+        dumps_value: 单值编码函数
+
+    Returns:
+        JSON 对象字符串迭代器
+    """
+    # 列名作为模板常量编码一次；'%' 需转义以免被格式化占位符解析
+    template = '{' + ', '.join(
+        encode_basestring(column).replace('%', '%%') + ': %s' for column in df.columns
+    ) + '}'
+    columns = [encode_column(df.iloc[:, i], dumps_value) for i in range(df.shape[1])]
+    return (template % values for values in zip(*columns))
+
+
+def iter_record_batches(df: pd.DataFrame, dumps_value, batch_rows: int):
+    """
+    按行批次编码 DataFrame
+
+    每次只对一个批次的行做列转换，峰值内存与批次大小相关而与结果总行数无关
+
+    Args:
+        df: DataFrame
+        dumps_value: 单值编码函数
+        batch_rows: 每批行数
+
+    Returns:
+        每批 JSON 对象字符串列表的迭代器
+    """
+    fast = can_encode_records(df)
+    for start in range(0, len(df), batch_rows):
+        batch = df.iloc[start:start + batch_rows]
+        if fast:
+            yield list(iter_encoded_rows(batch, dumps_value))
+        else:
+            yield [dumps_value(record) for record in batch.to_dict('records')]
+
+
+def encode_column(series: pd.Series, dumps_value) -> list:
+    """
+    将一列编码为 JSON 片段列表
+
+    Args:
+        series: 列数据
+        dumps_value: 单值编码函数
+
+    Returns:
+        与行数等长的 JSON 片段列表
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        kind = dtype.kind
+        if kind in 'iu':
+            return list(map(repr, series.tolist()))
+        if kind == 'b':
+            return ['true' if value else 'false' for value in series.tolist()]
+        if kind == 'f':
+            return _encode_floats(series.to_numpy())
+        if kind == 'M':
+            return _encode_datetimes(series)
+        if kind == 'O':
+            return _encode_objects(series, dumps_value)
+    elif isinstance(dtype, pd.DatetimeTZDtype):
+        return _encode_datetimes(series)
+
+    return [dumps_value(maybe_box_native(value)) for value in series]
+
+
+def _encode_floats(values: np.ndarray) -> list:
+    # NaN 与 ±Infinity 在 ignore_nan 模式下均输出 null
+    encoded = list(map(repr, values.tolist()))
+    invalid = ~np.isfinite(values)
+    if invalid.any():
+        for i in np.flatnonzero(invalid).tolist():
+            encoded[i] = 'null'
+    return encoded
+
+
+def _encode_datetimes(series: pd.Series) -> list:
+    # 与 Timestamp.timestamp() 一致：round(value / 每秒单位数, 6) 后转毫秒并截断
+    array = series.array
+    values = array.asi8
+    per_second = 10 ** {'s': 0, 'ms': 3, 'us': 6, 'ns': 9}[array.unit]
+    valid = values != _NAT
+
+    if (values[valid] % per_second == 0).all():
+        # 整秒时间戳可精确地整数换算
+        encoded = list(map(repr, (values // per_second * 1000).tolist()))
+    else:
+        encoded = [
+            repr(int(round(float(value) / per_second, 6) * 1000))
+            for value in values.tolist()
+        ]
+
+    if not valid.all():
+        for i in np.flatnonzero(~valid).tolist():
+            encoded[i] = 'null'
+    return encoded
+
+
+def _encode_objects(series: pd.Series, dumps_value) -> list:
+    values = series.tolist()
+    inferred = infer_dtype(series, skipna=False)
+    if inferred == 'string':
+        return list(map(encode_basestring, values))
+    if inferred == 'date':
+        # 年份不小于 1000 时 isoformat() 与 strftime('%Y-%m-%d') 结果相同且快得多
+        if min(value.year for value in values) >= 1000:
+            return [
+                '"' + value.isoformat() + '"' if type(value) is date
+                else dumps_value(value)
+                for value in values
+            ]
+        return [
+            '"' + value.strftime(_DATE_FORMAT) + '"' if type(value) is date
+            else dumps_value(value)
+            for value in values
+        ]
+
+    encoded = []
+    for value in values:
+        value_type = type(value)
+        if value_type is str:
+            encoded.append(encode_basestring(value))
+        elif value is None:
+            encoded.append('null')
+        else:
+            encoded.append(dumps_value(maybe_box_native(value)))
+    return encoded
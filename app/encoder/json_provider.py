@@ -4,6 +4,8 @@ import pandas as pd
 import simplejson
 from flask.json.provider import JSONProvider
 
+from .frame import can_encode_records, encode_records, iter_record_batches
+
 
 class CustomJSONProvider(JSONProvider):
 
@@ -16,6 +18,34 @@ class CustomJSONProvider(JSONProvider):
         kwargs['default'] = self.default
         return simplejson.dumps(obj, **kwargs)
 
+    def dumps_frame(self, df: pd.DataFrame) -> str:
+        """
+        将 DataFrame 按行编码为 JSON
+
+        结果与 ``dumps(df.to_dict('records'))`` 逐字节一致，但按列批量转换
+        """
+        if not can_encode_records(df):
+            return self.dumps([] if df.empty else df.to_dict('records'))
+        return encode_records(df, self.dumps)
+
+    def iter_frame(self, df: pd.DataFrame, batch_rows: int = 5000):
+        """
+        分批流式编码 DataFrame 为 JSON 数组
+
+        拼接后的内容与 ``dumps_frame(df)`` 逐字节一致
+        """
+        yield '['
+        separator = ''
+        for rows in iter_record_batches(df, self.dumps, batch_rows):
+            yield separator + ', '.join(rows)
+            separator = ', '
+        yield ']'
+
+    def iter_frame_lines(self, df: pd.DataFrame, batch_rows: int = 5000):
+        """分批流式编码 DataFrame 为 NDJSON，每行一条记录"""
+        for rows in iter_record_batches(df, self.dumps, batch_rows):
+            yield '\n'.join(rows) + '\n'
+
     def loads(self, s, **kwargs):
         return simplejson.loads(s, **kwargs)
 
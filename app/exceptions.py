@@ -68,6 +68,61 @@ class DataFetchError(APIError):
         )
 
 
+class UnsupportedFormatError(APIError):
+    """输出格式不支持异常"""
+
+    def __init__(self, message: str):
+        super().__init__(
+            message=message,
+            status_code=406,
+            error_code='UNSUPPORTED_FORMAT'
+        )
+
+
+class UpstreamBusyError(APIError):
+    """上游调用排队超时异常"""
+
+    def __init__(self, group: str):
+        super().__init__(
+            message=f"Upstream '{group}' is busy, please retry later",
+            status_code=503,
+            error_code='UPSTREAM_BUSY'
+        )
+
+
+class JobNotFoundError(APIError):
+    """异步任务不存在异常"""
+
+    def __init__(self, job_id: str):
+        super().__init__(
+            message=f"Job '{job_id}' not found or expired",
+            status_code=404,
+            error_code='JOB_NOT_FOUND'
+        )
+
+
+class JobQueueFullError(APIError):
+    """异步任务队列已满异常"""
+
+    def __init__(self):
+        super().__init__(
+            message="Job queue is full, please retry later",
+            status_code=503,
+            error_code='JOB_QUEUE_FULL'
+        )
+
+
+class SubscriptionLimitError(APIError):
+    """订阅连接数已满异常"""
+
+    def __init__(self):
+        super().__init__(
+            message="Too many subscriptions, please retry later",
+            status_code=503,
+            error_code='TOO_MANY_SUBSCRIPTIONS'
+        )
+
+
 def register_error_handlers(app):
     """
     注册全局异常处理器
@@ -1,8 +1,13 @@
 """
 健康检查端点
 """
-import akshare as ak
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
+
+from app.cache import get_cache, get_response_cache
+from app.history import get_history_store
+from app.snapshot import get_snapshot_store
+from app.subscriptions import get_subscription_hub
+from app.upstream import ak, akshare_version, get_limiter
 
 health = Blueprint('health', __name__)
 
@@ -26,18 +31,14 @@ def health_detail():
     """
     详细健康检查端点
 
-    检查 akshare 库是否可用
+    检查 akshare 库是否可用，并返回缓存、请求合并、历史行情增量获取、上游限流与预热统计
 
     Returns:
         JSON 格式的详细健康状态
     """
-    akshare_status = 'healthy'
-    akshare_version = None
-
-    try:
-        akshare_version = ak.__version__
-    except Exception:
-        akshare_status = 'unhealthy'
+    # 读取安装版本而不导入 akshare，延迟加载模式下不会触发导入
+    version = akshare_version()
+    akshare_status = 'healthy' if version else 'unhealthy'
 
     return jsonify({
         'status': 'healthy' if akshare_status == 'healthy' else 'degraded',
@@ -45,7 +46,16 @@ def health_detail():
         'dependencies': {
             'akshare': {
                 'status': akshare_status,
-                'version': akshare_version,
+                'version': version,
+                'loaded': ak.is_loaded,
+                'load_seconds': ak.load_seconds,
             }
-        }
+        },
+        'cache': get_cache().stats(),
+        'responses': get_response_cache().stats(),
+        'history': get_history_store().stats(),
+        'snapshot': get_snapshot_store().stats(),
+        'upstream': get_limiter().stats(),
+        'prewarm': current_app.extensions['akgate_prewarmer'].stats(),
+        'subscriptions': get_subscription_hub().stats(),
     })
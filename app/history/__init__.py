@@ -0,0 +1,15 @@
+"""
+历史行情增量获取模块
+"""
+from .lake import DataLake
+from .ranges import DateRanges
+from .store import HistorySpec, HistoryStore, get_history_store, init_history
+
+__all__ = [
+    'DataLake',
+    'DateRanges',
+    'HistorySpec',
+    'HistoryStore',
+    'get_history_store',
+    'init_history',
+]
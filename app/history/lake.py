@@ -0,0 +1,257 @@
+"""
+历史行情本地列式存储模块
+
+将已定稿的历史 K 线按 函数/symbol/序列/年份 分区写入本地 Feather（Arrow IPC）文件，
+读取时整体载入为 DataFrame，重启后无需重新从上游拉取；总大小超出预算时按最近访问时间淘汰整条序列
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+from app.logging_config import get_logger
+from .ranges import DateRanges
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+logger = get_logger('history')
+
+META_FILE = 'meta.json'
+
+
+class DataLake:
+    """按年份分区的历史行情 Feather 存储"""
+
+    def __init__(self, root: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            root: 存储根目录
+            max_bytes: 总字节数预算，超出时按最近访问时间淘汰序列
+        """
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.reads = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._total_bytes = self._scan_size()
+
+    @classmethod
+    def from_config(cls, config) -> 'DataLake | None':
+        """
+        根据应用配置创建存储，未启用或缺少 pyarrow 时返回 None
+        """
+        if not config.get('HISTORY_LAKE_ENABLED', False):
+            return None
+        if pa is None:
+            logger.warning("HISTORY_LAKE_ENABLED requires pyarrow, data lake disabled")
+            return None
+        return cls(
+            root=config.get('HISTORY_LAKE_PATH', '/tmp/akgate/lake'),
+            max_bytes=config.get('HISTORY_LAKE_MAX_BYTES', 1024 * 1024 * 1024),
+        )
+
+    def load(self, func_name: str, key: str, params: dict):
+        """
+        读取一条序列
+
+        Args:
+            func_name: 函数名称
+            key: 序列键
+            params: 序列参数（用于定位 symbol 目录）
+
+        Returns:
+            (DataFrame 或 None, DateRanges) 元组，不存在时返回 (None, 空 DateRanges)
+        """
+        path = self._series_path(func_name, key, params)
+        meta = self._read_meta(path)
+        if meta is None or meta.get('key') != key:
+            return None, DateRanges()
+
+        try:
+            tables = [
+                feather.read_table(os.path.join(path, f"{year}.feather"))
+                for year in meta['years']
+            ]
+            frame = pa.concat_tables(tables).to_pandas() if tables else None
+        except (OSError, pa.ArrowException) as e:
+            self._count('errors')
+            logger.warning(f"Data lake read failed, discarding series: {key} - {e}")
+            self._remove(path)
+            return None, DateRanges()
+
+        # 更新访问时间，供淘汰时排序
+        os.utime(os.path.join(path, META_FILE))
+        self._count('reads')
+        coverage = DateRanges(
+            (date.fromisoformat(start), date.fromisoformat(end))
+            for start, end in meta['coverage']
+        )
+        return frame, coverage
+
+    def save(self, func_name: str, key: str, params: dict, frame: pd.DataFrame | None,
+             dates, coverage: DateRanges, years: set) -> None:
+        """
+        写入一条序列中发生变化的年份分区与覆盖范围
+
+        Args:
+            func_name: 函数名称
+            key: 序列键
+            params: 序列参数
+            frame: 序列的全部 K 线（已按日期排序）
+            dates: 与 frame 行对应的日期（datetime64 数组）
+            coverage: 已覆盖的日期区间
+            years: 需要重写的年份
+        """
+        path = self._series_path(func_name, key, params)
+        os.makedirs(path, exist_ok=True)
+        delta = 0
+        try:
+            row_years = pd.DatetimeIndex(dates).year if frame is not None else None
+            all_years = set() if frame is None else set(row_years.unique().tolist())
+            for year in sorted(all_years):
+                file = os.path.join(path, f"{year}.feather")
+                # 分区文件可能已被其他进程淘汰，缺失时一并补写
+                if year not in years and os.path.exists(file):
+                    continue
+                delta -= _file_size(file)
+                part = frame[row_years == year].reset_index(drop=True)
+                _atomic_write(file, lambda tmp: feather.write_feather(
+                    part, tmp, compression='uncompressed'
+                ))
+                delta += _file_size(file)
+
+            meta_file = os.path.join(path, META_FILE)
+            delta -= _file_size(meta_file)
+            meta = {
+                'key': key,
+                'years': sorted(all_years),
+                'coverage': [[start.isoformat(), end.isoformat()] for start, end in coverage],
+            }
+            _atomic_write(meta_file, lambda tmp: _write_json(tmp, meta))
+            delta += _file_size(meta_file)
+        except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+            self._count('errors')
+            logger.warning(f"Data lake write failed, discarding series: {key} - {e}")
+            self._remove(path)
+            return
+
+        self._count('writes')
+        with self._lock:
+            self._total_bytes += delta
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict(keep=path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'path': self.root,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'reads': self.reads,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'errors': self.errors,
+            }
+
+    def _series_path(self, func_name: str, key: str, params: dict) -> str:
+        symbol = str(params.get('symbol', '_'))
+        if not symbol.replace('_', '').replace('.', '').isalnum():
+            symbol = '_'
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, func_name, symbol, digest)
+
+    def _series_dirs(self) -> list:
+        return [dirpath for dirpath, _, files in os.walk(self.root) if META_FILE in files]
+
+    def _scan_size(self) -> int:
+        return sum(
+            _file_size(os.path.join(dirpath, name))
+            for dirpath, _, files in os.walk(self.root)
+            for name in files
+        )
+
+    def _evict(self, keep: str) -> None:
+        # 其他进程也会写入同一目录，淘汰前重新统计实际大小
+        with self._lock:
+            total = self._scan_size()
+            series = sorted(
+                (os.path.getmtime(os.path.join(path, META_FILE)), path)
+                for path in self._series_dirs() if path != keep
+            )
+            for _, path in series:
+                if total <= self.max_bytes:
+                    break
+                size = sum(_file_size(os.path.join(path, name)) for name in os.listdir(path))
+                self._delete_series(path)
+                total -= size
+                self.evictions += 1
+                logger.debug(f"Data lake evicted: {path}")
+            self._total_bytes = total
+
+    def _read_meta(self, path: str) -> dict | None:
+        try:
+            with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self._count('errors')
+            logger.warning(f"Data lake metadata unreadable: {path} - {e}")
+            return None
+
+    def _remove(self, path: str) -> None:
+        self._delete_series(path)
+        with self._lock:
+            self._total_bytes = self._scan_size()
+
+    def _delete_series(self, path: str) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+        # 清理空的 symbol 与函数目录
+        parent = os.path.dirname(path)
+        while parent != self.root and parent.startswith(self.root):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _atomic_write(path: str, write) -> None:
+    """写入临时文件后原子替换，避免其他进程读到半写入的文件"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write_json(path: str, data: dict) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
@@ -0,0 +1,83 @@
+"""
+日期区间集合模块
+
+记录一条时间序列已覆盖的日期区间，并计算请求区间中尚未覆盖的缺口
+"""
+from datetime import date, timedelta
+
+ONE_DAY = timedelta(days=1)
+
+
+class DateRanges:
+    """按起始日期排序、互不相交的闭区间集合"""
+
+    __slots__ = ('_ranges',)
+
+    def __init__(self, ranges=None):
+        """
+        Args:
+            ranges: 初始区间列表，元素为 (start, end) 日期元组
+        """
+        self._ranges = []
+        for start, end in ranges or ():
+            self.add(start, end)
+
+    def add(self, start: date, end: date) -> None:
+        """
+        加入区间 [start, end]，与已有区间重叠或相邻时合并
+
+        Args:
+            start: 起始日期（含）
+            end: 截止日期（含）
+        """
+        if start > end:
+            return
+        merged = []
+        for low, high in self._ranges:
+            if high + ONE_DAY < start or end + ONE_DAY < low:
+                merged.append((low, high))
+            else:
+                start, end = min(start, low), max(end, high)
+        merged.append((start, end))
+        merged.sort()
+        self._ranges = merged
+
+    def missing(self, start: date, end: date) -> list:
+        """
+        计算 [start, end] 中未覆盖的缺口
+
+        Args:
+            start: 起始日期（含）
+            end: 截止日期（含）
+
+        Returns:
+            缺口区间列表，按日期升序
+        """
+        gaps = []
+        cursor = start
+        for low, high in self._ranges:
+            if high < cursor:
+                continue
+            if low > end:
+                break
+            if low > cursor:
+                gaps.append((cursor, low - ONE_DAY))
+            cursor = high + ONE_DAY
+            if cursor > end:
+                return gaps
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def covers(self, start: date, end: date) -> bool:
+        """[start, end] 是否已全部覆盖"""
+        return not self.missing(start, end)
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __repr__(self):
+        return f"DateRanges({self._ranges!r})"
@@ -0,0 +1,352 @@
+"""
+历史行情区间存储模块
+
+为已知的历史行情函数按 (函数, symbol, period, adjust 等参数) 保存已获取的 K 线，
+请求日期区间时只从 akshare 拉取尚未覆盖的缺口，合并去重后按请求区间切片返回
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import pandas as pd
+from flask import current_app
+
+from app.cache.keys import make_cache_key
+from app.cache.policy import parse_date
+from app.logging_config import get_logger
+from .lake import DataLake
+from .ranges import ONE_DAY, DateRanges
+
+logger = get_logger('history')
+
+
+class HistorySpec:
+    """一个历史行情函数的区间描述"""
+
+    def __init__(self, function: str, date_column: str, start_param: str = 'start_date',
+                 end_param: str = 'end_date', date_format: str = '%Y%m%d',
+                 min_date: str = '19700101', upstream_range: bool = True,
+                 require: dict = None):
+        """
+        Args:
+            function: 函数名称
+            date_column: 结果中的日期列
+            start_param: 起始日期参数名
+            end_param: 截止日期参数名
+            date_format: 传给 akshare 的日期格式
+            min_date: 未指定起始日期时的最早日期
+            upstream_range: akshare 函数是否支持按日期区间查询；
+                为 False 时每次拉取完整序列，由网关按日期参数切片
+            require: 参数名到允许取值列表的映射，取值不在列表中时不做增量获取
+                （如前复权数据会随除权整体变化，周线、月线的边界 K 线会随区间变化）
+        """
+        self.function = function
+        self.date_column = date_column
+        self.start_param = start_param
+        self.end_param = end_param
+        self.date_format = date_format
+        self.min_date = parse_date(min_date)
+        self.upstream_range = upstream_range
+        self.require = {name: {str(v) for v in values} for name, values in (require or {}).items()}
+
+    @classmethod
+    def from_dict(cls, function: str, data: dict) -> 'HistorySpec':
+        """根据配置字典创建描述"""
+        return cls(function, **data)
+
+    @property
+    def gateway_params(self) -> tuple:
+        """由网关处理、不传给上游的日期参数（仅上游不支持日期区间时）"""
+        return () if self.upstream_range else (self.start_param, self.end_param)
+
+    def accepts(self, params: dict) -> bool:
+        """参数是否满足增量获取条件"""
+        return all(
+            name not in params or str(params[name]) in allowed
+            for name, allowed in self.require.items()
+        )
+
+
+class _Series:
+    """一条已缓存的时间序列"""
+
+    __slots__ = ('frame', 'dates', 'coverage', 'lock', 'restored')
+
+    def __init__(self):
+        self.frame = None
+        self.dates = None
+        self.coverage = DateRanges()
+        self.lock = threading.Lock()
+        self.restored = False
+
+    @property
+    def rows(self) -> int:
+        return 0 if self.frame is None else len(self.frame)
+
+
+class _UnsupportedResult(Exception):
+    """上游结果不是带日期列的表格，无法做增量合并"""
+
+
+class HistoryStore:
+    """历史行情增量区间存储"""
+
+    def __init__(self, specs: dict, max_series: int = 256, enabled: bool = True,
+                 lake: DataLake = None):
+        """
+        Args:
+            specs: 函数名到 HistorySpec 的映射
+            max_series: 最多保留在内存中的序列数，超出时按 LRU 淘汰
+            enabled: 是否启用
+            lake: 本地列式存储，用于持久化已定稿的 K 线，None 表示不持久化
+        """
+        self.specs = specs
+        self.max_series = max_series
+        self.enabled = enabled
+        self.lake = lake
+        self.requests = 0
+        self.covered = 0
+        self.fetches = 0
+        self.fallbacks = 0
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'HistoryStore':
+        """根据应用配置创建存储"""
+        return cls(
+            specs={
+                name: HistorySpec.from_dict(name, data)
+                for name, data in config.get('HISTORY_FUNCTIONS', {}).items()
+            },
+            max_series=config.get('HISTORY_MAX_SERIES', 256),
+            enabled=config.get('HISTORY_ENABLED', True),
+            lake=DataLake.from_config(config),
+        )
+
+    def load(self, func_name: str, params: dict, fetch):
+        """
+        获取一次历史行情调用的结果
+
+        今天之前的 K 线视为已定稿，按区间记录覆盖范围并只拉取缺口；
+        包含今天及以后的部分每次都从上游获取，不写入存储。
+        不满足增量条件的调用直接透传给 fetch。
+
+        Args:
+            func_name: 函数名称
+            params: 调用参数
+            fetch: 接收参数字典并返回上游结果的可调用对象
+
+        Returns:
+            函数结果
+        """
+        plan = self._plan(func_name, params)
+        if plan is None:
+            return fetch(self._upstream_params(func_name, params))
+
+        spec, key, start, end = plan
+        series = self._get_series(key)
+        self._count('requests')
+        try:
+            return self._load(spec, key, series, params, start, end, fetch)
+        except _UnsupportedResult:
+            self._count('fallbacks')
+            logger.warning(f"History result not mergeable, passing through: {key}")
+            return fetch(self._upstream_params(func_name, params))
+
+    def gateway_params(self, func_name: str) -> tuple:
+        """
+        获取函数由网关处理的日期参数
+
+        上游不支持日期区间的函数（upstream_range 为 False）仍可按 start_date/end_date 请求，
+        参数规范化时接受这些参数，调用上游前去除
+
+        Args:
+            func_name: 函数名称
+
+        Returns:
+            参数名元组，未启用或不是此类函数时为空
+        """
+        spec = self.specs.get(func_name) if self.enabled else None
+        return spec.gateway_params if spec is not None else ()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                'enabled': self.enabled,
+                'series': len(self._series),
+                'rows': sum(series.rows for series in self._series.values()),
+                'requests': self.requests,
+                'covered': self.covered,
+                'fetches': self.fetches,
+                'fallbacks': self.fallbacks,
+            }
+        stats['lake'] = self.lake.stats() if self.lake is not None else None
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _upstream_params(self, func_name: str, params: dict) -> dict:
+        names = self.gateway_params(func_name)
+        if not names:
+            return params
+        return {k: v for k, v in params.items() if k not in names}
+
+    def _plan(self, func_name: str, params: dict):
+        spec = self.specs.get(func_name) if self.enabled else None
+        if spec is None or not spec.accepts(params):
+            return None
+
+        # 日期参数无法解析时透传给 akshare，由上游报告参数错误
+        start = parse_date(params.get(spec.start_param, spec.min_date))
+        end = parse_date(params.get(spec.end_param, date.today()))
+        if start is None or end is None:
+            return None
+        end = min(end, date.today())
+        if start > end:
+            return None
+
+        base = {k: v for k, v in params.items() if k not in (spec.start_param, spec.end_param)}
+        return spec, make_cache_key(func_name, base), start, end
+
+    def _load(self, spec: HistorySpec, key: str, series: _Series, params: dict,
+              start: date, end: date, fetch):
+        today = date.today()
+        settled_end = min(end, today - ONE_DAY)
+        fetched = None
+
+        with series.lock:
+            frames = []
+            if start <= settled_end:
+                self._restore(spec, key, series, params)
+                gaps = series.coverage.missing(start, settled_end)
+                if not gaps:
+                    self._count('covered')
+                years = set()
+                try:
+                    if spec.upstream_range:
+                        for gap_start, gap_end in gaps:
+                            frame = self._fetch(spec, params, fetch, gap_start, gap_end)
+                            years |= self._merge(spec, series, frame, gap_start, gap_end)
+                    elif gaps:
+                        fetched = self._fetch(spec, params, fetch)
+                        years |= self._merge(spec, series, fetched, spec.min_date, today - ONE_DAY)
+                finally:
+                    # 部分缺口获取失败时，已获取的区间仍然写入
+                    if gaps:
+                        self._persist(spec, key, series, params, years)
+                frames.append(self._slice(series, start, settled_end))
+
+        if end >= today:
+            if fetched is None:
+                fetched = self._fetch(spec, params, fetch, max(start, today), end)
+            frames.append(_slice_frame(spec, fetched, max(start, today), end))
+
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _fetch(self, spec: HistorySpec, params: dict, fetch, start: date = None,
+               end: date = None) -> pd.DataFrame:
+        call_params = {k: v for k, v in params.items() if k not in (spec.start_param, spec.end_param)}
+        if spec.upstream_range:
+            call_params[spec.start_param] = start.strftime(spec.date_format)
+            call_params[spec.end_param] = end.strftime(spec.date_format)
+
+        self._count('fetches')
+        result = fetch(call_params)
+        if not isinstance(result, pd.DataFrame):
+            raise _UnsupportedResult()
+        if not result.empty and spec.date_column not in result.columns:
+            raise _UnsupportedResult()
+        return result
+
+    def _merge(self, spec: HistorySpec, series: _Series, frame: pd.DataFrame,
+               start: date, end: date) -> set:
+        """合并新获取的 K 线，返回新增行所在的年份"""
+        frame = _slice_frame(spec, frame, start, end)
+        years = set()
+        if frame is not None:
+            years = set(pd.to_datetime(frame[spec.date_column]).dt.year.unique().tolist())
+            if series.frame is not None:
+                frame = pd.concat([series.frame, frame], ignore_index=True)
+            dates = pd.to_datetime(frame[spec.date_column])
+            keep = ~dates.duplicated(keep='last')
+            order = dates[keep].argsort(kind='stable').to_numpy()
+            series.frame = frame[keep.to_numpy()].iloc[order].reset_index(drop=True)
+            series.dates = dates[keep].iloc[order].to_numpy()
+        series.coverage.add(start, end)
+        return years
+
+    def _restore(self, spec: HistorySpec, key: str, series: _Series, params: dict) -> None:
+        if series.restored:
+            return
+        series.restored = True
+        if self.lake is None:
+            return
+        frame, coverage = self.lake.load(spec.function, key, params)
+        if frame is not None:
+            series.frame = frame
+            series.dates = pd.to_datetime(frame[spec.date_column]).to_numpy()
+        series.coverage = coverage
+
+    def _persist(self, spec: HistorySpec, key: str, series: _Series, params: dict,
+                 years: set) -> None:
+        if self.lake is not None:
+            self.lake.save(spec.function, key, params, series.frame, series.dates,
+                           series.coverage, years)
+
+    @staticmethod
+    def _slice(series: _Series, start: date, end: date) -> pd.DataFrame | None:
+        if series.frame is None:
+            return None
+        low = series.dates.searchsorted(pd.Timestamp(start).to_datetime64(), side='left')
+        high = series.dates.searchsorted(pd.Timestamp(end).to_datetime64(), side='right')
+        return series.frame.iloc[low:high].reset_index(drop=True)
+
+    def _get_series(self, key: str) -> _Series:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end(key)
+            return series
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def _slice_frame(spec: HistorySpec, frame: pd.DataFrame, start: date,
+                 end: date) -> pd.DataFrame | None:
+    """按日期列截取 [start, end] 的行，空结果返回 None"""
+    if frame.empty:
+        return None
+    dates = pd.to_datetime(frame[spec.date_column])
+    mask = (dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))
+    if not mask.any():
+        return None
+    return frame[mask.to_numpy()].reset_index(drop=True)
+
+
+def init_history(app):
+    """
+    初始化应用的历史行情区间存储
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_history'] = HistoryStore.from_config(app.config)
+
+
+def get_history_store() -> HistoryStore:
+    """获取当前应用的历史行情区间存储"""
+    return current_app.extensions['akgate_history']
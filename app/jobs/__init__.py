@@ -0,0 +1,8 @@
+"""
+异步任务模块
+"""
+from .manager import JobManager, get_job_manager, init_jobs
+from .store import SQLiteJobStore, create_job_store
+from .views import jobs
+
+__all__ = ['JobManager', 'SQLiteJobStore', 'create_job_store', 'get_job_manager', 'init_jobs', 'jobs']
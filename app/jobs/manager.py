@@ -0,0 +1,207 @@
+"""
+异步任务管理模块
+
+在后台线程池中执行耗时的 akshare 调用，并按保留期限和数量上限保存任务结果。
+配置共享的任务状态存储（JOB_BACKEND=sqlite）时，任务状态与结果同时写入该存储，
+任意工作进程都能查询其他工作进程提交的任务
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.exceptions import APIError, JobNotFoundError, JobQueueFullError
+from app.logging_config import get_logger
+from .store import SQLiteJobStore, create_job_store
+
+logger = get_logger('jobs')
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class Job:
+    """异步任务"""
+
+    def __init__(self, func_name: str, params: dict, options: dict):
+        self.id = uuid.uuid4().hex
+        self.func_name = func_name
+        self.params = params
+        self.options = options
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'function': self.func_name,
+            'params': self.params,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """有界的异步任务执行器"""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 100,
+                 result_ttl: int = 3600, max_retained: int = 100, store: SQLiteJobStore = None):
+        """
+        Args:
+            max_workers: 并发执行的任务数
+            max_queue: 排队与执行中任务数上限，超出时拒绝新任务
+            result_ttl: 任务完成后结果保留时间（秒）
+            max_retained: 最多保留的已完成任务数，超出时淘汰最早完成的任务
+            store: 跨进程共享的任务状态存储，为 None 时任务只能在提交它的进程中查询
+        """
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.max_retained = max_retained
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='akgate-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, store: SQLiteJobStore = None) -> 'JobManager':
+        """根据应用配置创建任务管理器"""
+        return cls(
+            max_workers=config.get('JOB_MAX_WORKERS', 2),
+            max_queue=config.get('JOB_MAX_QUEUE', 100),
+            result_ttl=config.get('JOB_RESULT_TTL', 3600),
+            max_retained=config.get('JOB_MAX_RETAINED', 100),
+            store=store,
+        )
+
+    def submit(self, runner, func_name: str, params: dict, options: dict = None) -> Job:
+        """
+        提交任务
+
+        Args:
+            runner: 执行调用的函数，签名为 ``runner(job) -> result``
+            func_name: 函数名称
+            params: 调用参数
+            options: 网关保留参数
+
+        Returns:
+            新建的任务
+
+        Raises:
+            JobQueueFullError: 排队任务数已达上限
+        """
+        job = Job(func_name, params, options or {})
+        app = current_app._get_current_object()
+        with self._lock:
+            self._purge()
+            if self._active_count() >= self.max_queue:
+                raise JobQueueFullError()
+            self._jobs[job.id] = job
+
+        self._publish(job)
+        self._executor.submit(self._run, app, runner, job)
+        logger.info(f"Job submitted: {job.id} - {func_name} - params: {params}")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        获取任务
+
+        本进程中没有该任务时，从共享存储读取其他工作进程写入的状态
+
+        Raises:
+            JobNotFoundError: 任务不存在或结果已过期
+        """
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.load(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {PENDING: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        store = self.store.stats() if self.store is not None else None
+        return {'max_queue': self.max_queue, **counts, 'store': store}
+
+    def _run(self, app, runner, job: Job) -> None:
+        job.started_at = time.time()
+        job.status = RUNNING
+        self._publish(job)
+        status = FAILED
+        with app.app_context():
+            try:
+                job.result = runner(job)
+                status = SUCCEEDED
+            except APIError as e:
+                job.error = e.to_dict()
+            except Exception as e:
+                logger.error(f"Job error: {job.id} - {e}", exc_info=True)
+                job.error = {'error': True, 'error_code': 'INTERNAL_ERROR', 'message': 'Internal server error'}
+        # 先记录完成时间再更新状态，保证已完成任务总有完成时间
+        job.finished_at = time.time()
+        job.status = status
+        self._publish(job)
+        logger.info(f"Job finished: {job.id} - {job.status}")
+
+    def _publish(self, job: Job) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save(job)
+        except Exception as e:
+            logger.warning(f"Job state not shared: {job.id} - {e}")
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _purge(self) -> None:
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        expired = [job for job in finished if now - job.finished_at >= self.result_ttl]
+        overflow = len(finished) - len(expired) - self.max_retained
+        if overflow > 0:
+            remaining = sorted(
+                (job for job in finished if job not in expired),
+                key=lambda job: job.finished_at,
+            )
+            expired.extend(remaining[:overflow])
+        for job in expired:
+            del self._jobs[job.id]
+
+
+def init_jobs(app):
+    """
+    初始化应用的异步任务管理器
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_jobs'] = JobManager.from_config(
+        app.config, store=create_job_store(app.config),
+    )
+
+
+def get_job_manager() -> JobManager:
+    """获取当前应用的异步任务管理器"""
+    return current_app.extensions['akgate_jobs']
@@ -0,0 +1,192 @@
+"""
+任务状态存储模块
+
+多进程部署时任务在提交它的工作进程中执行，查询请求可能到达其他工作进程。
+任务状态与结果写入本地 SQLite 文件中的独立表，按任务自身的保留期限、数量与字节预算清理，
+不与结果缓存共用容量与 LRU 淘汰
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# 表结构版本，结构变化时重建任务表（任务状态可以丢弃）
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+DROP TABLE IF EXISTS jobs;
+CREATE TABLE jobs (
+    id TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    finished_at REAL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX idx_jobs_finished ON jobs (finished_at);
+CREATE INDEX idx_jobs_expires ON jobs (expires_at);
+"""
+
+
+class SQLiteJobStore:
+    """
+    跨进程共享的任务状态存储
+
+    任务以 pickle 形式存储。已完成任务在 result_ttl 秒后过期，
+    超出 max_retained 个或 max_bytes 字节时淘汰最早完成的任务；未完成任务不参与淘汰，
+    其所在进程异常退出时在最后一次更新 result_ttl 秒后过期
+    """
+
+    def __init__(self, path: str, result_ttl: int = 3600, max_retained: int = 100,
+                 max_bytes: int = 1024 * 1024 * 1024, timeout: float = 30.0):
+        """
+        Args:
+            path: 数据库文件路径
+            result_ttl: 任务状态保留时间（秒）
+            max_retained: 最多保留的已完成任务数
+            max_bytes: 已完成任务的总字节预算，刚完成的任务不会因超出预算而被淘汰
+            timeout: 等待数据库锁的超时时间（秒）
+        """
+        self.path = path
+        self.result_ttl = result_ttl
+        self.max_retained = max_retained
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.evictions = 0
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._migrate()
+
+    @classmethod
+    def from_config(cls, config) -> 'SQLiteJobStore':
+        """根据应用配置创建存储"""
+        return cls(
+            path=config.get('JOB_SQLITE_PATH', '/tmp/akgate/jobs.sqlite3'),
+            result_ttl=config.get('JOB_RESULT_TTL', 3600),
+            max_retained=config.get('JOB_MAX_RETAINED', 100),
+            max_bytes=config.get('JOB_STORE_MAX_BYTES', 1024 * 1024 * 1024),
+        )
+
+    def save(self, job) -> None:
+        """
+        写入任务的当前状态
+
+        Args:
+            job: 任务（Job）
+        """
+        data = pickle.dumps(job, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        expires_at = (job.finished_at if job.finished else now) + self.result_ttl
+        finished_at = job.finished_at if job.finished else None
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs (id, state, finished_at, expires_at, size) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (job.id, sqlite3.Binary(data), finished_at, expires_at, len(data)),
+            )
+            if job.finished:
+                conn.execute('DELETE FROM jobs WHERE expires_at <= ?', (now,))
+                self._evict(conn, job.id)
+
+    def load(self, job_id: str):
+        """
+        读取任务
+
+        Args:
+            job_id: 任务 ID
+
+        Returns:
+            任务（Job），不存在或已过期时返回 None
+        """
+        row = self._connection().execute(
+            'SELECT state, expires_at FROM jobs WHERE id = ?', (job_id,),
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return pickle.loads(row[0])
+
+    def stats(self) -> dict:
+        jobs, total_bytes = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM jobs'
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'jobs': jobs,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+        }
+
+    def _evict(self, conn, keep: str) -> None:
+        # 按完成时间从新到旧累计，超出数量或字节预算的较早任务被删除
+        rows = conn.execute(
+            'SELECT id, size FROM jobs WHERE finished_at IS NOT NULL ORDER BY finished_at DESC'
+        ).fetchall()
+        retained = 0
+        total_bytes = 0
+        victims = []
+        for job_id, size in rows:
+            if job_id != keep and (retained >= self.max_retained
+                                   or total_bytes + size > self.max_bytes):
+                victims.append((job_id,))
+                continue
+            retained += 1
+            total_bytes += size
+        if victims:
+            conn.executemany('DELETE FROM jobs WHERE id = ?', victims)
+            self.evictions += len(victims)
+
+    def _migrate(self) -> None:
+        # 多个工作进程可能同时启动，在写事务中检查并重建表结构
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                for statement in _SCHEMA.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork 后的子进程不能复用父进程的连接
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.conn = self._connect()
+            self._local.pid = pid
+        return self._local.conn
+
+
+def create_job_store(config) -> SQLiteJobStore | None:
+    """
+    根据配置创建任务状态存储
+
+    Args:
+        config: 应用配置
+
+    Returns:
+        共享存储，JOB_BACKEND 为 memory 时返回 None（任务只保存在提交它的进程中）
+
+    Raises:
+        ValueError: 未知的存储类型
+    """
+    backend = config.get('JOB_BACKEND', 'memory')
+    if backend == 'memory':
+        return None
+    if backend == 'sqlite':
+        return SQLiteJobStore.from_config(config)
+    raise ValueError(f"Unknown job backend: {backend}")
@@ -0,0 +1,29 @@
+"""
+异步任务端点
+"""
+from flask import Blueprint, Response, current_app
+
+from .manager import SUCCEEDED, get_job_manager
+
+jobs = Blueprint('jobs', __name__)
+
+
+@jobs.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """
+    查询异步任务状态
+
+    Args:
+        job_id: 任务 ID
+
+    Returns:
+        JSON 格式的任务状态，任务成功时包含 result 字段
+    """
+    from app.api.views import dumps_result
+
+    job = get_job_manager().get(job_id)
+    body = current_app.json.dumps(job.to_dict())
+    if job.status == SUCCEEDED:
+        # 直接拼接已编码的结果，避免大结果二次编码
+        body = f'{body[:-1]}, "result": {dumps_result(job.result)}}}'
+    return Response(body, mimetype='application/json')
@@ -0,0 +1,22 @@
+"""
+监控指标模块
+"""
+from .collectors import (
+    IN_FLIGHT,
+    UPSTREAM_SECONDS,
+    instrument_call,
+    set_function_label,
+)
+from .timing import format_server_timing, get_phases, phase
+from .views import metrics
+
+__all__ = [
+    'IN_FLIGHT',
+    'UPSTREAM_SECONDS',
+    'format_server_timing',
+    'get_phases',
+    'instrument_call',
+    'metrics',
+    'phase',
+    'set_function_label',
+]
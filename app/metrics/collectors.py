@@ -0,0 +1,134 @@
+"""
+Prometheus 指标定义模块
+
+gunicorn 多进程部署时，设置 PROMETHEUS_MULTIPROC_DIR 后各工作进程写入共享目录，
+由 /metrics 汇总
+"""
+import time
+from functools import wraps
+
+from flask import current_app, g
+from prometheus_client import Counter, Gauge, Histogram
+from werkzeug.exceptions import HTTPException
+
+from app.exceptions import APIError
+from .timing import format_server_timing, get_phases
+
+# 函数名校验或解析失败时使用的标签，避免任意请求路径造成标签基数膨胀
+UNKNOWN_FUNCTION = '_unknown'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+ENCODE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+REQUESTS = Counter(
+    'akgate_requests_total', 'akshare 函数调用请求数',
+    ['function', 'status'],
+)
+ERRORS = Counter(
+    'akgate_errors_total', 'akshare 函数调用错误数',
+    ['function', 'error_code'],
+)
+REQUEST_SECONDS = Histogram(
+    'akgate_request_seconds', '请求处理耗时（不含流式输出）',
+    ['function'], buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_SECONDS = Histogram(
+    'akgate_upstream_seconds', 'akshare 上游调用耗时（含限流排队）',
+    ['function'], buckets=LATENCY_BUCKETS,
+)
+CONVERT_SECONDS = Histogram(
+    'akgate_convert_seconds', '结果转换耗时（convert_result / 列式转换）',
+    ['function'], buckets=ENCODE_BUCKETS,
+)
+ENCODE_SECONDS = Histogram(
+    'akgate_encode_seconds', '响应编码耗时',
+    ['function', 'format'], buckets=ENCODE_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    'akgate_response_bytes', '响应体字节数',
+    ['function', 'format'], buckets=BYTES_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    'akgate_in_flight_requests', '正在获取结果的请求数',
+    ['function'], multiprocess_mode='livesum',
+)
+
+
+def set_function_label(func_name: str) -> None:
+    """函数名解析成功后记录指标标签"""
+    g.akgate_function = func_name
+
+
+def instrument_call(view):
+    """
+    为函数调用视图记录请求数、错误数、耗时与响应大小，并添加 Server-Timing 响应头
+
+    视图需在函数名解析成功后调用 set_function_label，
+    并通过 g.akgate_format 记录输出格式
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = view(*args, **kwargs)
+        except APIError as e:
+            _count_error(e.error_code, e.status_code)
+            raise
+        except HTTPException as e:
+            _count_error('HTTP_ERROR', e.code)
+            raise
+        except Exception:
+            # 与全局异常处理器一致，未预期的异常按 500 INTERNAL_ERROR 统计
+            _count_error('INTERNAL_ERROR', 500)
+            raise
+
+        elapsed = time.perf_counter() - start
+        function = g.get('akgate_function', UNKNOWN_FUNCTION)
+        fmt = g.get('akgate_format', 'json')
+        REQUESTS.labels(function, str(response.status_code)).inc()
+        REQUEST_SECONDS.labels(function).observe(elapsed)
+
+        phases = get_phases()
+        if current_app.config.get('SERVER_TIMING_ENABLED', True):
+            # 流式响应的编码在视图返回后进行，不包含在响应头中
+            response.headers['Server-Timing'] = format_server_timing(phases, elapsed)
+        if 'convert' in phases:
+            CONVERT_SECONDS.labels(function).observe(phases['convert'])
+        if response.is_streamed:
+            # 流式响应在视图返回后才编码，迭代结束时记录
+            response.response = _measure_stream(response.response, function, fmt)
+        else:
+            ENCODE_SECONDS.labels(function, fmt).observe(phases.get('encode', 0.0))
+            RESPONSE_BYTES.labels(function, fmt).observe(response.calculate_content_length() or 0)
+        return response
+
+    return wrapper
+
+
+def _count_error(error_code: str, status_code: int) -> None:
+    function = g.get('akgate_function', UNKNOWN_FUNCTION)
+    ERRORS.labels(function, error_code).inc()
+    REQUESTS.labels(function, str(status_code)).inc()
+
+
+def _measure_stream(chunks, function: str, fmt: str):
+    size = 0
+    elapsed = 0.0
+    iterator = iter(chunks)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            size += len(chunk)
+            yield chunk
+    finally:
+        ENCODE_SECONDS.labels(function, fmt).observe(elapsed)
+        RESPONSE_BYTES.labels(function, fmt).observe(size)
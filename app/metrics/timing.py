@@ -0,0 +1,50 @@
+"""
+请求阶段计时模块
+
+在应用上下文中按阶段名累计耗时，供指标与响应头使用
+"""
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context
+
+
+@contextmanager
+def phase(name: str):
+    """
+    记录一个处理阶段的耗时，同名阶段多次执行时累加
+
+    不在应用上下文中时只执行代码块，不记录
+
+    Args:
+        name: 阶段名称
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_app_context():
+            phases = g.setdefault('akgate_phases', {})
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def get_phases() -> dict:
+    """获取当前上下文已记录的阶段耗时（秒）"""
+    return g.get('akgate_phases', {})
+
+
+def format_server_timing(phases: dict, total: float = None) -> str:
+    """
+    生成 Server-Timing 响应头
+
+    Args:
+        phases: 阶段名称到耗时（秒）的映射
+        total: 总耗时（秒），为 None 时不输出
+
+    Returns:
+        如 ``validate;dur=0.021, fetch;dur=812.402, total;dur=815.337``，单位为毫秒
+    """
+    items = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items()]
+    if total is not None:
+        items.append(f"total;dur={total * 1000:.3f}")
+    return ', '.join(items)
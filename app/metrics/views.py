@@ -0,0 +1,28 @@
+"""
+Prometheus 指标端点
+"""
+import os
+
+from flask import Blueprint, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+
+metrics = Blueprint('metrics', __name__)
+
+
+@metrics.route('/metrics', methods=['GET'])
+def export_metrics():
+    """
+    导出 Prometheus 文本格式指标
+
+    设置 PROMETHEUS_MULTIPROC_DIR 时汇总所有 gunicorn 工作进程的指标
+
+    Returns:
+        Prometheus 文本格式响应
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,7 @@
+"""
+缓存预热模块
+"""
+from .schedule import CronSchedule, IntervalSchedule
+from .scheduler import Prewarmer, PrewarmTask, init_prewarm
+
+__all__ = ['CronSchedule', 'IntervalSchedule', 'PrewarmTask', 'Prewarmer', 'init_prewarm']
@@ -0,0 +1,128 @@
+"""
+预热调度规则模块
+
+支持固定间隔与 5 段 cron 表达式（分 时 日 月 周）
+"""
+from datetime import datetime, timedelta
+
+# cron 各字段的取值范围
+_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6),
+)
+
+# 查找下一次触发时间时最多向后搜索的天数
+_MAX_SEARCH_DAYS = 366 * 4
+
+
+class IntervalSchedule:
+    """固定间隔调度"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __repr__(self):
+        return f"IntervalSchedule({self.seconds})"
+
+
+class CronSchedule:
+    """
+    cron 调度
+
+    表达式为 ``分 时 日 月 周``，每个字段支持 ``*``、``5``、``1-5``、``*/15``、``1-30/5``
+    及其逗号组合；周字段 0 和 7 都表示周日。与标准 cron 一致，
+    日和周字段都受限时满足其一即可触发
+    """
+
+    def __init__(self, expression: str):
+        """
+        Args:
+            expression: cron 表达式
+
+        Raises:
+            ValueError: 表达式不合法
+        """
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+
+        self.expression = expression
+        values = {}
+        for text, (name, low, high) in zip(parts, _FIELDS):
+            if name == 'weekday':
+                high = 7
+            values[name] = _parse_field(text, low, high)
+        values['weekday'] = {value % 7 for value in values['weekday']}
+
+        self.minutes = values['minute']
+        self.hours = values['hour']
+        self.days = values['day']
+        self.months = values['month']
+        self.weekdays = values['weekday']
+        self._day_restricted = parts[2] != '*'
+        self._weekday_restricted = parts[4] != '*'
+
+    def matches_day(self, moment: datetime) -> bool:
+        # cron 周日为 0，Python weekday() 周一为 0
+        weekday = (moment.weekday() + 1) % 7
+        if self._day_restricted and self._weekday_restricted:
+            return moment.day in self.days or weekday in self.weekdays
+        return moment.day in self.days and weekday in self.weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        计算严格晚于指定时刻的下一次触发时间
+
+        Args:
+            moment: 起始时刻（可带时区）
+
+        Returns:
+            下一次触发时间
+
+        Raises:
+            ValueError: 表达式永远不会触发（如 2 月 30 日）
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = candidate.replace(hour=0, minute=0)
+        for _ in range(_MAX_SEARCH_DAYS):
+            if day.month in self.months and self.matches_day(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        run = day.replace(hour=hour, minute=minute)
+                        if run >= candidate:
+                            return run
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+
+def _parse_field(text: str, low: int, high: int) -> set:
+    values = set()
+    for item in text.split(','):
+        base, _, step = item.partition('/')
+        step = int(step) if step else 1
+        if step <= 0:
+            raise ValueError(f"Invalid cron step: {item}")
+
+        if base == '*':
+            start, end = low, high
+        elif '-' in base:
+            start, end = (int(value) for value in base.split('-', 1))
+        else:
+            start = int(base)
+            end = high if step > 1 else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range: {item}")
+        values.update(range(start, end + 1, step))
+    return values
@@ -0,0 +1,183 @@
+"""
+缓存预热调度模块
+
+按配置的调度规则在后台线程中调用热门函数并写入结果缓存，
+使开盘等高峰时段的首批请求直接命中缓存。
+每次执行前随机延迟（jitter），并限制同时执行的预热调用数，避免预热本身触发上游限流
+"""
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.api.views import load_function, prepare_call
+from app.cache import get_cache
+from app.logging_config import get_logger
+from .schedule import CronSchedule, IntervalSchedule
+
+logger = get_logger('prewarm')
+
+
+class PrewarmTask:
+    """预热任务"""
+
+    def __init__(self, function: str, params: dict = None, cron: str = None,
+                 interval: float = None, ttl: int = None):
+        """
+        Args:
+            function: 函数名称
+            params: 调用参数
+            cron: cron 表达式，与 interval 二选一
+            interval: 执行间隔（秒）
+            ttl: 预热结果的缓存 TTL（秒），默认使用缓存策略
+
+        Raises:
+            ValueError: 未指定或同时指定了 cron 与 interval
+        """
+        if (cron is None) == (interval is None):
+            raise ValueError(f"Prewarm task '{function}' needs exactly one of cron or interval")
+        self.function = function
+        self.params = dict(params or {})
+        self.schedule = CronSchedule(cron) if cron else IntervalSchedule(interval)
+        self.ttl = ttl
+        self.next_run = None
+
+    def __repr__(self):
+        return f"PrewarmTask({self.function}, {self.params}, {self.schedule})"
+
+
+class Prewarmer:
+    """缓存预热调度器"""
+
+    def __init__(self, app, tasks: list, max_concurrency: int = 2, jitter: float = 0,
+                 timezone: str = 'Asia/Shanghai'):
+        """
+        Args:
+            app: Flask 应用实例
+            tasks: PrewarmTask 列表
+            max_concurrency: 同时执行的预热调用数
+            jitter: 每次执行前的最大随机延迟（秒）
+            timezone: cron 表达式使用的时区
+        """
+        self.app = app
+        self.tasks = tasks
+        self.jitter = jitter
+        self.timezone = ZoneInfo(timezone)
+        self.runs = 0
+        self.loads = 0
+        self.failures = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix='akgate-prewarm'
+        )
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app) -> 'Prewarmer':
+        """根据应用配置创建调度器"""
+        config = app.config
+        tasks = [PrewarmTask(**item) for item in config.get('PREWARM_SCHEDULE', [])]
+        return cls(
+            app,
+            tasks,
+            max_concurrency=config.get('PREWARM_MAX_CONCURRENCY', 2),
+            jitter=config.get('PREWARM_JITTER', 0),
+            timezone=config.get('PREWARM_TIMEZONE', 'Asia/Shanghai'),
+        )
+
+    def start(self) -> None:
+        """启动后台调度线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        now = self._now()
+        for task in self.tasks:
+            task.next_run = task.schedule.next_after(now)
+        self._thread = threading.Thread(target=self._loop, name='akgate-prewarm-scheduler', daemon=True)
+        self._thread.start()
+        logger.info(f"Prewarm scheduler started with {len(self.tasks)} tasks")
+
+    def stop(self) -> None:
+        """停止后台调度线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def run_task(self, task: PrewarmTask) -> bool:
+        """
+        执行一次预热任务
+
+        Args:
+            task: 预热任务
+
+        Returns:
+            是否实际调用了上游
+        """
+        with self.app.app_context():
+            try:
+                # 与 API 请求使用相同的参数规范化，确保缓存键一致
+                func, params, _ = prepare_call(task.function, task.params)
+                loaded = get_cache().warm(
+                    task.function,
+                    params,
+                    lambda: load_function(task.function, func, params),
+                    ttl=task.ttl,
+                )
+            except Exception as e:
+                self._count('failures')
+                logger.warning(f"Prewarm failed: {task.function} - {e}")
+                return False
+
+        self._count('runs')
+        if loaded:
+            self._count('loads')
+            logger.info(f"Prewarmed: {task.function} - params: {task.params}")
+        return loaded
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'tasks': len(self.tasks),
+                'runs': self.runs,
+                'loads': self.loads,
+                'failures': self.failures,
+            }
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = self._now()
+            for task in self.tasks:
+                if task.next_run <= now:
+                    task.next_run = task.schedule.next_after(now)
+                    self._executor.submit(self._run_with_jitter, task)
+
+            next_run = min((task.next_run for task in self.tasks), default=None)
+            if next_run is None:
+                return
+            # 最长等待 60 秒后重新计算，避免系统时间调整导致错过触发
+            self._stop.wait(min(max((next_run - self._now()).total_seconds(), 0), 60))
+
+    def _run_with_jitter(self, task: PrewarmTask) -> None:
+        if self.jitter and self._stop.wait(random.uniform(0, self.jitter)):
+            return
+        self.run_task(task)
+
+    def _now(self) -> datetime:
+        return datetime.now(self.timezone)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def init_prewarm(app):
+    """
+    初始化缓存预热调度器，由 start_background_tasks 启动
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_prewarmer'] = Prewarmer.from_config(app)
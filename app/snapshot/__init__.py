@@ -0,0 +1,12 @@
+"""
+快照版本与差异响应模块
+"""
+from .store import Delta, Snapshot, SnapshotStore, get_snapshot_store, init_snapshots
+
+__all__ = [
+    'Delta',
+    'Snapshot',
+    'SnapshotStore',
+    'get_snapshot_store',
+    'init_snapshots',
+]
@@ -0,0 +1,278 @@
+"""
+快照版本存储模块
+
+为行情快照类函数（如 ``stock_zh_a_spot_em``）按 (函数, 参数) 保留最近若干个版本的
+主键与逐行哈希，客户端带上已有版本请求时只返回新增、更新与删除的行。
+只有最新版本保留完整数据，较早的版本只保留主键、哈希与列名
+
+版本号由列名与逐行内容哈希计算，内容相同的快照在各工作进程中得到相同的版本号
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from flask import current_app
+
+from app.cache.keys import make_cache_key
+from app.logging_config import get_logger
+
+logger = get_logger('snapshot')
+
+
+class Snapshot:
+    """一个快照版本"""
+
+    __slots__ = ('version', 'frame', 'keys', 'hashes', 'columns')
+
+    def __init__(self, version: str, frame: pd.DataFrame | None, keys: pd.Index,
+                 hashes: np.ndarray, columns: tuple = None):
+        """
+        Args:
+            version: 版本号
+            frame: 快照数据，已不是最新版本时为 None
+            keys: 主键列取值
+            hashes: 与 keys 对应的逐行哈希
+            columns: 列名，默认取 frame 的列名
+        """
+        self.version = version
+        self.frame = frame
+        self.keys = keys
+        self.hashes = hashes
+        self.columns = tuple(frame.columns) if columns is None else columns
+
+    def without_frame(self) -> 'Snapshot':
+        """只含主键、哈希与列名的副本，作为差异计算的基准版本保留"""
+        return Snapshot(self.version, None, self.keys, self.hashes, self.columns)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, key_column: str) -> 'Snapshot':
+        """
+        计算快照版本
+
+        Raises:
+            ValueError: 缺少主键列、主键重复或数据无法哈希
+        """
+        if key_column not in frame.columns:
+            raise ValueError(f"key column '{key_column}' not found")
+        keys = pd.Index(frame[key_column])
+        if not keys.is_unique:
+            raise ValueError(f"key column '{key_column}' is not unique")
+        try:
+            hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+        except TypeError as e:
+            raise ValueError(f"rows are not hashable: {e}") from None
+
+        digest = hashlib.sha1(repr(tuple(frame.columns)).encode('utf-8'))
+        digest.update(hashes.tobytes())
+        return cls(digest.hexdigest()[:16], frame, keys, hashes)
+
+
+class Delta:
+    """两个快照版本之间的差异"""
+
+    __slots__ = ('since', 'version', 'full', 'inserted', 'updated', 'deleted')
+
+    def __init__(self, since: str | None, version: str, full: bool, inserted: pd.DataFrame,
+                 updated: pd.DataFrame, deleted: list):
+        """
+        Args:
+            since: 客户端已有的版本号，全量返回时为 None
+            version: 当前版本号
+            full: 是否为全量返回（客户端版本未知或已淘汰），此时 inserted 为全部行
+            inserted: 新增的行
+            updated: 内容变化的行（整行返回）
+            deleted: 被删除行的主键
+        """
+        self.since = since
+        self.version = version
+        self.full = full
+        self.inserted = inserted
+        self.updated = updated
+        self.deleted = deleted
+
+
+class _Series:
+    """一组参数对应的快照版本序列"""
+
+    __slots__ = ('versions', 'deltas', 'lock')
+
+    def __init__(self):
+        self.versions = OrderedDict()
+        self.deltas = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class SnapshotStore:
+    """快照版本存储"""
+
+    def __init__(self, keys: dict, max_versions: int = 8, max_series: int = 64,
+                 enabled: bool = True):
+        """
+        Args:
+            keys: 函数名到主键列的映射
+            max_versions: 每组参数保留的版本数，客户端版本早于此范围时全量返回
+            max_series: 最多保留的参数组数，超出时按 LRU 淘汰
+            enabled: 是否启用
+        """
+        self.keys = keys
+        self.max_versions = max_versions
+        self.max_series = max_series
+        self.enabled = enabled
+        self.versions = 0
+        self.deltas = 0
+        self.full = 0
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'SnapshotStore':
+        """根据应用配置创建存储"""
+        return cls(
+            keys=config.get('SNAPSHOT_FUNCTIONS', {}),
+            max_versions=config.get('SNAPSHOT_MAX_VERSIONS', 8),
+            max_series=config.get('SNAPSHOT_MAX_SERIES', 64),
+            enabled=config.get('SNAPSHOT_ENABLED', True),
+        )
+
+    def tracks(self, func_name: str) -> bool:
+        """函数是否按快照版本管理"""
+        return self.enabled and func_name in self.keys
+
+    def record(self, func_name: str, params: dict, frame) -> Snapshot | None:
+        """
+        记录一次调用结果，内容与最新版本相同时返回最新版本
+
+        Args:
+            func_name: 函数名称
+            params: 调用参数
+            frame: 函数结果
+
+        Returns:
+            当前版本，结果不是 DataFrame 或无法按主键比较时返回 None
+        """
+        if not self.tracks(func_name) or not isinstance(frame, pd.DataFrame):
+            return None
+
+        series = self._get_series(make_cache_key(func_name, params))
+        with series.lock:
+            if series.versions:
+                latest = next(reversed(series.versions.values()))
+                # 缓存命中时结果为同一对象，无需重新计算哈希
+                if latest.frame is frame:
+                    return latest
+            try:
+                snapshot = Snapshot.from_frame(frame, self.keys[func_name])
+            except ValueError as e:
+                logger.warning(f"Snapshot not versioned: {func_name} - {e}")
+                return None
+
+            if series.versions:
+                latest = next(reversed(series.versions.values()))
+                # 内容与最新版本相同，沿用已有版本
+                if latest.version == snapshot.version:
+                    return latest
+                # 原最新版本降为只含主键与哈希的基准版本，调用方持有的对象不受影响
+                series.versions[latest.version] = latest.without_frame()
+
+            known = snapshot.version in series.versions
+            series.versions[snapshot.version] = snapshot
+            series.versions.move_to_end(snapshot.version)
+            while len(series.versions) > self.max_versions:
+                series.versions.popitem(last=False)
+        if not known:
+            self._count('versions')
+        return snapshot
+
+    def delta(self, func_name: str, params: dict, snapshot: Snapshot, since: str) -> Delta:
+        """
+        计算客户端版本到当前版本的差异
+
+        Args:
+            func_name: 函数名称
+            params: 调用参数
+            snapshot: 当前版本（record 的返回值）
+            since: 客户端已有的版本号
+
+        Returns:
+            差异，客户端版本未知、已淘汰或列不一致时为全量返回
+        """
+        series = self._get_series(make_cache_key(func_name, params))
+        with series.lock:
+            cached = series.deltas.get((since, snapshot.version))
+            if cached is not None:
+                self._count('deltas')
+                return cached
+
+            base = series.versions.get(since)
+            if base is None or base.columns != snapshot.columns:
+                self._count('full')
+                empty = snapshot.frame.iloc[0:0]
+                return Delta(None, snapshot.version, True, snapshot.frame, empty, [])
+
+            delta = _diff(base, snapshot)
+            series.deltas[(since, snapshot.version)] = delta
+            while len(series.deltas) > self.max_versions:
+                series.deltas.popitem(last=False)
+        self._count('deltas')
+        return delta
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'series': len(self._series),
+                'versions': self.versions,
+                'deltas': self.deltas,
+                'full': self.full,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _get_series(self, key: str) -> _Series:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end(key)
+            return series
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def _diff(base: Snapshot, current: Snapshot) -> Delta:
+    positions = base.keys.get_indexer(current.keys)
+    inserted = positions == -1
+    updated = ~inserted & (base.hashes[positions] != current.hashes)
+    deleted = base.keys[~base.keys.isin(current.keys)]
+    return Delta(
+        base.version,
+        current.version,
+        False,
+        current.frame[inserted],
+        current.frame[updated],
+        deleted.tolist(),
+    )
+
+
+def init_snapshots(app):
+    """
+    初始化应用的快照版本存储
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_snapshots'] = SnapshotStore.from_config(app.config)
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """获取当前应用的快照版本存储"""
+    return current_app.extensions['akgate_snapshots']
@@ -0,0 +1,12 @@
+"""
+订阅推送模块
+"""
+from .hub import Feed, Subscriber, SubscriptionHub, get_subscription_hub, init_subscriptions
+
+__all__ = [
+    'Feed',
+    'Subscriber',
+    'SubscriptionHub',
+    'get_subscription_hub',
+    'init_subscriptions',
+]
@@ -0,0 +1,346 @@
+"""
+订阅推送模块
+
+客户端按 (函数, 参数) 订阅，相同的订阅共享一个数据源（Feed）：
+后台调度线程按 SUBSCRIBE_INTERVAL 为每个数据源调用一次 akshare（经过结果缓存与上游限流），
+结果变化时只编码一次事件，再分发给该数据源的全部订阅者。
+上游负载与编码开销随不同数据源的数量增长，而不是随客户端数量增长
+"""
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.api.views import dumps_delta, dumps_result, fetch_result
+from app.cache.keys import make_cache_key
+from app.exceptions import APIError, SubscriptionLimitError
+from app.logging_config import get_logger
+from app.snapshot import get_snapshot_store
+
+logger = get_logger('subscriptions')
+
+
+def format_event(event: str, data: str, event_id: str = None) -> str:
+    """
+    生成 SSE 事件文本
+
+    Args:
+        event: 事件类型
+        data: 单行 JSON 数据
+        event_id: 事件 ID（数据版本号），客户端重连时通过 Last-Event-ID 带回
+
+    Returns:
+        SSE 事件文本
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscriber:
+    """一个订阅连接"""
+
+    def __init__(self, feed: 'Feed', max_queue: int):
+        """
+        Args:
+            feed: 订阅的数据源
+            max_queue: 待发送事件数上限，超出时丢弃积压并在下次发送最新全量数据
+        """
+        self.feed = feed
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lagged = False
+        self._lock = threading.Lock()
+
+    def push(self, event: str) -> None:
+        """放入待发送事件，不阻塞推送线程"""
+        with self._lock:
+            if self._lagged:
+                return
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._lagged = True
+
+    def next_event(self, timeout: float) -> str | None:
+        """
+        获取下一个待发送事件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            事件文本，超时返回 None
+        """
+        with self._lock:
+            if self._lagged:
+                # 客户端消费过慢，丢弃积压的增量事件，改为发送最新全量数据
+                self._lagged = False
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                if self.feed.snapshot_event is not None:
+                    return self.feed.snapshot_event
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Feed:
+    """一个 (函数, 参数) 数据源"""
+
+    def __init__(self, key: str, func_name: str, func, params: dict):
+        """
+        Args:
+            key: 数据源键（与缓存键一致）
+            func_name: 函数名称
+            func: akshare 函数对象
+            params: 规范化后的调用参数
+        """
+        self.key = key
+        self.func_name = func_name
+        self.func = func
+        self.params = params
+        self.subscribers = set()
+        self.version = None
+        self.snapshot = None
+        self.snapshot_event = None
+        self.next_run = 0.0
+        self.polling = False
+
+
+class SubscriptionHub:
+    """订阅数据源调度与事件分发"""
+
+    def __init__(self, app, interval: float = 3.0, max_subscribers: int = 256,
+                 max_workers: int = 4, max_queue: int = 16):
+        """
+        Args:
+            app: Flask 应用实例
+            interval: 每个数据源的轮询间隔（秒）
+            max_subscribers: 本进程最多同时保持的订阅连接数
+            max_workers: 并发轮询的数据源数
+            max_queue: 每个订阅连接的待发送事件数上限
+        """
+        self.app = app
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self.max_queue = max_queue
+        self.polls = 0
+        self.changes = 0
+        self.failures = 0
+        self._feeds = {}
+        self._subscribers = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='akgate-subscribe'
+        )
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app) -> 'SubscriptionHub':
+        """根据应用配置创建订阅中心"""
+        config = app.config
+        return cls(
+            app,
+            interval=config.get('SUBSCRIBE_INTERVAL', 3.0),
+            max_subscribers=config.get('SUBSCRIBE_MAX_CLIENTS', 256),
+            max_workers=config.get('SUBSCRIBE_MAX_WORKERS', 4),
+            max_queue=config.get('SUBSCRIBE_QUEUE_SIZE', 16),
+        )
+
+    def subscribe(self, func_name: str, func, params: dict, last_event_id: str = None) -> Subscriber:
+        """
+        订阅数据源，相同函数与参数的订阅共享一个数据源
+
+        数据源已有数据时立即放入当前全量数据；客户端重连并带回仍保留的快照版本时，
+        改为放入该版本之后的差异
+
+        Args:
+            func_name: 函数名称
+            func: akshare 函数对象
+            params: 规范化后的调用参数
+            last_event_id: 客户端已收到的最后一个版本号
+
+        Returns:
+            订阅连接
+
+        Raises:
+            SubscriptionLimitError: 订阅连接数已达上限
+        """
+        key = make_cache_key(func_name, params)
+        with self._lock:
+            if self._subscribers >= self.max_subscribers:
+                raise SubscriptionLimitError()
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = Feed(key, func_name, func, params)
+                logger.info(f"Feed started: {key}")
+            subscriber = Subscriber(feed, self.max_queue)
+            feed.subscribers.add(subscriber)
+            self._subscribers += 1
+            initial = self._initial_event(feed, last_event_id)
+            if initial is not None:
+                subscriber.push(initial)
+
+        self._ensure_started()
+        self._wakeup.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """取消订阅，数据源没有订阅者时停止轮询"""
+        feed = subscriber.feed
+        with self._lock:
+            if subscriber not in feed.subscribers:
+                return
+            feed.subscribers.discard(subscriber)
+            self._subscribers -= 1
+            if not feed.subscribers and self._feeds.get(feed.key) is feed:
+                del self._feeds[feed.key]
+                logger.info(f"Feed stopped: {feed.key}")
+
+    def poll(self, feed: Feed) -> bool:
+        """
+        轮询一次数据源，结果变化时向全部订阅者分发事件
+
+        Args:
+            feed: 数据源
+
+        Returns:
+            结果是否变化
+        """
+        with self.app.app_context():
+            try:
+                return self._poll(feed)
+            except APIError as e:
+                self._count('failures')
+                logger.warning(f"Feed poll failed: {feed.key} - {e.message}")
+                self._broadcast(feed, format_event('error', self.app.json.dumps(e.to_dict())))
+                return False
+            except Exception as e:
+                self._count('failures')
+                logger.error(f"Feed poll error: {feed.key} - {e}", exc_info=True)
+                error = {'error': True, 'error_code': 'INTERNAL_ERROR', 'message': 'Internal server error'}
+                self._broadcast(feed, format_event('error', self.app.json.dumps(error)))
+                return False
+            finally:
+                with self._lock:
+                    feed.polling = False
+                    feed.next_run = time.monotonic() + self.interval
+                self._count('polls')
+                self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'feeds': len(self._feeds),
+                'subscribers': self._subscribers,
+                'max_subscribers': self.max_subscribers,
+                'polls': self.polls,
+                'changes': self.changes,
+                'failures': self.failures,
+            }
+
+    def _poll(self, feed: Feed) -> bool:
+        value = fetch_result(feed.func_name, feed.func, feed.params).value
+        store = get_snapshot_store()
+        snapshot = store.record(feed.func_name, feed.params, value)
+        if snapshot is not None:
+            version = snapshot.version
+            body = None
+        else:
+            body = dumps_result(value)
+            version = hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+        if version == feed.version:
+            return False
+
+        if body is None:
+            body = dumps_result(value)
+        snapshot_event = format_event('snapshot', f'{{"version": "{version}", "data": {body}}}', version)
+        event = snapshot_event
+        if snapshot is not None and feed.snapshot is not None:
+            # 快照类函数只推送与上一版本的差异
+            delta = store.delta(feed.func_name, feed.params, snapshot, feed.version)
+            if not delta.full:
+                event = format_event('delta', dumps_delta(delta), version)
+
+        # 更新版本与取订阅者在同一锁内完成，新订阅者要么收到新的初始数据，要么收到本次事件
+        with self._lock:
+            feed.version = version
+            feed.snapshot = snapshot
+            feed.snapshot_event = snapshot_event
+            subscribers = list(feed.subscribers)
+        for subscriber in subscribers:
+            subscriber.push(event)
+        self._count('changes')
+        return True
+
+    def _initial_event(self, feed: Feed, last_event_id: str | None) -> str | None:
+        if feed.snapshot_event is None or last_event_id == feed.version:
+            return None
+        if last_event_id and feed.snapshot is not None:
+            delta = get_snapshot_store().delta(
+                feed.func_name, feed.params, feed.snapshot, last_event_id,
+            )
+            if not delta.full:
+                return format_event('delta', dumps_delta(delta), feed.version)
+        return feed.snapshot_event
+
+    def _broadcast(self, feed: Feed, event: str) -> None:
+        with self._lock:
+            subscribers = list(feed.subscribers)
+        for subscriber in subscribers:
+            subscriber.push(event)
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._loop, name='akgate-subscribe-scheduler', daemon=True,
+            )
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = [
+                    feed for feed in self._feeds.values()
+                    if not feed.polling and feed.next_run <= now
+                ]
+                for feed in due:
+                    feed.polling = True
+                waits = [
+                    feed.next_run - now for feed in self._feeds.values() if not feed.polling
+                ]
+            for feed in due:
+                self._executor.submit(self.poll, feed)
+
+            # 轮询完成或有新订阅时被唤醒重新计算
+            self._wakeup.wait(min(max(min(waits, default=self.interval), 0.05), self.interval))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def init_subscriptions(app):
+    """
+    初始化应用的订阅中心，调度线程在首次订阅时启动
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_subscriptions'] = SubscriptionHub.from_config(app)
+
+
+def get_subscription_hub() -> SubscriptionHub:
+    """获取当前应用的订阅中心"""
+    return current_app.extensions['akgate_subscriptions']
@@ -0,0 +1,23 @@
+"""
+上游调用控制模块
+"""
+from .limiter import TokenBucket, UpstreamGroup, UpstreamLimiter, get_limiter, init_limiter
+from .loader import LazyModule, ak, akshare_version, load_akshare
+from .registry import FunctionInfo, FunctionRegistry, ParamInfo, get_registry, init_registry
+
+__all__ = [
+    'FunctionInfo',
+    'FunctionRegistry',
+    'LazyModule',
+    'ParamInfo',
+    'TokenBucket',
+    'UpstreamGroup',
+    'UpstreamLimiter',
+    'ak',
+    'akshare_version',
+    'get_limiter',
+    'get_registry',
+    'init_limiter',
+    'init_registry',
+    'load_akshare',
+]
@@ -0,0 +1,264 @@
+"""
+上游限流模块
+
+按函数名通配符将 akshare 函数映射到上游分组（如 ``*_em`` → eastmoney），
+每个分组用信号量限制并发调用数、用令牌桶限制每秒调用数，
+超出的请求排队等待，超过最长等待时间则拒绝。
+
+限流状态保存在进程内，多进程部署时配置的分组限额按工作进程数平分，
+使所有工作进程合计的上游调用量不超过配置值
+"""
+import threading
+import time
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+
+from flask import current_app
+
+from app.exceptions import UpstreamBusyError
+from app.logging_config import get_logger
+
+logger = get_logger('upstream')
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 桶容量（允许的突发调用数）
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """
+        预约一个令牌
+
+        令牌可以预支（余额为负），预约者按顺序在各自的时间点放行
+
+        Args:
+            max_wait: 最长可等待时间（秒）
+
+        Returns:
+            需要等待的秒数，超过 max_wait 时返回 None 且不消耗令牌
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class UpstreamGroup:
+    """上游分组"""
+
+    def __init__(self, name: str, patterns: list, max_concurrency: int = 0,
+                 rate: float = 0, burst: int = 1):
+        """
+        Args:
+            name: 分组名称
+            patterns: 函数名通配符列表
+            max_concurrency: 最大并发调用数，0 表示不限制
+            rate: 每秒最大调用数，0 表示不限制
+            burst: 允许的突发调用数
+        """
+        self.name = name
+        self.patterns = list(patterns)
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._bucket = TokenBucket(rate, max(burst, 1)) if rate else None
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def matches(self, func_name: str) -> bool:
+        return any(fnmatchcase(func_name, pattern) for pattern in self.patterns)
+
+    @contextmanager
+    def acquire(self, timeout: float):
+        """
+        获取一次调用许可
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Raises:
+            UpstreamBusyError: 等待超时
+        """
+        start = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        try:
+            if self._semaphore is not None and not self._semaphore.acquire(timeout=timeout):
+                self._reject()
+            try:
+                if self._bucket is not None:
+                    remaining = max(timeout - (time.monotonic() - start), 0)
+                    wait = self._bucket.reserve(remaining)
+                    if wait is None:
+                        self._reject()
+                    if wait > 0:
+                        time.sleep(wait)
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        try:
+            yield waited
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'rate': self.rate,
+                'queue_depth': self.waiting,
+                'in_flight': self.in_flight,
+                'calls': self.calls,
+                'rejected': self.rejected,
+                'avg_wait': round(self.total_wait / self.calls, 4) if self.calls else 0.0,
+                'max_wait': round(self.max_wait, 4),
+            }
+
+    def _reject(self):
+        with self._lock:
+            self.rejected += 1
+        logger.warning(f"Upstream busy: {self.name}")
+        raise UpstreamBusyError(self.name)
+
+
+class UpstreamLimiter:
+    """上游限流器"""
+
+    def __init__(self, groups: list, max_wait: float = 30.0, enabled: bool = True,
+                 workers: int = 1):
+        """
+        Args:
+            groups: UpstreamGroup 列表，按顺序匹配
+            max_wait: 排队最长等待时间（秒）
+            enabled: 是否启用
+            workers: 分摊分组限额的工作进程数（仅用于统计展示）
+        """
+        self.groups = groups
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self.workers = workers
+        self._resolved = {}
+
+    @classmethod
+    def from_config(cls, config) -> 'UpstreamLimiter':
+        """根据应用配置创建限流器，分组限额按 UPSTREAM_WORKERS 平分到每个进程"""
+        workers = max(config.get('UPSTREAM_WORKERS', 1), 1)
+        groups = [
+            UpstreamGroup(name, **per_worker_limits(options, workers))
+            for name, options in config.get('UPSTREAM_LIMITS', {}).items()
+        ]
+        return cls(
+            groups=groups,
+            max_wait=config.get('UPSTREAM_MAX_WAIT', 30.0),
+            enabled=config.get('UPSTREAM_LIMIT_ENABLED', True),
+            workers=workers,
+        )
+
+    def group_for(self, func_name: str) -> UpstreamGroup | None:
+        """查找函数所属的上游分组，未匹配时返回 None"""
+        if func_name not in self._resolved:
+            self._resolved[func_name] = next(
+                (group for group in self.groups if group.matches(func_name)), None
+            )
+        return self._resolved[func_name]
+
+    @contextmanager
+    def limit(self, func_name: str):
+        """
+        在限流范围内执行一次上游调用
+
+        Args:
+            func_name: 函数名称
+
+        Raises:
+            UpstreamBusyError: 排队等待超时
+        """
+        group = self.group_for(func_name) if self.enabled else None
+        if group is None:
+            yield 0.0
+            return
+        with group.acquire(self.max_wait) as waited:
+            if waited > 0.01:
+                logger.debug(f"Upstream wait: {func_name} - {group.name} - {waited:.3f}s")
+            yield waited
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'workers': self.workers,
+            'groups': {group.name: group.stats() for group in self.groups},
+        }
+
+
+def per_worker_limits(options: dict, workers: int) -> dict:
+    """
+    将所有工作进程合计的分组限额换算为单个进程的限额
+
+    并发数与突发数向下取整且至少为 1，工作进程数多于限额时合计值可能略超配置值
+
+    Args:
+        options: 分组配置（patterns / max_concurrency / rate / burst）
+        workers: 工作进程数
+
+    Returns:
+        单个进程的分组配置
+    """
+    if workers <= 1:
+        return dict(options)
+    limits = dict(options)
+    if limits.get('max_concurrency'):
+        limits['max_concurrency'] = max(limits['max_concurrency'] // workers, 1)
+    if limits.get('rate'):
+        limits['rate'] = limits['rate'] / workers
+        limits['burst'] = max(limits.get('burst', 1) // workers, 1)
+    return limits
+
+
+def init_limiter(app):
+    """
+    初始化应用的上游限流器
+
+    Args:
+        app: Flask 应用实例
+    """
+    app.extensions['akgate_limiter'] = UpstreamLimiter.from_config(app.config)
+
+
+def get_limiter() -> UpstreamLimiter:
+    """获取当前应用的上游限流器"""
+    return current_app.extensions['akgate_limiter']
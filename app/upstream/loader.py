@@ -0,0 +1,101 @@
+"""
+akshare 模块加载
+
+akshare 导入时会加载数百个子模块，耗时数秒并占用大量内存。
+``ak`` 是一个延迟加载代理：首次访问属性时才导入 akshare，
+健康检查等不需要 akshare 的端点可以在导入完成前立即响应
+"""
+import importlib
+import threading
+import time
+from importlib import metadata
+
+from app.logging_config import get_logger
+
+logger = get_logger('upstream')
+
+
+class LazyModule:
+    """首次访问属性时导入的模块代理"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 模块名称
+        """
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+        self.load_seconds = None
+
+    def load(self):
+        """
+        导入模块（已导入时直接返回）
+
+        Returns:
+            模块对象
+        """
+        module = self._module
+        if module is not None:
+            return module
+        with self._lock:
+            if self._module is None:
+                start = time.perf_counter()
+                self._module = importlib.import_module(self._name)
+                self.load_seconds = time.perf_counter() - start
+                logger.info(f"Module loaded: {self._name} - {self.load_seconds:.2f}s")
+            return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, name: str):
+        # 仅在常规属性查找失败时调用，代理自身的属性不会触发导入
+        if name.startswith('__') and name.endswith('__') and name != '__version__':
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __dir__(self):
+        return dir(self.load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+# akshare 模块代理，替代 ``import akshare as ak``
+ak = LazyModule('akshare')
+
+
+def akshare_version() -> str | None:
+    """
+    读取已安装的 akshare 版本，不导入 akshare
+
+    Returns:
+        版本号，未安装时返回 None
+    """
+    try:
+        return metadata.version('akshare')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def load_akshare(app) -> None:
+    """
+    按 AKSHARE_IMPORT_MODE 在创建应用时导入 akshare
+
+    - eager: 立即导入，配合 gunicorn preload_app 在主进程导入一次，工作进程以写时复制方式共享
+    - lazy: 首次调用 API 时导入
+
+    Args:
+        app: Flask 应用实例
+
+    Raises:
+        ValueError: 未知的导入模式
+    """
+    mode = app.config.get('AKSHARE_IMPORT_MODE', 'eager')
+    if mode == 'eager':
+        ak.load()
+    elif mode != 'lazy':
+        raise ValueError(f"Unknown AKSHARE_IMPORT_MODE: {mode}")
@@ -0,0 +1,221 @@
+"""
+akshare 函数注册表
+
+启动时（或首次使用时）枚举 akshare 的全部公开函数并记录其签名，
+按函数名 O(1) 查找，并支持按名称前缀、关键字检索函数列表
+"""
+import inspect
+import threading
+
+from flask import current_app
+
+from app.logging_config import get_logger
+from .loader import ak
+
+logger = get_logger('upstream')
+
+
+class ParamInfo:
+    """函数参数描述"""
+
+    __slots__ = ('name', 'kind', 'default', 'annotation')
+
+    def __init__(self, name: str, kind, default, annotation):
+        """
+        Args:
+            name: 参数名
+            kind: inspect.Parameter 的参数类型
+            default: 默认值，无默认值时为 inspect.Parameter.empty
+            annotation: 类型注解，无注解时为 inspect.Parameter.empty
+        """
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.annotation = annotation
+
+    @property
+    def required(self) -> bool:
+        return self.default is inspect.Parameter.empty
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'required': self.required,
+            'default': None if self.required else _jsonable(self.default),
+            'type': _type_name(self.annotation),
+        }
+
+
+class FunctionInfo:
+    """akshare 函数描述"""
+
+    __slots__ = ('name', 'func', 'params', 'var_keyword', 'summary')
+
+    def __init__(self, name: str, func, params: list, var_keyword: bool, summary: str):
+        """
+        Args:
+            name: 函数名
+            func: 函数对象
+            params: 可通过关键字传入的参数列表，签名无法解析时为 None
+            var_keyword: 是否接受 **kwargs
+            summary: 文档字符串首行
+        """
+        self.name = name
+        self.func = func
+        self.params = params
+        self.var_keyword = var_keyword
+        self.summary = summary
+
+    @classmethod
+    def from_callable(cls, name: str, func) -> 'FunctionInfo':
+        """解析函数签名与文档创建描述"""
+        try:
+            signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            return cls(name, func, None, True, _summary(func))
+
+        params = [
+            ParamInfo(param.name, param.kind, param.default, param.annotation)
+            for param in signature.parameters.values()
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+        ]
+        var_keyword = any(
+            param.kind == param.VAR_KEYWORD for param in signature.parameters.values()
+        )
+        return cls(name, func, params, var_keyword, _summary(func))
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'summary': self.summary,
+            'params': None if self.params is None else [param.to_dict() for param in self.params],
+        }
+
+
+class FunctionRegistry:
+    """akshare 函数注册表"""
+
+    def __init__(self, module):
+        """
+        Args:
+            module: akshare 模块（或其延迟加载代理）
+        """
+        self.module = module
+        self._functions = {}
+        self._complete = False
+        self._names = ()
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """枚举模块的全部公开函数（已构建时直接返回）"""
+        if self._complete:
+            return
+        with self._lock:
+            if self._complete:
+                return
+            functions = {}
+            for name in dir(self.module):
+                if name.startswith('_'):
+                    continue
+                obj = getattr(self.module, name, None)
+                if callable(obj) and not inspect.isclass(obj):
+                    functions[name] = self._functions.get(name) or FunctionInfo.from_callable(name, obj)
+            self._functions = functions
+            self._names = tuple(sorted(functions))
+            self._complete = True
+        logger.info(f"Function registry built: {len(self._names)} functions")
+
+    def get(self, name: str) -> FunctionInfo | None:
+        """
+        按名称查找函数
+
+        注册表构建完成后只查字典；未构建时按需解析单个函数并缓存
+
+        Args:
+            name: 函数名
+
+        Returns:
+            函数描述，不存在时返回 None
+        """
+        info = self._functions.get(name)
+        if info is not None or self._complete:
+            return info
+        if name.startswith('_'):
+            return None
+        obj = getattr(self.module, name, None)
+        if not callable(obj) or inspect.isclass(obj):
+            return None
+        info = FunctionInfo.from_callable(name, obj)
+        with self._lock:
+            self._functions.setdefault(name, info)
+        return info
+
+    def search(self, query: str = None, prefix: str = None, names=None) -> list:
+        """
+        检索函数
+
+        Args:
+            query: 函数名或文档首行包含的关键字（不区分大小写）
+            prefix: 函数名前缀
+            names: 限定的函数名集合（如白名单），为 None 时检索全部函数
+
+        Returns:
+            按函数名排序的 FunctionInfo 列表
+        """
+        if names is None:
+            self.build()
+            candidates = (self._functions[name] for name in self._names)
+        else:
+            candidates = (info for info in map(self.get, sorted(names)) if info is not None)
+
+        query = query.lower() if query else None
+        return [
+            info for info in candidates
+            if (not prefix or info.name.startswith(prefix))
+            and (not query or query in info.name.lower() or query in info.summary.lower())
+        ]
+
+    def __len__(self):
+        self.build()
+        return len(self._names)
+
+
+def _summary(func) -> str:
+    doc = inspect.getdoc(func) or ''
+    for line in doc.splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return ''
+
+
+def _type_name(annotation) -> str | None:
+    if annotation is inspect.Parameter.empty:
+        return None
+    if isinstance(annotation, str):
+        return annotation
+    return getattr(annotation, '__name__', None) or str(annotation)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def init_registry(app):
+    """
+    初始化 akshare 函数注册表，eager 导入模式下立即枚举全部函数
+
+    Args:
+        app: Flask 应用实例
+    """
+    registry = FunctionRegistry(ak)
+    if app.config.get('AKSHARE_IMPORT_MODE', 'eager') == 'eager':
+        registry.build()
+    app.extensions['akgate_registry'] = registry
+
+
+def get_registry() -> FunctionRegistry:
+    """获取当前应用的函数注册表"""
+    return current_app.extensions['akgate_registry']
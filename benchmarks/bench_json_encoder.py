@@ -0,0 +1,68 @@
+"""
+DataFrame JSON 编码基准测试
+
+对比 ``dumps(df.to_dict('records'))`` 与按列编码 ``dumps_frame(df)`` 的耗时，
+并校验两者输出逐字节一致
+
+使用方法: python -m benchmarks.bench_json_encoder [rows]
+"""
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.config import TestingConfig
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """构造与 stock_zh_a_hist 结构相近的 DataFrame"""
+    rng = np.random.default_rng(42)
+    close = rng.uniform(5, 50, rows).round(2)
+    close[::97] = np.nan
+    return pd.DataFrame({
+        '日期': [date(2000, 1, 1) + pd.Timedelta(days=i % 9000) for i in range(rows)],
+        '时间': pd.date_range('2020-01-01 09:30', periods=rows, freq='min'),
+        '股票代码': rng.choice(['000001', '600519', '300750'], rows),
+        '开盘': rng.uniform(5, 50, rows).round(2),
+        '收盘': close,
+        '最高': rng.uniform(5, 50, rows).round(2),
+        '最低': rng.uniform(5, 50, rows).round(2),
+        '成交量': rng.integers(1_000, 10_000_000, rows),
+        '成交额': rng.uniform(1e6, 1e9, rows).round(2),
+        '涨跌幅': rng.normal(0, 2, rows).round(2),
+    })
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    app = create_app(TestingConfig)
+    provider = app.json
+    df = make_frame(rows)
+
+    legacy = provider.dumps(df.to_dict('records'))
+    vectorized = provider.dumps_frame(df)
+    assert legacy == vectorized, 'outputs differ'
+
+    legacy_time = best_of(lambda: provider.dumps(df.to_dict('records')))
+    vectorized_time = best_of(lambda: provider.dumps_frame(df))
+
+    print(f"rows: {rows}, output: {len(vectorized.encode()) / 1024 / 1024:.1f} MiB, byte-identical: yes")
+    print(f"to_dict + dumps: {legacy_time * 1000:.0f} ms")
+    print(f"dumps_frame:     {vectorized_time * 1000:.0f} ms")
+    print(f"speedup:         {legacy_time / vectorized_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+gunicorn 工作模式负载基准测试
+
+以 sync 与 gthread 两种工作模式启动 gunicorn，用模拟的 akshare 函数
+（``bench_slow`` 休眠指定秒数模拟慢速抓取，``bench_fast`` 立即返回）
+发起慢速 / 快速混合请求，同时每 100 ms 探测一次 /health，记录：
+
+- 快速请求与慢速请求的完成数和吞吐量
+- /health 延迟（p50 / p99 / 最大值）与超时次数（超时与 Docker HEALTHCHECK 一致，10 秒）
+
+结果缓存已关闭，每次请求都会调用模拟函数
+
+使用方法: python -m benchmarks.bench_serving [duration] [slow_clients] [slow_seconds]
+"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from types import SimpleNamespace
+
+import pandas as pd
+
+HEALTH_TIMEOUT = 10
+
+
+def create_bench_app():
+    """gunicorn 应用工厂：以模拟函数替换 akshare"""
+    from app import create_app
+    from app.upstream import FunctionRegistry
+
+    slow_seconds = float(os.getenv('BENCH_SLOW_SECONDS', 2))
+
+    def bench_slow(symbol: str = '000001'):
+        """模拟慢速上游抓取"""
+        time.sleep(slow_seconds)
+        return pd.DataFrame({'symbol': [symbol], 'value': [1.0]})
+
+    def bench_fast(symbol: str = '000001'):
+        """模拟快速上游调用"""
+        return pd.DataFrame({'symbol': [symbol], 'value': [1.0]})
+
+    app = create_app()
+    app.extensions['akgate_registry'] = FunctionRegistry(
+        SimpleNamespace(bench_slow=bench_slow, bench_fast=bench_fast)
+    )
+    return app
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def request(url: str, timeout: float) -> float | None:
+    """发送请求，返回耗时（秒），失败或超时返回 None"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except OSError:
+        return None
+    return time.perf_counter() - start
+
+
+def client_loop(url: str, stop: threading.Event, results: list, interval: float = 0.0,
+                timeout: float = 60):
+    while not stop.is_set():
+        results.append(request(url, timeout))
+        if interval:
+            stop.wait(interval)
+
+
+def wait_ready(base: str, deadline: float) -> bool:
+    while time.time() < deadline:
+        if request(f'{base}/health', 1) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def gunicorn_run(worker_class: str, threads: int, port: int, duration: float,
+                 slow_clients: int, fast_clients: int, slow_seconds: float) -> dict:
+    env = {
+        **os.environ,
+        'FLASK_ENV': 'development',
+        'GUNICORN_WORKERS': '1',
+        'GUNICORN_WORKER_CLASS': worker_class,
+        'GUNICORN_THREADS': str(threads),
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'AKSHARE_IMPORT_MODE': 'lazy',
+        'CACHE_ENABLED': 'false',
+        'ENABLE_FUNCTION_WHITELIST': 'false',
+        'BENCH_SLOW_SECONDS': str(slow_seconds),
+        'LOG_LEVEL': 'WARNING',
+        'PROMETHEUS_MULTIPROC_DIR': f'/tmp/akgate/bench-metrics-{port}',
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--access-logfile', '/dev/null', 'benchmarks.bench_serving:create_bench_app()'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f'http://127.0.0.1:{port}'
+    try:
+        if not wait_ready(base, time.time() + 60):
+            raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+        stop = threading.Event()
+        slow, fast, health = [], [], []
+        workers = [
+            threading.Thread(target=client_loop, args=(f'{base}/api/bench_slow', stop, slow))
+            for _ in range(slow_clients)
+        ] + [
+            threading.Thread(target=client_loop, args=(f'{base}/api/bench_fast', stop, fast))
+            for _ in range(fast_clients)
+        ] + [
+            threading.Thread(
+                target=client_loop, args=(f'{base}/health', stop, health, 0.1, HEALTH_TIMEOUT),
+            ),
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        time.sleep(duration)
+        stop.set()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        health_ok = [value for value in health if value is not None]
+        return {
+            'slow': sum(value is not None for value in slow),
+            'fast': sum(value is not None for value in fast),
+            'elapsed': elapsed,
+            'health_p50': percentile(health_ok, 0.5),
+            'health_p99': percentile(health_ok, 0.99),
+            'health_max': max(health_ok, default=float('nan')),
+            'health_checks': len(health),
+            'health_failed': len(health) - len(health_ok),
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    slow_clients = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    slow_seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 2
+    fast_clients = 4
+
+    print(
+        f"1 worker, {duration:.0f}s, {slow_clients} slow clients ({slow_seconds:.1f}s per call), "
+        f"{fast_clients} fast clients, /health every 100 ms"
+    )
+    for index, (worker_class, threads) in enumerate((('sync', 1), ('gthread', 16))):
+        result = gunicorn_run(
+            worker_class, threads, 5200 + index, duration, slow_clients, fast_clients, slow_seconds,
+        )
+        label = f"{worker_class}/{threads}"
+        print(
+            f"  {label:10}  slow: {result['slow'] / result['elapsed']:6.2f} req/s  "
+            f"fast: {result['fast'] / result['elapsed']:8.1f} req/s  "
+            f"/health p50: {result['health_p50'] * 1000:7.1f} ms  "
+            f"p99: {result['health_p99'] * 1000:7.1f} ms  "
+            f"max: {result['health_max'] * 1000:7.1f} ms  "
+            f"failed: {result['health_failed']}/{result['health_checks']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
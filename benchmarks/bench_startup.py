@@ -0,0 +1,163 @@
+"""
+启动时间与工作进程内存基准测试
+
+1. 单进程冷启动：分别以 eager / lazy 模式创建应用，记录 create_app 耗时、
+   首个 /health 与首个 /api 请求耗时，及两次请求后的进程 RSS
+2. gunicorn 多进程：分别以普通模式与 preload 模式启动，记录 /health 可用前的耗时，
+   以及各工作进程的 PSS（按共享进程数分摊的内存）与 USS（独占内存）
+
+使用方法: python -m benchmarks.bench_startup [workers]
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+COLD_START = r'''
+import json, time
+start = time.perf_counter()
+from app import create_app
+from app.config import Config
+
+class BenchConfig(Config):
+    AKSHARE_IMPORT_MODE = %(mode)r
+    PREWARM_ENABLED = False
+
+app = create_app(BenchConfig)
+created = time.perf_counter()
+client = app.test_client()
+
+
+def rss():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+
+
+client.get('/health')
+health = time.perf_counter()
+health_rss = rss()
+client.get('/api/definitely_not_an_akshare_function')
+api = time.perf_counter()
+print(json.dumps({
+    'create_app': created - start,
+    'first_health': health - start,
+    'first_api': api - start,
+    'health_rss': health_rss,
+    'rss': rss(),
+}))
+'''
+
+
+def cold_start(mode: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, '-c', COLD_START % {'mode': mode}],
+        env={**os.environ, 'LOG_LEVEL': 'WARNING'},
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def memory_of(pid: int) -> dict:
+    """读取进程的 RSS / PSS / USS（字节）"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].rstrip(':') in (
+                'Rss', 'Pss', 'Private_Clean', 'Private_Dirty',
+            ):
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+    }
+
+
+def worker_pids(master: int) -> list:
+    output = subprocess.check_output(['ps', '-o', 'pid=', '--ppid', str(master)])
+    return [int(pid) for pid in output.split()]
+
+
+def gunicorn_run(preload: bool, workers: int, port: int) -> dict:
+    env = {
+        **os.environ,
+        'GUNICORN_WORKERS': str(workers),
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'GUNICORN_PRELOAD': 'true' if preload else 'false',
+        'AKSHARE_IMPORT_MODE': 'eager',
+        'LOG_LEVEL': 'WARNING',
+        'PROMETHEUS_MULTIPROC_DIR': f'/tmp/akgate/bench-metrics-{port}',
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:create_app()'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready = None
+        deadline = time.time() + 300
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1):
+                    ready = time.perf_counter() - start
+                    break
+            except OSError:
+                time.sleep(0.05)
+        # 等待所有工作进程完成启动（内存不再增长）后再统计
+        pids, usage, previous = [], [], -1
+        while time.time() < deadline:
+            time.sleep(1)
+            pids = worker_pids(process.pid)
+            usage = [memory_of(pid) for pid in pids]
+            total = sum(item['rss'] for item in usage)
+            if len(pids) == workers and abs(total - previous) < total * 0.01:
+                break
+            previous = total
+        return {
+            'ready': ready,
+            'workers': len(pids),
+            'pss': sum(item['pss'] for item in usage) / len(usage),
+            'uss': sum(item['uss'] for item in usage) / len(usage),
+            'rss': sum(item['rss'] for item in usage) / len(usage),
+            'total_pss': sum(item['pss'] for item in usage) + memory_of(process.pid)['pss'],
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def mib(value: float) -> str:
+    return f"{value / 1024 / 1024:.0f} MiB"
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    print("single process cold start")
+    for mode in ('eager', 'lazy'):
+        result = cold_start(mode)
+        print(
+            f"  {mode:5}  create_app: {result['create_app'] * 1000:6.0f} ms  "
+            f"first /health: {result['first_health'] * 1000:6.0f} ms  "
+            f"first /api: {result['first_api'] * 1000:6.0f} ms  "
+            f"rss after /health: {mib(result['health_rss'])}  after /api: {mib(result['rss'])}"
+        )
+
+    print(f"gunicorn, {workers} workers, eager import")
+    for preload in (False, True):
+        result = gunicorn_run(preload, workers, 5100 + int(preload))
+        label = 'preload' if preload else 'fork'
+        print(
+            f"  {label:7}  ready: {result['ready'] * 1000:6.0f} ms  "
+            f"per worker rss: {mib(result['rss'])}  pss: {mib(result['pss'])}  "
+            f"uss: {mib(result['uss'])}  total pss: {mib(result['total_pss'])}"
+        )
+
+
+if __name__ == '__main__':
+    main()
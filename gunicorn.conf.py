@@ -3,13 +3,40 @@ Gunicorn 配置文件
 
 使用方法: gunicorn -c gunicorn.conf.py 'app:create_app()'
 """
+import gc
 import os
+import shutil
 
 # 绑定地址
 bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
 
-# 工作进程数：请求量极小，1 个进程足够
-workers = 1
+# 工作进程数：默认 1 个进程
+# 多进程部署时应设置 CACHE_BACKEND=sqlite，使各进程共享缓存结果，避免上游请求成倍增加
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+
+# 上游限流状态在各进程内，分组限额按工作进程数平分，合计调用量不超过 UPSTREAM_LIMITS
+os.environ.setdefault('UPSTREAM_WORKERS', str(workers))
+
+# 工作模式：
+# - gthread（默认）：每个进程用线程池处理请求，慢速的 akshare 调用只占用一个线程，
+#   其他请求（包括 /health）由空闲线程处理
+# - sync：每个进程同一时间只处理一个请求，慢速调用期间该进程无法响应健康检查
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# 每个进程的线程数（仅 gthread）：应大于同时进行的慢速调用数（含在上游限流中排队的请求），
+# 否则健康检查会排在慢速调用之后
+threads = int(os.getenv('GUNICORN_THREADS', 16 if worker_class == 'gthread' else 1))
+
+# 订阅推送（SSE）连接在整个订阅期间占用一个线程，默认最多使用一半线程，
+# 保证普通请求与健康检查始终有空闲线程；大量订阅客户端时应相应增大 GUNICORN_THREADS
+os.environ.setdefault('SUBSCRIBE_MAX_CLIENTS', str(max(threads // 2, 1)))
+
+# 预加载：主进程创建应用并导入 akshare 一次，工作进程 fork 后以写时复制方式共享内存，
+# 启动更快、总内存更少；后台线程无法跨 fork 保留，推迟到工作进程启动后再启动
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+if preload_app:
+    os.environ.setdefault('AKSHARE_IMPORT_MODE', 'eager')
+    os.environ.setdefault('DEFER_BACKGROUND_TASKS', 'true')
 
 # 超时时间（秒）
 timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
@@ -17,6 +44,9 @@ timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
 # 优雅重启超时
 graceful_timeout = 30
 
+# 长连接保持时间（秒），gthread 模式下空闲连接不占用线程
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
 
 # 日志配置
 accesslog = '-'  # 输出到 stdout
@@ -26,3 +56,32 @@ loglevel = os.getenv('LOG_LEVEL', 'info').lower()
 # 进程名
 proc_name = 'akgate'
 
+
+# Prometheus 多进程指标目录：工作进程将指标写入该目录，由 /metrics 汇总
+# 必须在工作进程导入 prometheus_client 之前设置
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/akgate/metrics')
+
+
+def on_starting(server):
+    """启动时清空上一次运行遗留的指标文件"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """工作进程退出时清理其 in-flight 等实时指标"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    """预加载时冻结主进程对象，避免工作进程 GC 写入对象头导致共享内存页被复制"""
+    if preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """预加载时在工作进程中启动后台线程"""
+    if preload_app:
+        from app import start_background_tasks
+        start_background_tasks(worker.wsgi)
@@ -1,10 +1,13 @@
 """
 测试配置和固定装置
 """
+from unittest.mock import MagicMock
+
 import pytest
 
 from app import create_app
 from app.config import TestingConfig
+from app.upstream import FunctionRegistry
 
 
 @pytest.fixture
@@ -24,3 +27,11 @@ def client(app):
 def runner(app):
     """创建 CLI 测试运行器"""
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def mock_ak(app):
+    """以模拟模块替换应用的 akshare 函数注册表"""
+    module = MagicMock()
+    app.extensions['akgate_registry'] = FunctionRegistry(module)
+    return module
@@ -1,7 +1,7 @@
 """
 API 端点测试
 """
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 import pandas as pd
 
 
@@ -71,7 +71,6 @@ def test_function_not_allowed(app, client):
     assert data['error_code'] == 'FUNCTION_NOT_ALLOWED'
 
 
-@patch('app.api.views.ak')
 def test_successful_api_call(mock_ak, client):
     """测试成功的 API 调用"""
     # 模拟 akshare 函数返回
@@ -93,7 +92,6 @@ def test_successful_api_call(mock_ak, client):
     assert len(data) == 2
 
 
-@patch('app.api.views.ak')
 def test_api_call_with_empty_result(mock_ak, client):
     """测试返回空 DataFrame"""
     mock_df = pd.DataFrame()
@@ -108,7 +106,6 @@ def test_api_call_with_empty_result(mock_ak, client):
     assert data == []
 
 
-@patch('app.api.views.ak')
 def test_api_call_type_error(mock_ak, client):
     """测试参数错误"""
     mock_func = MagicMock(side_effect=TypeError("missing required argument"))
@@ -123,7 +120,6 @@ def test_api_call_type_error(mock_ak, client):
     assert data['error_code'] == 'INVALID_PARAMETER'
 
 
-@patch('app.api.views.ak')
 def test_api_call_runtime_error(mock_ak, client):
     """测试运行时错误"""
     mock_func = MagicMock(side_effect=RuntimeError("network error"))
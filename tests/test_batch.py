@@ -0,0 +1,70 @@
+"""
+批量调用测试
+"""
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def mock_funcs(mock_ak):
+    """模拟批量调用中的 akshare 函数"""
+    type(mock_ak).hist_func = MagicMock(
+        side_effect=lambda symbol: pd.DataFrame({'代码': [symbol], '收盘': [10.5]})
+    )
+    type(mock_ak).error_func = MagicMock(side_effect=RuntimeError("network error"))
+    return mock_ak
+
+
+def test_batch_results_in_order(client, mock_funcs):
+    """测试批量调用按请求顺序返回结果与错误"""
+    response = client.post('/api/_batch', json={'items': [
+        {'function': 'hist_func', 'params': {'symbol': '000001'}},
+        {'function': 'hist_func', 'params': {'symbol': '000002', '_columns': '代码'}},
+        {'function': 'error_func'},
+        {'function': 'bad-name!'},
+    ]})
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data['count'] == 4
+    results = data['results']
+    assert [item['index'] for item in results] == [0, 1, 2, 3]
+    assert results[0]['data'] == [{'代码': '000001', '收盘': 10.5}]
+    assert results[1]['data'] == [{'代码': '000002'}]
+    assert results[2]['status'] == 500
+    assert results[2]['error']['error_code'] == 'DATA_FETCH_ERROR'
+    assert results[3]['status'] == 400
+
+
+def test_batch_stream(client, mock_funcs):
+    """测试批量调用流式返回"""
+    response = client.post('/api/_batch?_stream=1', json=[
+        {'function': 'hist_func', 'params': {'symbol': str(i)}} for i in range(5)
+    ])
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(item['index'] for item in lines) == [0, 1, 2, 3, 4]
+    assert all(item['status'] == 200 for item in lines)
+
+
+@pytest.mark.parametrize('payload', [
+    {'items': []},
+    {'items': [{'params': {}}]},
+    {'items': [{'function': 'hist_func', 'params': {'symbol': ['a']}}]},
+    'not a list',
+])
+def test_batch_invalid_payload(client, payload):
+    """测试非法批量请求体"""
+    response = client.post('/api/_batch', json=payload)
+    assert response.status_code == 400
+
+
+def test_batch_item_limit(app, client):
+    """测试批量调用数上限"""
+    app.config['BATCH_MAX_ITEMS'] = 2
+    response = client.post('/api/_batch', json=[{'function': 'hist_func'}] * 3)
+    assert response.status_code == 400
@@ -0,0 +1,237 @@
+"""
+结果缓存测试
+"""
+import threading
+import time
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.cache import MemoryCache, SingleFlight, TTLPolicy, make_cache_key
+
+
+def test_cache_key_is_order_insensitive():
+    """测试缓存键与参数顺序无关"""
+    key1 = make_cache_key('stock_zh_a_hist', {'symbol': '000001', 'adjust': 'qfq'})
+    key2 = make_cache_key('stock_zh_a_hist', {'adjust': 'qfq', 'symbol': ' 000001'})
+    assert key1 == key2
+    assert key1 == 'stock_zh_a_hist?adjust=qfq&symbol=000001'
+
+
+def test_ttl_policy_rules():
+    """测试 TTL 规则匹配"""
+    policy = TTLPolicy(
+        default_ttl=60,
+        rules={'*_spot_em': 5, '*_hist': 300, 'stock_zh_a_hist': 600},
+        historical_ttl=86400,
+        historical_params=('end_date',),
+    )
+    assert policy.resolve('stock_zh_a_spot_em', {}) == 5
+    assert policy.resolve('fund_etf_hist_em', {}) == 60
+    assert policy.resolve('index_zh_a_hist', {}) == 300
+    assert policy.resolve('stock_zh_a_hist', {}) == 600
+
+    yesterday = (date.today() - timedelta(days=1)).strftime('%Y%m%d')
+    tomorrow = (date.today() + timedelta(days=1)).strftime('%Y%m%d')
+    assert policy.resolve('index_zh_a_hist', {'end_date': yesterday}) == 86400
+    assert policy.resolve('index_zh_a_hist', {'end_date': tomorrow}) == 300
+
+
+def test_memory_cache_lru_eviction():
+    """测试按条目数和字节数淘汰"""
+    cache = MemoryCache(max_entries=2, max_bytes=10 ** 6)
+    cache.set('a', 1, ttl=60)
+    cache.set('b', 2, ttl=60)
+    assert cache.get('a').value == 1
+    cache.set('c', 3, ttl=60)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+    small = MemoryCache(max_entries=10, max_bytes=100)
+    small.set('x', 'x' * 60, ttl=60)
+    small.set('y', 'y' * 60, ttl=60)
+    assert small.get('x') is None
+    assert small.stats()['bytes'] <= 100
+
+
+def test_memory_cache_expiry():
+    """测试条目过期"""
+    cache = MemoryCache()
+    cache.set('a', 1, ttl=0)
+    assert cache.get('a') is None
+
+
+def test_api_cache_hit(mock_ak, client):
+    """测试重复请求命中缓存"""
+    mock_func = MagicMock(return_value=pd.DataFrame({'value': [1, 2]}))
+    type(mock_ak).cached_func = mock_func
+
+    response = client.get('/api/cached_func?b=2&a=1')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.headers['Age'] == '0'
+
+    response = client.get('/api/cached_func?a=1&b=2')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert 'Age' in response.headers
+    assert response.get_json() == [{'value': 1}, {'value': 2}]
+    assert mock_func.call_count == 1
+
+
+def test_api_cache_bypass(mock_ak, app, client):
+    """测试 TTL 为 0 时不缓存"""
+    app.extensions['akgate_cache'].policy.rules['uncached_func'] = 0
+    mock_func = MagicMock(return_value=pd.DataFrame({'value': [1]}))
+    type(mock_ak).uncached_func = mock_func
+
+    client.get('/api/uncached_func')
+    response = client.get('/api/uncached_func')
+    assert response.headers['X-Cache'] == 'BYPASS'
+    assert mock_func.call_count == 2
+
+
+def test_api_errors_not_cached(mock_ak, client):
+    """测试异常结果不写入缓存"""
+    mock_func = MagicMock(side_effect=[RuntimeError("network error"), pd.DataFrame({'value': [1]})])
+    type(mock_ak).flaky_func = mock_func
+
+    assert client.get('/api/flaky_func').status_code == 500
+    response = client.get('/api/flaky_func')
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    """测试并发相同调用只执行一次"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+
+    def worker():
+        results.append(flight.do('key', slow))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()['coalesced'] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(value == 'result' for value, _ in results)
+    assert flight.stats() == {'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_singleflight_shares_errors():
+    """测试合并调用共享异常"""
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(5)
+        raise ValueError('boom')
+
+    def worker():
+        try:
+            flight.do('key', failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()['coalesced'] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    with pytest.raises(KeyError):
+        flight.do('other', lambda: {}['missing'])
+
+
+def make_stale_cache(stale_while_revalidate=0, stale_if_error=0):
+    """创建启用过期数据策略的缓存"""
+    from app.cache import ResultCache
+
+    return ResultCache(
+        MemoryCache(),
+        TTLPolicy(default_ttl=60),
+        stale_while_revalidate=stale_while_revalidate,
+        stale_if_error=stale_if_error,
+    )
+
+
+def expire(cache, key, seconds):
+    """将缓存条目的新鲜期与保留期整体提前，使其已过期指定秒数"""
+    entry = cache.store.get(key)
+    shift = entry.expires_at - (time.time() - seconds)
+    entry.expires_at -= shift
+    entry.stale_until -= shift
+
+
+def test_stale_while_revalidate(app):
+    """测试过期后先返回旧数据并在后台刷新"""
+    cache = make_stale_cache(stale_while_revalidate=30)
+    values = iter(['old', 'new'])
+
+    with app.app_context():
+        assert cache.get_or_load('f', {}, lambda: next(values)).value == 'old'
+        expire(cache, 'f?', 10)
+
+        lookup = cache.get_or_load('f', {}, lambda: next(values))
+        assert (lookup.status, lookup.value) == ('STALE', 'old')
+        assert lookup.warning.startswith('110')
+
+        deadline = time.time() + 5
+        while cache.store.get('f?').is_expired() and time.time() < deadline:
+            time.sleep(0.01)
+        lookup = cache.get_or_load('f', {}, lambda: 'unused')
+        assert (lookup.status, lookup.value) == ('HIT', 'new')
+
+
+def test_stale_if_error(app):
+    """测试上游出错时回退到旧数据"""
+    from app.exceptions import DataFetchError, InvalidParameterError
+
+    cache = make_stale_cache(stale_while_revalidate=5, stale_if_error=600)
+
+    def upstream_down():
+        raise DataFetchError('Upstream service unavailable', status_code=503)
+
+    def bad_params():
+        raise InvalidParameterError('bad')
+
+    with app.app_context():
+        cache.get_or_load('f', {}, lambda: 'last good')
+        expire(cache, 'f?', 60)
+
+        lookup = cache.get_or_load('f', {}, upstream_down)
+        assert (lookup.status, lookup.value) == ('STALE', 'last good')
+        assert lookup.warning.startswith('111')
+
+        with pytest.raises(InvalidParameterError):
+            cache.get_or_load('f', {}, bad_params)
+
+        expire(cache, 'f?', 601)
+        assert cache.store.get('f?') is None
+        with pytest.raises(DataFetchError):
+            cache.get_or_load('f', {}, upstream_down)
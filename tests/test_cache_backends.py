@@ -0,0 +1,102 @@
+"""
+缓存后端测试
+"""
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app import create_app
+from app.cache import MemoryCache, SQLiteCache, create_backend
+from app.config import TestingConfig
+from app.upstream import FunctionRegistry
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    """按类型创建缓存后端"""
+    if request.param == 'memory':
+        return MemoryCache(max_entries=2, max_bytes=10 ** 6)
+    return SQLiteCache(
+        str(tmp_path / 'cache.sqlite3'), max_entries=2, max_bytes=10 ** 6, touch_interval=0,
+    )
+
+
+def test_backend_roundtrip(backend):
+    """测试后端存取 DataFrame"""
+    df = pd.DataFrame({'代码': ['000001', '000002'], '收盘': [10.5, 20.1]})
+    backend.set('key', df, ttl=60)
+
+    entry = backend.get('key')
+    assert entry is not None
+    pd.testing.assert_frame_equal(entry.value, df)
+    assert backend.get('missing') is None
+
+    backend.delete('key')
+    assert backend.get('key') is None
+
+
+def test_backend_expiry_and_eviction(backend):
+    """测试后端过期与 LRU 淘汰"""
+    backend.set('expired', 1, ttl=0)
+    assert backend.get('expired') is None
+
+    backend.set('a', 1, ttl=60)
+    backend.set('b', 2, ttl=60)
+    assert backend.get('a').value == 1
+    backend.set('c', 3, ttl=60)
+    assert backend.get('b') is None
+    assert backend.stats()['entries'] == 2
+
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    """测试多个实例（模拟多个工作进程）共享同一缓存文件"""
+    path = str(tmp_path / 'shared.sqlite3')
+    worker1 = SQLiteCache(path)
+    worker2 = SQLiteCache(path)
+
+    worker1.set('stock_zh_a_spot_em?', [{'代码': '000001'}], ttl=60)
+    assert worker2.get('stock_zh_a_spot_em?').value == [{'代码': '000001'}]
+
+
+def test_sqlite_hits_skip_recent_access_update(tmp_path):
+    """测试访问时间刚刷新过的条目命中时不再发起写事务"""
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite3'), touch_interval=60)
+    cache.set('key', 1, ttl=60)
+    conn = cache._connection()
+    writes = conn.total_changes
+
+    for _ in range(10):
+        assert cache.get('key').value == 1
+    assert conn.total_changes == writes
+
+    cache.touch_interval = 0
+    cache.get('key')
+    assert conn.total_changes == writes + 1
+
+
+def test_create_backend_unknown():
+    """测试未知后端类型"""
+    with pytest.raises(ValueError):
+        create_backend({'CACHE_BACKEND': 'unknown'})
+
+
+def test_api_with_sqlite_backend(mock_ak, tmp_path):
+    """测试 API 使用 SQLite 后端跨应用实例命中缓存"""
+    class SQLiteConfig(TestingConfig):
+        CACHE_BACKEND = 'sqlite'
+        CACHE_SQLITE_PATH = str(tmp_path / 'api.sqlite3')
+
+    mock_func = MagicMock(return_value=pd.DataFrame({'value': [1, 2]}))
+    type(mock_ak).shared_func = mock_func
+
+    apps = [create_app(SQLiteConfig) for _ in range(2)]
+    for app in apps:
+        app.extensions['akgate_registry'] = FunctionRegistry(mock_ak)
+
+    first = apps[0].test_client().get('/api/shared_func')
+    second = apps[1].test_client().get('/api/shared_func')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == [{'value': 1}, {'value': 2}]
+    assert mock_func.call_count == 1
@@ -0,0 +1,80 @@
+"""
+DataFrame 紧凑存储测试
+"""
+import pickle
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from app.cache import CompactFrame, MemoryCache, make_cache_key, pack, unpack
+
+
+def spot_frame(rows: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({
+        '代码': [f"{i:06d}" for i in range(rows)],
+        '名称': [f"名称{i % 50}" for i in range(rows)],
+        '板块': ['主板', '创业板'] * (rows // 2),
+        '最新价': np.linspace(1, 100, rows),
+        '成交量': np.arange(rows, dtype=np.int64),
+        '日期': pd.date_range('2024-01-01', periods=rows, freq='min'),
+        '备注': [None if i % 3 else f"备注{i}" for i in range(rows)],
+        '混合': [i if i % 2 else str(i) for i in range(rows)],
+    })
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_round_trip(compress):
+    """测试打包后还原的 DataFrame 与原数据完全一致"""
+    frame = spot_frame()
+    packed = CompactFrame.from_frame(frame, compress)
+
+    kinds = [column.kind for column in packed.packed]
+    assert kinds[:3] == ['text', 'dictionary', 'dictionary']
+    assert_frame_equal(packed.to_frame(), frame)
+    assert packed.nbytes < frame.memory_usage(index=True, deep=True).sum()
+
+
+def test_round_trip_keeps_index_and_columns():
+    """测试非默认索引与重复列名保持不变"""
+    frame = pd.DataFrame([[1, 'a', 2.0], [3, 'b', 4.0]], columns=['x', 'y', 'x'], index=['r1', 'r2'])
+    assert_frame_equal(unpack(pack(frame)), frame)
+
+
+def test_pack_passes_through_other_values():
+    """测试非 DataFrame 与空 DataFrame 原样存储"""
+    assert pack([1, 2]) == [1, 2]
+    empty = pd.DataFrame({'a': []})
+    assert pack(empty) is empty
+
+
+def test_pickle_round_trip():
+    """测试 SQLite 后端需要的序列化"""
+    frame = spot_frame(100)
+    packed = pack(frame, compress=True)
+    packed.to_frame()
+    assert_frame_equal(pickle.loads(pickle.dumps(packed)).to_frame(), frame)
+
+
+def test_memory_cache_accounts_packed_size():
+    """测试内存缓存按打包后的字节数计算占用"""
+    packed = pack(spot_frame())
+    cache = MemoryCache()
+    entry = cache.set('spot', packed, ttl=60)
+    assert entry.size == packed.nbytes
+
+
+def test_api_cache_hit_decodes_compact_frame(mock_ak, app, client):
+    """测试缓存命中时还原的结果与首次响应一致"""
+    frame = spot_frame(10)
+    type(mock_ak).compact_func = MagicMock(return_value=frame)
+
+    first = client.get('/api/compact_func')
+    entry = app.extensions['akgate_cache'].store.get(make_cache_key('compact_func', {}))
+    second = client.get('/api/compact_func')
+
+    assert isinstance(entry.value, CompactFrame)
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_data() == first.get_data()
@@ -0,0 +1,181 @@
+"""
+条件请求与响应压缩测试
+"""
+import gzip
+import json
+import time
+import zlib
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+import pytest
+
+from app.api.compression import compress_stream
+
+
+@pytest.fixture
+def mock_spot_func(mock_ak):
+    """模拟返回较大 DataFrame 的 akshare 函数"""
+    df = pd.DataFrame({
+        '代码': [f'{i:06d}' for i in range(500)],
+        '最新价': [1.0 + i / 100 for i in range(500)],
+    })
+    type(mock_ak).spot_func = MagicMock(return_value=df)
+    return df
+
+
+def test_etag_and_not_modified(client, mock_spot_func):
+    """测试响应携带强 ETag，If-None-Match 命中时返回 304"""
+    response = client.get('/api/spot_func')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert not etag.startswith('W/')
+
+    response = client.get('/api/spot_func', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert response.headers['X-Cache'] == 'HIT'
+
+    # 内容变化后 ETag 不再匹配
+    response = client.get('/api/spot_func?_limit=1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'br', 'zstd'])
+def test_compression_negotiated(client, mock_spot_func, encoding):
+    """测试按 Accept-Encoding 压缩，不同编码的表示使用不同的 ETag"""
+    if encoding == 'br':
+        decompress = pytest.importorskip('brotli').decompress
+    elif encoding == 'zstd':
+        decompress = pytest.importorskip('zstandard').ZstdDecompressor().decompressobj().decompress
+    else:
+        decompress = gzip.decompress
+
+    plain = client.get('/api/spot_func')
+    response = client.get('/api/spot_func', headers={'Accept-Encoding': encoding})
+
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.data) < len(plain.data)
+    assert decompress(response.data) == plain.data
+    assert response.headers['ETag'] != plain.headers['ETag']
+
+    response = client.get(
+        '/api/spot_func',
+        headers={'Accept-Encoding': encoding, 'If-None-Match': response.headers['ETag']},
+    )
+    assert response.status_code == 304
+
+
+def test_compression_preference_and_threshold(app, client, mock_spot_func):
+    """测试客户端权重相同时按服务端优先级选择编码，小响应不压缩"""
+    app.config['COMPRESSION_ENCODINGS'] = ('gzip', 'zstd')
+    response = client.get('/api/spot_func', headers={'Accept-Encoding': 'zstd, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    response = client.get('/api/spot_func', headers={'Accept-Encoding': 'zstd, gzip;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'zstd'
+
+    response = client.get('/api/spot_func', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in response.headers
+
+    response = client.get('/api/spot_func?_limit=1', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_streamed_response_compressed(client, mock_spot_func):
+    """测试流式响应逐块压缩，不生成 ETag"""
+    response = client.get('/api/spot_func?_format=ndjson', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'ETag' not in response.headers
+    lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+    assert len(lines) == 500
+    assert json.loads(lines[0]) == {'代码': '000000', '最新价': 1.0}
+
+
+def test_compress_stream_flushes_each_chunk():
+    """测试每块压缩后立即可解压，客户端无需等待整个响应"""
+    decompressor = zlib.decompressobj(31)
+    chunks = compress_stream(iter(['{"a": 1}\n', b'{"a": 2}\n']), 'gzip', 6)
+
+    assert decompressor.decompress(next(chunks)) == b'{"a": 1}\n'
+    assert decompressor.decompress(next(chunks)) == b'{"a": 2}\n'
+
+
+def test_response_cache_serves_encoded_bytes(app, client, mock_spot_func):
+    """测试结果缓存命中时直接返回已编码的响应体"""
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/api/spot_func?_limit=100', headers=headers)
+
+    with patch('app.api.views.make_data_response') as make_response:
+        second = client.get('/api/spot_func?_limit=100', headers=headers)
+        make_response.assert_not_called()
+
+    assert second.data == first.data
+    assert second.headers['Content-Length'] == str(len(first.data))
+    for name in ('ETag', 'Content-Encoding', 'X-Total-Count'):
+        assert second.headers[name] == first.headers[name]
+    assert second.headers['X-Cache'] == 'HIT'
+
+    response = client.get(
+        '/api/spot_func?_limit=100',
+        headers={**headers, 'If-None-Match': first.headers['ETag']},
+    )
+    assert response.status_code == 304
+
+    # 不同压缩编码与查询条件分别缓存
+    assert 'Content-Encoding' not in client.get('/api/spot_func?_limit=100').headers
+    assert len(client.get('/api/spot_func?_limit=2').get_json()) == 2
+    assert app.extensions['akgate_responses'].stats()['hits'] == 2
+
+
+def test_response_cache_follows_result_refresh(app, client, mock_spot_func, mock_ak):
+    """测试结果缓存条目刷新后不再使用旧的响应体"""
+    client.get('/api/spot_func')
+    app.extensions['akgate_cache'].store.clear()
+    mock_ak.spot_func.return_value = pd.DataFrame({'value': [1]})
+    response = client.get('/api/spot_func')
+
+    assert response.get_json() == [{'value': 1}]
+    assert app.extensions['akgate_responses'].stats()['hits'] == 0
+
+
+def test_response_cache_vary_follows_request(app, client, mock_spot_func):
+    """测试按 Accept 协商格式的响应体命中时 Vary 按本次请求设置"""
+    pytest.importorskip('pyarrow')
+    arrow = {'Accept': 'application/vnd.apache.arrow.stream'}
+
+    first = client.get('/api/spot_func', headers=arrow)
+    second = client.get('/api/spot_func', headers=arrow)
+    assert second.mimetype == 'application/vnd.apache.arrow.stream'
+    assert second.data == first.data
+    assert {'Accept', 'Accept-Encoding'} <= set(second.vary)
+
+    # 同一 URL 不带 Accept 时返回 JSON，不会命中 Arrow 响应体
+    assert client.get('/api/spot_func').mimetype == 'application/json'
+    response = client.get('/api/spot_func?_format=json')
+    assert response.mimetype == 'application/json'
+    assert set(response.vary) == {'Accept-Encoding'}
+    assert app.extensions['akgate_responses'].stats()['hits'] == 2
+
+
+def test_response_cache_stale_hit(app, client, mock_spot_func):
+    """测试过期结果在 stale-while-revalidate 窗口内复用响应体并带 Warning"""
+    from app.cache import make_cache_key
+
+    first = client.get('/api/spot_func')
+    cache = app.extensions['akgate_cache']
+    # 不触发后台刷新，保证本次请求复用原响应体
+    with patch.object(cache, '_schedule_refresh'):
+        cache.store.get(make_cache_key('spot_func', {})).expires_at = time.time() - 1
+        with patch('app.api.views.make_data_response') as make_response:
+            response = client.get('/api/spot_func')
+            make_response.assert_not_called()
+
+    assert response.headers['X-Cache'] == 'STALE'
+    assert response.headers['Warning'].startswith('110')
+    assert response.data == first.data
+    assert response.headers['ETag'] == first.headers['ETag']
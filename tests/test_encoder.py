@@ -51,3 +51,33 @@ def test_json_chinese_encoding(app, client):
     result = provider.dumps({'name': '中国股票'})
     assert '中国股票' in result
     assert '\\u' not in result
+
+
+def test_dumps_frame_matches_records(app):
+    """测试按列编码与逐行编码输出逐字节一致"""
+    import numpy as np
+
+    provider = app.json
+    df = pd.DataFrame({
+        '日期': [date(2024, 1, 1), date(2024, 1, 2), date(999, 1, 3)],
+        '时间': pd.to_datetime(['2024-01-01 09:30:00', None, '1969-12-31 23:59:59.1234567'], format='ISO8601'),
+        '时区': pd.date_range('2024-01-01', periods=3, freq='37s', tz='Asia/Shanghai'),
+        '代码': ['000001', 'a"b\\c\n%s', '中文'],
+        '收盘': [10.5, float('nan'), float('inf')],
+        '成交量': np.array([1, 2, 3], dtype='int64'),
+        '停牌': [True, False, True],
+        '混合': [None, date(2020, 1, 2), np.int64(5)],
+        '可空': pd.array([1, None, 3], dtype='Int64'),
+        '分类': pd.Categorical(['x', 'y', 'x']),
+    })
+
+    assert provider.dumps_frame(df) == provider.dumps(df.to_dict('records'))
+    assert provider.dumps_frame(df.iloc[:0]) == '[]'
+
+
+def test_dumps_frame_non_string_columns(app):
+    """测试非字符串列名回退到逐行编码"""
+    provider = app.json
+    df = pd.DataFrame({0: [1.5], 1: [datetime(2024, 1, 15)]})
+
+    assert provider.dumps_frame(df) == provider.dumps(df.to_dict('records'))
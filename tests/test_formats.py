@@ -0,0 +1,113 @@
+"""
+输出格式测试
+"""
+import io
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def mock_frame_func(mock_ak):
+    """模拟返回 DataFrame 的 akshare 函数"""
+    df = pd.DataFrame({
+        '日期': pd.to_datetime(['2024-01-02', '2024-01-03']),
+        '收盘': [10.5, float('nan')],
+        '代码': ['000001', '000001'],
+    })
+    type(mock_ak).frame_func = MagicMock(return_value=df)
+    type(mock_ak).scalar_func = MagicMock(return_value={'value': 1})
+    return df
+
+
+def test_columns_format(client, mock_frame_func):
+    """测试列式 JSON 输出"""
+    response = client.get('/api/frame_func?_format=columns')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.akgate.columns+json'
+
+    data = response.get_json()
+    assert data['columns'] == ['日期', '收盘', '代码']
+    assert data['data']['收盘'] == [10.5, None]
+    assert data['data']['日期'] == [1704153600000, 1704240000000]
+
+
+def test_reserved_params_not_passed(client, mock_ak, mock_frame_func):
+    """测试保留参数不会传递给 akshare 函数"""
+    client.get('/api/frame_func?symbol=000001&_format=json')
+    mock_ak.frame_func.assert_called_once_with(symbol='000001')
+
+
+def test_arrow_format_via_accept(client, mock_frame_func):
+    """测试通过 Accept 请求头协商 Arrow IPC 输出"""
+    pa = pytest.importorskip('pyarrow')
+
+    response = client.get(
+        '/api/frame_func',
+        headers={'Accept': 'application/vnd.apache.arrow.stream'},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.apache.arrow.stream'
+
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.column_names == ['日期', '收盘', '代码']
+    assert table.num_rows == 2
+
+
+def test_vary_accept_when_negotiated(client, mock_frame_func):
+    """测试按 Accept 协商格式的响应声明 Vary: Accept"""
+    response = client.get('/api/frame_func')
+    assert 'Accept' in response.vary
+    assert 'Accept-Encoding' in response.vary
+
+    response = client.get('/api/frame_func', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert 'Accept' in response.headers['Vary']
+
+    response = client.get('/api/frame_func?_format=columns')
+    assert 'Accept' not in response.vary
+
+
+def test_parquet_format(client, mock_frame_func):
+    """测试 Parquet 输出"""
+    pytest.importorskip('pyarrow')
+
+    response = client.get('/api/frame_func?_format=parquet')
+    assert response.status_code == 200
+
+    df = pd.read_parquet(io.BytesIO(response.data))
+    pd.testing.assert_frame_equal(df, mock_frame_func)
+
+
+def test_unsupported_format(client, mock_frame_func):
+    """测试不支持的格式"""
+    response = client.get('/api/frame_func?_format=xml')
+    assert response.status_code == 406
+    assert response.get_json()['error_code'] == 'UNSUPPORTED_FORMAT'
+
+    response = client.get('/api/scalar_func?_format=columns')
+    assert response.status_code == 406
+
+
+def test_stream_json_matches_buffered(app, client, mock_frame_func):
+    """测试流式 JSON 输出与一次性输出一致"""
+    app.config['STREAM_BATCH_ROWS'] = 1
+
+    buffered = client.get('/api/frame_func')
+    streamed = client.get('/api/frame_func?_stream=1')
+    assert streamed.is_streamed
+    assert streamed.data == buffered.data
+
+
+def test_ndjson_format(client, mock_frame_func):
+    """测试 NDJSON 流式输出"""
+    import json
+
+    response = client.get('/api/frame_func', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['代码'] for line in lines] == ['000001', '000001']
+    assert json.loads(lines[1])['收盘'] is None
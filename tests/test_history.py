@@ -0,0 +1,174 @@
+"""
+历史行情增量获取测试
+"""
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, create_autospec
+
+import pandas as pd
+
+from app.history import DataLake, DateRanges, HistorySpec, HistoryStore
+
+DATES = pd.bdate_range('2023-12-25', '2024-03-29').date
+BARS = pd.DataFrame({'日期': DATES, '收盘': range(len(DATES))})
+
+
+def fake_hist(symbol='000001', period='daily', start_date='19700101',
+              end_date='20500101', adjust=''):
+    """按日期区间返回 BARS 的模拟上游函数"""
+    start = datetime.strptime(start_date, '%Y%m%d').date()
+    end = datetime.strptime(end_date, '%Y%m%d').date()
+    return BARS[(BARS['日期'] >= start) & (BARS['日期'] <= end)].reset_index(drop=True)
+
+
+def make_store():
+    spec = HistorySpec('hist', '日期', require={'adjust': ['', 'hfq']})
+    return HistoryStore({'hist': spec})
+
+
+def test_date_ranges_merge_and_missing():
+    """测试区间合并与缺口计算"""
+    ranges = DateRanges()
+    ranges.add(date(2024, 1, 1), date(2024, 1, 10))
+    ranges.add(date(2024, 1, 20), date(2024, 1, 31))
+    assert ranges.missing(date(2024, 1, 5), date(2024, 2, 5)) == [
+        (date(2024, 1, 11), date(2024, 1, 19)),
+        (date(2024, 2, 1), date(2024, 2, 5)),
+    ]
+
+    # 相邻区间合并为一个
+    ranges.add(date(2024, 1, 11), date(2024, 1, 19))
+    assert list(ranges) == [(date(2024, 1, 1), date(2024, 1, 31))]
+    assert ranges.covers(date(2024, 1, 3), date(2024, 1, 31))
+
+
+def test_store_fetches_only_gaps():
+    """测试重叠窗口只拉取未覆盖的区间"""
+    store = make_store()
+    fetch = MagicMock(side_effect=lambda params: fake_hist(**params))
+
+    first = store.load('hist', {'symbol': '000001', 'start_date': '20240101',
+                                'end_date': '20240131'}, fetch)
+    assert len(first) == 23
+
+    second = store.load('hist', {'symbol': '000001', 'start_date': '20240115',
+                                 'end_date': '20240215'}, fetch)
+    assert fetch.call_count == 2
+    assert fetch.call_args.args[0] == {
+        'symbol': '000001', 'start_date': '20240201', 'end_date': '20240215',
+    }
+    pd.testing.assert_frame_equal(second, fake_hist(start_date='20240115', end_date='20240215'))
+
+    # 完全覆盖的窗口不再访问上游
+    third = store.load('hist', {'symbol': '000001', 'start_date': '20240110',
+                                'end_date': '20240210'}, fetch)
+    assert fetch.call_count == 2
+    pd.testing.assert_frame_equal(third, fake_hist(start_date='20240110', end_date='20240210'))
+    assert store.stats()['covered'] == 1
+
+
+def test_store_passes_through_unsupported_calls():
+    """测试不满足增量条件的调用直接透传"""
+    store = make_store()
+    fetch = MagicMock(return_value=BARS)
+
+    params = {'symbol': '000001', 'adjust': 'qfq', 'start_date': '20240101'}
+    store.load('hist', params, fetch)
+    store.load('other', {'symbol': '000001'}, fetch)
+    assert fetch.call_args_list[0].args[0] == params
+    assert store.stats()['requests'] == 0
+
+    # 上游结果缺少日期列时回退为原样调用
+    fetch = MagicMock(return_value=pd.DataFrame({'value': [1]}))
+    result = store.load('hist', {'symbol': '000001', 'end_date': '20240131'}, fetch)
+    assert list(result.columns) == ['value']
+    assert store.stats()['fallbacks'] == 1
+
+
+def test_store_does_not_retain_today():
+    """测试当天 K 线每次从上游获取且不写入存储"""
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    bars = pd.DataFrame({'date': [str(yesterday), str(today)], 'close': [1.0, 2.0]})
+    spec = HistorySpec('daily', 'date', upstream_range=False)
+    store = HistoryStore({'daily': spec})
+    fetch = MagicMock(return_value=bars)
+
+    assert len(store.load('daily', {'symbol': 'RB0'}, fetch)) == 2
+    assert fetch.call_args.args[0] == {'symbol': 'RB0'}
+    assert store.stats()['rows'] == 1
+
+    # 截止日期早于今天的请求由存储直接切片
+    result = store.load('daily', {'symbol': 'RB0', 'end_date': yesterday.strftime('%Y%m%d')}, fetch)
+    assert fetch.call_count == 1
+    assert result['close'].tolist() == [1.0]
+
+
+def test_api_uses_history_store(mock_ak, client):
+    """测试 API 对历史行情函数只请求缺口区间"""
+    mock_func = MagicMock(side_effect=fake_hist)
+    type(mock_ak).stock_zh_a_hist = mock_func
+
+    client.get('/api/stock_zh_a_hist?symbol=000001&start_date=20240101&end_date=20240131')
+    response = client.get('/api/stock_zh_a_hist?symbol=000001&start_date=20240110&end_date=20240229')
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 37
+    assert mock_func.call_count == 2
+    assert mock_func.call_args.kwargs['start_date'] == '20240201'
+
+
+def test_api_accepts_gateway_dates_for_full_series(mock_ak, client):
+    """测试上游不支持日期参数的函数可按日期区间请求，已定稿区间不再拉取完整序列"""
+    bars = BARS.rename(columns={'日期': 'date'})
+
+    def fake_futures(symbol):
+        return bars
+
+    mock_func = create_autospec(fake_futures, side_effect=fake_futures)
+    mock_ak.futures_zh_daily_sina = mock_func
+
+    first = client.get('/api/futures_zh_daily_sina?symbol=RB0&start_date=20240101&end_date=2024-01-31')
+    second = client.get('/api/futures_zh_daily_sina?symbol=RB0&start_date=20240201&end_date=20240229')
+    third = client.get('/api/futures_zh_daily_sina?symbol=RB0&end_date=20240110')
+
+    assert first.status_code == 200
+    assert len(first.get_json()) == 23
+    assert len(second.get_json()) == 21
+    assert len(third.get_json()) == 13
+    assert mock_func.call_count == 1
+    assert mock_func.call_args.kwargs == {'symbol': 'RB0'}
+
+
+def test_lake_restores_series_after_restart(tmp_path):
+    """测试持久化的 K 线在重启后直接读取，无需访问上游"""
+    spec = HistorySpec('hist', '日期')
+    fetch = MagicMock(side_effect=lambda params: fake_hist(**params))
+    params = {'symbol': '000001', 'start_date': '20231225', 'end_date': '20240131'}
+
+    store = HistoryStore({'hist': spec}, lake=DataLake(str(tmp_path)))
+    expected = store.load('hist', params, fetch)
+    assert fetch.call_count == 1
+    assert sorted(p.name for p in tmp_path.glob('hist/000001/*/*')) == [
+        '2023.feather', '2024.feather', 'meta.json',
+    ]
+
+    restarted = HistoryStore({'hist': spec}, lake=DataLake(str(tmp_path)))
+    result = restarted.load('hist', params, fetch)
+    assert fetch.call_count == 1
+    pd.testing.assert_frame_equal(result, expected)
+    assert isinstance(result['日期'][0], date)
+    assert restarted.stats()['lake']['reads'] == 1
+
+
+def test_lake_evicts_least_recently_used(tmp_path):
+    """测试超出字节预算时淘汰最久未访问的序列"""
+    spec = HistorySpec('hist', '日期')
+    fetch = MagicMock(side_effect=lambda params: fake_hist(**params))
+    lake = DataLake(str(tmp_path), max_bytes=1)
+    store = HistoryStore({'hist': spec}, lake=lake)
+
+    store.load('hist', {'symbol': '000001', 'end_date': '20240131'}, fetch)
+    store.load('hist', {'symbol': '000002', 'end_date': '20240131'}, fetch)
+
+    assert [p.name for p in tmp_path.glob('hist/*')] == ['000002']
+    assert lake.stats()['evictions'] == 1
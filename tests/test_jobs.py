@@ -0,0 +1,121 @@
+"""
+异步任务测试
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.jobs import JobManager, SQLiteJobStore
+from app.jobs.manager import Job
+
+
+def wait_for_job(client, location, timeout=5):
+    """轮询任务直到完成"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.get(location).get_json()
+        if data['status'] in ('succeeded', 'failed'):
+            return data
+        time.sleep(0.01)
+    raise AssertionError('job did not finish')
+
+
+def test_job_lifecycle(mock_ak, client):
+    """测试提交任务并获取结果"""
+    type(mock_ak).slow_func = MagicMock(return_value=pd.DataFrame({'代码': ['000001', '000002']}))
+
+    response = client.post('/api/slow_func/jobs?symbol=000001&_limit=1')
+    assert response.status_code == 202
+    location = response.headers['Location']
+    assert location == f"/jobs/{response.get_json()['job_id']}"
+
+    data = wait_for_job(client, location)
+    assert data['status'] == 'succeeded'
+    assert data['params'] == {'symbol': '000001'}
+    assert data['result'] == [{'代码': '000001'}]
+
+
+def test_job_failure(mock_ak, client):
+    """测试任务失败时返回错误信息"""
+    type(mock_ak).failing_func = MagicMock(side_effect=RuntimeError("network error"))
+
+    location = client.post('/api/failing_func/jobs').headers['Location']
+    data = wait_for_job(client, location)
+    assert data['status'] == 'failed'
+    assert data['error']['error_code'] == 'DATA_FETCH_ERROR'
+
+
+def test_job_not_found(client):
+    """测试任务不存在"""
+    response = client.get('/jobs/unknown')
+    assert response.status_code == 404
+    assert response.get_json()['error_code'] == 'JOB_NOT_FOUND'
+
+
+def test_job_queue_limit_and_retention(app):
+    """测试排队上限与结果保留数量"""
+    from app.exceptions import JobNotFoundError, JobQueueFullError
+
+    manager = JobManager(max_workers=1, max_queue=1, result_ttl=3600, max_retained=1)
+    release = threading.Event()
+
+    with app.app_context():
+        first = manager.submit(lambda job: release.wait(5), 'slow', {})
+        with pytest.raises(JobQueueFullError):
+            manager.submit(lambda job: None, 'slow', {})
+        release.set()
+        while not first.finished:
+            time.sleep(0.01)
+
+        second = manager.submit(lambda job: 'done', 'fast', {})
+        while not second.finished:
+            time.sleep(0.01)
+        assert manager.get(second.id).result == 'done'
+
+        # 新任务提交时淘汰超出保留数量的最早完成任务
+        manager.submit(lambda job: None, 'fast', {})
+        with pytest.raises(JobNotFoundError):
+            manager.get(first.id)
+        assert manager.get(second.id).status == 'succeeded'
+
+
+def test_job_shared_between_workers(app, tmp_path):
+    """测试共享任务存储时其他工作进程可查询任务状态与结果"""
+    path = str(tmp_path / 'jobs.sqlite3')
+    submitter = JobManager(store=SQLiteJobStore(path))
+    poller = JobManager(store=SQLiteJobStore(path))
+    release = threading.Event()
+
+    with app.app_context():
+        job = submitter.submit(
+            lambda job: release.wait(5) and pd.DataFrame({'代码': ['000001']}), 'slow', {},
+        )
+        assert poller.get(job.id).status in ('pending', 'running')
+        release.set()
+
+    deadline = time.time() + 5
+    while not poller.get(job.id).finished and time.time() < deadline:
+        time.sleep(0.01)
+    shared = poller.get(job.id)
+    assert shared.status == 'succeeded'
+    assert shared.result.to_dict('records') == [{'代码': '000001'}]
+
+
+def test_job_store_retention_independent_of_cache(tmp_path):
+    """测试任务存储按自身的数量与字节预算淘汰，刚完成的大结果仍可共享"""
+    store = SQLiteJobStore(str(tmp_path / 'jobs.sqlite3'), max_retained=2, max_bytes=4096)
+    jobs = []
+    for rows in (1, 1, 1, 2000):
+        job = Job('func', {}, {})
+        job.result = pd.DataFrame({'value': range(rows)})
+        job.finished_at = time.time()
+        job.status = 'succeeded'
+        store.save(job)
+        jobs.append(job)
+
+    assert [store.load(job.id) is not None for job in jobs] == [False, False, False, True]
+    assert len(store.load(jobs[-1].id).result) == 2000
+    assert store.stats()['evictions'] == 3
@@ -0,0 +1,88 @@
+"""
+Prometheus 指标测试
+"""
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_record_calls(mock_ak, client):
+    """测试请求数、耗时直方图与响应大小"""
+    type(mock_ak).metric_hist = MagicMock(return_value=pd.DataFrame({'a': [1, 2, 3]}))
+    before = sample('akgate_requests_total', function='metric_hist', status='200')
+
+    client.get('/api/metric_hist')
+    client.get('/api/metric_hist?_stream=1').get_data()
+
+    assert sample('akgate_requests_total', function='metric_hist', status='200') == before + 2
+    assert sample('akgate_upstream_seconds_count', function='metric_hist') == 1
+    assert sample('akgate_encode_seconds_count', function='metric_hist', format='json') == 2
+    assert sample('akgate_response_bytes_sum', function='metric_hist', format='json') == 2 * len(
+        '[{"a": 1}, {"a": 2}, {"a": 3}]'
+    )
+    assert sample('akgate_in_flight_requests', function='metric_hist') == 0
+
+
+def test_metrics_record_errors(mock_ak, client):
+    """测试按 error_code 统计错误，未解析的函数名使用统一标签"""
+    type(mock_ak).metric_fail = MagicMock(side_effect=Exception('boom'))
+    del mock_ak.metric_missing
+
+    client.get('/api/metric_fail')
+    client.get('/api/metric_missing')
+
+    assert sample('akgate_errors_total', function='metric_fail', error_code='DATA_FETCH_ERROR') == 1
+    assert sample('akgate_errors_total', function='_unknown', error_code='FUNCTION_NOT_FOUND') >= 1
+    assert sample('akgate_requests_total', function='metric_missing', status='404') == 0
+
+
+def test_metrics_record_unexpected_errors(mock_ak, app, client):
+    """测试未预期的异常按 500 INTERNAL_ERROR 统计"""
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    type(mock_ak).metric_crash = MagicMock(return_value=pd.DataFrame({'a': [1]}))
+
+    with patch('app.api.views.make_data_response', side_effect=RuntimeError('bug')):
+        response = client.get('/api/metric_crash')
+
+    assert response.status_code == 500
+    assert sample('akgate_errors_total', function='metric_crash', error_code='INTERNAL_ERROR') == 1
+    assert sample('akgate_requests_total', function='metric_crash', status='500') == 1
+
+
+def test_metrics_endpoint(client):
+    """测试 /metrics 输出 Prometheus 文本格式"""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert b'akgate_requests_total' in response.data
+
+
+def test_server_timing_header(mock_ak, client):
+    """测试 Server-Timing 响应头包含各处理阶段"""
+    type(mock_ak).timed_func = MagicMock(return_value={'value': 1})
+
+    response = client.get('/api/timed_func')
+
+    phases = [item.split(';')[0] for item in response.headers['Server-Timing'].split(', ')]
+    assert phases == ['validate', 'lookup', 'upstream', 'fetch', 'convert', 'encode', 'total']
+
+
+def test_profile_requires_config(mock_ak, app, client):
+    """测试 _profile 仅在启用 PROFILING_ENABLED 时返回分析报告"""
+    type(mock_ak).profiled_func = MagicMock(return_value=pd.DataFrame({'a': [1]}))
+
+    response = client.get('/api/profiled_func?_profile=1')
+    assert response.mimetype == 'application/json'
+
+    app.config['PROFILING_ENABLED'] = True
+    response = client.get('/api/profiled_func?_profile=1&_stream=1')
+    assert response.mimetype == 'text/plain'
+    report = response.get_data(as_text=True)
+    assert 'function calls' in report
+    assert 'body bytes: 10' in report
+    assert 'Server-Timing' in response.headers
@@ -0,0 +1,114 @@
+"""
+参数规范化测试
+"""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.api.params import canonicalize_params
+from app.cache import make_cache_key
+from app.exceptions import InvalidParameterError
+from app.upstream import FunctionInfo
+
+
+def demo_hist(symbol: str = '000001', period: str = 'daily', start_date: str = '19700101',
+              end_date: str = '20500101', adjust: str = '', timeout: float = None):
+    """示例-历史行情"""
+
+
+def demo_flags(limit=10, ratio=0.5, verbose=False, market='sh', **kwargs):
+    """示例-参数类型"""
+
+
+def demo_required(symbol):
+    """示例-必填参数"""
+
+
+def demo_bond(period: str = '5Y', indicator: str = '财富'):
+    """示例-默认值含大写字母"""
+
+
+HIST = FunctionInfo.from_callable('demo_hist', demo_hist)
+FLAGS = FunctionInfo.from_callable('demo_flags', demo_flags)
+
+
+def test_equivalent_requests_share_cache_key():
+    """测试语义相同的请求规范化后缓存键一致"""
+    first = canonicalize_params(HIST, {'symbol': '000001'}, case_insensitive=('period',))
+    second = canonicalize_params(
+        HIST,
+        {'symbol': ' 000001 ', 'period': 'Daily', 'start_date': '1970-01-01', 'adjust': ''},
+        case_insensitive=('period',),
+    )
+    assert first == second
+    assert make_cache_key('demo_hist', first) == make_cache_key('demo_hist', second)
+    assert first['end_date'] == '20500101'
+
+
+def test_case_insensitive_keeps_uppercase_defaults():
+    """测试默认值含大写字母的参数不转小写，避免上游按原值查表失败"""
+    bond = FunctionInfo.from_callable('demo_bond', demo_bond)
+    params = canonicalize_params(bond, {'period': '0-10Y'}, case_insensitive=('period',))
+    assert params['period'] == '0-10Y'
+    assert canonicalize_params(bond, {}, case_insensitive=('period',))['period'] == '5Y'
+
+
+def test_gateway_dates_accepted_outside_signature():
+    """测试由网关处理的日期参数不视为未知参数，并统一日期格式"""
+    info = FunctionInfo.from_callable('demo_required', demo_required)
+    params = canonicalize_params(
+        info, {'symbol': 'RB0', 'end_date': '2024-01-31'}, gateway_dates=('start_date', 'end_date'),
+    )
+    assert params == {'symbol': 'RB0', 'end_date': '20240131'}
+    with pytest.raises(InvalidParameterError, match='Invalid date'):
+        canonicalize_params(info, {'symbol': 'RB0', 'start_date': 'soon'}, gateway_dates=('start_date',))
+
+
+def test_coerce_by_default_type():
+    """测试按默认值类型转换，额外参数保留给 **kwargs"""
+    params = canonicalize_params(
+        FLAGS, {'limit': '20', 'ratio': '1', 'verbose': 'yes', 'market': 'True', 'extra': 'false'},
+    )
+    assert params == {'limit': 20, 'ratio': 1.0, 'verbose': True, 'market': 'True', 'extra': False}
+
+
+@pytest.mark.parametrize('info, params, message', [
+    (HIST, {'symbl': '000001'}, 'Unknown parameter'),
+    (HIST, {'start_date': '2024-13-01'}, 'Invalid date'),
+    (HIST, {'timeout': 'soon'}, 'expected float'),
+    (FLAGS, {'limit': '1.5'}, 'expected int'),
+    (FLAGS, {'verbose': 'maybe'}, 'expected a boolean'),
+    (FunctionInfo.from_callable('demo_required', demo_required), {}, 'Missing required'),
+])
+def test_invalid_params_rejected(info, params, message):
+    """测试未知参数、非法取值与缺少必填参数在调用前报错"""
+    with pytest.raises(InvalidParameterError, match=message):
+        canonicalize_params(info, params)
+
+
+def test_unknown_param_rejected_before_upstream(client, mock_ak):
+    """测试未知参数返回 400 且不调用上游"""
+    mock_ak.demo_hist = demo_hist
+    with patch('app.api.views.invoke_function') as invoke:
+        response = client.get('/api/demo_hist?symbol=000001&startdate=20240101')
+
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == 'INVALID_PARAMETER'
+    invoke.assert_not_called()
+
+
+def test_canonical_params_passed_upstream(client, mock_ak):
+    """测试规范化后的参数传递给上游，等价请求命中同一缓存"""
+    calls = []
+
+    def demo_daily(symbol: str = '000001', period: str = 'daily', start_date: str = '19700101'):
+        calls.append((symbol, period, start_date))
+        return pd.DataFrame({'v': [1]})
+
+    mock_ak.demo_daily = demo_daily
+    client.get('/api/demo_daily?period=Daily&start_date=2024-01-02')
+    response = client.get('/api/demo_daily?symbol=000001&start_date=20240102')
+
+    assert calls == [('000001', 'daily', '20240102')]
+    assert response.headers['X-Cache'] == 'HIT'
@@ -0,0 +1,72 @@
+"""
+缓存预热测试
+"""
+from datetime import datetime
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+from app.prewarm import CronSchedule, PrewarmTask, Prewarmer
+
+SHANGHAI = ZoneInfo('Asia/Shanghai')
+
+
+def test_cron_next_after():
+    """测试 cron 下一次触发时间"""
+    schedule = CronSchedule('29 9 * * 1-5')
+
+    # 周五 10:00 之后的下一次触发为下周一 09:29
+    friday = datetime(2024, 1, 5, 10, 0, tzinfo=SHANGHAI)
+    assert schedule.next_after(friday) == datetime(2024, 1, 8, 9, 29, tzinfo=SHANGHAI)
+
+    monday = datetime(2024, 1, 8, 9, 28, 30, tzinfo=SHANGHAI)
+    assert schedule.next_after(monday) == datetime(2024, 1, 8, 9, 29, tzinfo=SHANGHAI)
+
+    every_15 = CronSchedule('*/15 9-10 * * *')
+    assert every_15.next_after(datetime(2024, 1, 1, 10, 50)) == datetime(2024, 1, 2, 9, 0)
+    assert sorted(every_15.minutes) == [0, 15, 30, 45]
+
+
+@pytest.mark.parametrize('expression', ['* * *', '60 * * * *', '*/0 * * * *', '0 0 30 2 *'])
+def test_cron_invalid(expression):
+    """测试非法 cron 表达式"""
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(datetime(2024, 1, 1))
+
+
+def test_task_requires_single_trigger():
+    """测试预热任务必须且只能指定一种触发方式"""
+    with pytest.raises(ValueError):
+        PrewarmTask('stock_zh_a_spot_em')
+    with pytest.raises(ValueError):
+        PrewarmTask('stock_zh_a_spot_em', cron='* * * * *', interval=5)
+
+
+def test_prewarm_populates_cache(mock_ak, app, client):
+    """测试预热结果被 API 请求命中"""
+    mock_func = MagicMock(return_value=pd.DataFrame({'代码': ['000001']}))
+    type(mock_ak).spot_em = mock_func
+
+    task = PrewarmTask('spot_em', params={'market': 'sh'}, interval=60, ttl=90)
+    prewarmer = Prewarmer(app, [task])
+    assert prewarmer.run_task(task) is True
+    # 已有新鲜缓存时不重复调用上游
+    assert prewarmer.run_task(task) is False
+
+    response = client.get('/api/spot_em?market=sh')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert mock_func.call_count == 1
+    assert prewarmer.stats()['loads'] == 1
+
+
+def test_prewarm_respects_whitelist(app):
+    """测试预热同样受白名单限制"""
+    app.config['ENABLE_FUNCTION_WHITELIST'] = True
+    app.config['ALLOWED_FUNCTIONS'] = set()
+
+    task = PrewarmTask('stock_zh_a_spot_em', interval=60)
+    prewarmer = Prewarmer(app, [task])
+    assert prewarmer.run_task(task) is False
+    assert prewarmer.stats()['failures'] == 1
@@ -0,0 +1,80 @@
+"""
+结果查询测试
+"""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def mock_hist(mock_ak):
+    """模拟历史行情函数"""
+    df = pd.DataFrame({
+        '日期': [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 5)],
+        '代码': ['000001', '000001', '000002', '000002'],
+        '收盘': [10.0, 12.5, 8.0, 9.5],
+        '成交量': [100, 300, 200, 400],
+    })
+    type(mock_ak).hist_func = MagicMock(return_value=df)
+    return df
+
+
+def test_columns_and_pagination(client, mock_hist):
+    """测试列投影与分页"""
+    response = client.get('/api/hist_func?_columns=日期,收盘&_offset=1&_limit=2')
+    assert response.status_code == 200
+    assert response.headers['X-Total-Count'] == '4'
+    assert response.get_json() == [
+        {'日期': '2024-01-03', '收盘': 12.5},
+        {'日期': '2024-01-04', '收盘': 8.0},
+    ]
+
+
+def test_where_and_sort(client, mock_hist):
+    """测试过滤与排序"""
+    response = client.get('/api/hist_func?_where=收盘>=9;日期<2024-01-05&_sort=-成交量&_columns=成交量')
+    assert response.headers['X-Total-Count'] == '2'
+    assert response.get_json() == [{'成交量': 300}, {'成交量': 100}]
+
+    response = client.get('/api/hist_func?_where=代码=000002&_columns=收盘')
+    assert response.get_json() == [{'收盘': 8.0}, {'收盘': 9.5}]
+
+
+def test_query_does_not_modify_cached_result(client, mock_hist):
+    """测试查询不影响缓存中的原始结果"""
+    client.get('/api/hist_func?_limit=1')
+    response = client.get('/api/hist_func')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert len(response.get_json()) == 4
+
+
+@pytest.mark.parametrize('query', [
+    '_columns=不存在',
+    '_where=收盘',
+    '_where=收盘>abc',
+    '_limit=-1',
+    '_offset=x',
+])
+def test_invalid_query(client, mock_hist, query):
+    """测试非法查询条件"""
+    response = client.get(f'/api/hist_func?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error_code'] == 'INVALID_PARAMETER'
+
+
+def test_query_key_covers_every_field():
+    """测试响应体缓存使用的查询键由全部解析后的字段生成"""
+    from app.api.query import Query
+
+    base = Query.from_options({})
+    assert Query.from_options({'_columns': ' 收盘 , 代码 '}).key == Query.from_options({'_columns': '收盘,代码'}).key
+    keys = {base.key}
+    for options in ({'_columns': '收盘'}, {'_where': '收盘>10'}, {'_sort': '-收盘'},
+                    {'_offset': '1'}, {'_limit': '1'}):
+        keys.add(Query.from_options(options).key)
+    assert len(keys) == 6
+    # 新增字段无需单独登记即进入查询键
+    base.extra = 1
+    assert base.key not in keys
@@ -0,0 +1,73 @@
+"""
+akshare 函数注册表测试
+"""
+import types
+
+from app.upstream import FunctionRegistry
+
+
+def stock_demo_hist(symbol: str = '000001', period: str = 'daily', limit: int = 10):
+    """示例-历史行情
+
+    第二行说明
+    """
+
+
+def fund_demo_spot(market, **kwargs):
+    """示例-ETF 实时行情"""
+
+
+def make_module():
+    return types.SimpleNamespace(
+        stock_demo_hist=stock_demo_hist,
+        fund_demo_spot=fund_demo_spot,
+        _private=stock_demo_hist,
+        DemoClass=type('DemoClass', (), {}),
+        VERSION='1.0',
+    )
+
+
+def test_registry_indexes_public_functions():
+    """测试注册表只收录公开函数并解析签名"""
+    registry = FunctionRegistry(make_module())
+    registry.build()
+
+    assert len(registry) == 2
+    assert registry.get('_private') is None
+    assert registry.get('DemoClass') is None
+
+    info = registry.get('stock_demo_hist')
+    assert info.summary == '示例-历史行情'
+    assert info.to_dict()['params'][2] == {
+        'name': 'limit', 'required': False, 'default': 10, 'type': 'int',
+    }
+
+    spot = registry.get('fund_demo_spot')
+    assert spot.var_keyword is True
+    assert spot.params[0].required is True
+
+
+def test_registry_search():
+    """测试按前缀、关键字与白名单检索"""
+    registry = FunctionRegistry(make_module())
+
+    assert [info.name for info in registry.search(prefix='stock_')] == ['stock_demo_hist']
+    assert [info.name for info in registry.search(query='etf')] == ['fund_demo_spot']
+    assert [info.name for info in registry.search(names={'fund_demo_spot', 'missing'})] == [
+        'fund_demo_spot',
+    ]
+
+
+def test_list_functions_search_and_pagination(client):
+    """测试函数列表检索与分页"""
+    response = client.get('/api/?prefix=stock_zh_a_&limit=2&offset=1')
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert 'message' in data
+    assert data['count'] > 2
+    assert data['offset'] == 1
+    assert len(data['functions']) == 2
+    assert all(item['name'].startswith('stock_zh_a_') for item in data['functions'])
+
+    assert client.get('/api/?limit=-1').status_code == 400
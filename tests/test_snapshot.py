@@ -0,0 +1,125 @@
+"""
+快照版本与差异响应测试
+"""
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.cache import make_cache_key
+from app.snapshot import SnapshotStore
+
+
+def spot_frame(prices: dict) -> pd.DataFrame:
+    return pd.DataFrame({
+        '代码': list(prices),
+        '最新价': list(prices.values()),
+    })
+
+
+V1 = spot_frame({'000001': 10.0, '000002': 20.0, '000003': 30.0})
+V2 = spot_frame({'000001': 10.0, '000002': 21.0, '000004': 40.0})
+
+
+@pytest.fixture
+def mock_spot(mock_ak):
+    """模拟依次返回两个版本快照的行情函数"""
+    type(mock_ak).stock_zh_a_spot_em = MagicMock(side_effect=[V1, V2, V2])
+    return mock_ak
+
+
+def test_store_diff():
+    """测试按主键计算新增、更新与删除的行"""
+    store = SnapshotStore({'spot': '代码'})
+    first = store.record('spot', {}, V1)
+    second = store.record('spot', {}, V2)
+
+    delta = store.delta('spot', {}, second, first.version)
+    assert not delta.full
+    assert delta.inserted['代码'].tolist() == ['000004']
+    assert delta.updated.to_dict('records') == [{'代码': '000002', '最新价': 21.0}]
+    assert delta.deleted == ['000003']
+
+    # 内容相同的结果得到相同的版本号，差异结果被复用
+    assert store.record('spot', {}, V2.copy()).version == second.version
+    assert store.delta('spot', {}, second, first.version) is delta
+
+
+def test_store_keeps_frame_only_for_latest():
+    """测试较早的版本只保留主键与哈希"""
+    store = SnapshotStore({'spot': '代码'})
+    first = store.record('spot', {}, V1)
+    second = store.record('spot', {}, V2)
+
+    versions = store._series[make_cache_key('spot', {})].versions
+    assert versions[first.version].frame is None
+    assert versions[second.version].frame is V2
+    assert first.frame is V1
+    assert store.delta('spot', {}, second, first.version).deleted == ['000003']
+
+    # 内容回到较早的版本时以新数据作为最新版本
+    third = store.record('spot', {}, V1.copy())
+    assert third.version == first.version
+    assert third.frame is not None
+    assert versions[second.version].frame is None
+    assert store.stats()['versions'] == 2
+
+
+def test_store_unknown_version_returns_full():
+    """测试客户端版本未知或已淘汰时全量返回"""
+    store = SnapshotStore({'spot': '代码'}, max_versions=1)
+    first = store.record('spot', {}, V1)
+    second = store.record('spot', {}, V2)
+
+    delta = store.delta('spot', {}, second, first.version)
+    assert delta.full
+    assert len(delta.inserted) == 3
+    assert store.stats()['full'] == 1
+
+
+def test_store_rejects_duplicate_keys():
+    """测试主键重复的结果不做版本管理"""
+    store = SnapshotStore({'spot': '代码'})
+    assert store.record('spot', {}, pd.concat([V1, V1])) is None
+
+
+def test_delta_response(app, client, mock_spot):
+    """测试带 _since 的请求只返回变化的行"""
+    # 关闭结果缓存，每次请求都得到上游的新快照
+    app.config['CACHE_ENABLED'] = False
+    from app.cache import init_cache
+    init_cache(app)
+
+    response = client.get('/api/stock_zh_a_spot_em')
+    version = response.headers['X-Snapshot-Version']
+    assert len(response.get_json()) == 3
+
+    response = client.get(f'/api/stock_zh_a_spot_em?_since={version}')
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['since'] == version
+    assert data['version'] == response.headers['X-Snapshot-Version'] != version
+    assert data['full'] is False
+    assert data['inserted'] == [{'代码': '000004', '最新价': 40.0}]
+    assert data['updated'] == [{'代码': '000002', '最新价': 21.0}]
+    assert data['deleted'] == ['000003']
+
+    response = client.get('/api/stock_zh_a_spot_em?_since=unknown')
+    data = response.get_json()
+    assert data['full'] is True
+    assert data['since'] is None
+    assert len(data['inserted']) == 3
+
+
+@pytest.mark.parametrize('path, error_code', [
+    ('/api/stock_zh_a_spot_em?_since=abc&_limit=10', 'INVALID_PARAMETER'),
+    ('/api/stock_zh_a_spot_em?_since=abc&_format=columns', 'UNSUPPORTED_FORMAT'),
+    ('/api/other_func?_since=abc', 'INVALID_PARAMETER'),
+])
+def test_delta_rejected(client, mock_spot, path, error_code):
+    """测试不支持快照版本的请求返回错误"""
+    type(mock_spot).other_func = MagicMock(return_value=V1)
+    response = client.get(path)
+    assert response.status_code in (400, 406)
+    assert response.get_json()['error_code'] == error_code
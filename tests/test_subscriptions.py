@@ -0,0 +1,94 @@
+"""
+订阅推送测试
+"""
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.subscriptions import init_subscriptions
+
+
+def spot_frame(prices: dict) -> pd.DataFrame:
+    return pd.DataFrame({'代码': list(prices), '最新价': list(prices.values())})
+
+
+V1 = spot_frame({'000001': 10.0, '000002': 20.0})
+V2 = spot_frame({'000001': 10.0, '000002': 21.0})
+
+
+def read_event(chunks) -> tuple:
+    """读取下一个 SSE 事件，返回 (事件类型, ID, 数据)"""
+    for chunk in chunks:
+        text = chunk.decode('utf-8')
+        if text.startswith('event: '):
+            fields = dict(line.split(': ', 1) for line in text.strip().splitlines())
+            return fields['event'], fields.get('id'), json.loads(fields['data'])
+    raise AssertionError('stream ended')
+
+
+@pytest.fixture
+def hub(app):
+    """关闭结果缓存，轮询间隔足够长，测试中手动触发轮询"""
+    app.config['CACHE_ENABLED'] = False
+    app.config['SUBSCRIBE_INTERVAL'] = 3600
+    from app.cache import init_cache
+    init_cache(app)
+    init_subscriptions(app)
+    return app.extensions['akgate_subscriptions']
+
+
+def test_subscribers_share_feed(mock_ak, client, hub):
+    """测试相同订阅共享一个数据源，结果变化时推送差异"""
+    type(mock_ak).stock_zh_a_spot_em = MagicMock(side_effect=[V1, V2, V2])
+
+    first = client.get('/api/stock_zh_a_spot_em/subscribe', buffered=False)
+    second = client.get('/api/stock_zh_a_spot_em/subscribe', buffered=False)
+    assert first.mimetype == 'text/event-stream'
+    first_events, second_events = iter(first.response), iter(second.response)
+
+    event, version, data = read_event(first_events)
+    assert event == 'snapshot'
+    assert data['version'] == version
+    assert len(data['data']) == 2
+
+    # 结果变化：所有订阅者收到同一个差异事件
+    (feed,) = hub._feeds.values()
+    assert hub.poll(feed)
+    event, _, data = read_event(first_events)
+    assert event == 'delta'
+    assert data['since'] == version
+    assert data['updated'] == [{'代码': '000002', '最新价': 21.0}]
+
+    assert [read_event(second_events)[0] for _ in range(2)] == ['snapshot', 'delta']
+    # 结果未变化时不推送
+    assert not hub.poll(feed)
+    assert mock_ak.stock_zh_a_spot_em.call_count == 3
+    assert hub.stats()['feeds'] == 1
+    assert hub.stats()['subscribers'] == 2
+
+    first.close()
+    second.close()
+    assert hub.stats()['feeds'] == 0
+
+
+def test_poll_error_event(mock_ak, client, hub):
+    """测试上游出错时推送 error 事件"""
+    import requests
+    type(mock_ak).stock_zh_a_spot_em = MagicMock(side_effect=requests.exceptions.ConnectionError())
+
+    response = client.get('/api/stock_zh_a_spot_em/subscribe', buffered=False)
+    event, _, data = read_event(iter(response.response))
+    assert event == 'error'
+    assert data['error_code'] == 'DATA_FETCH_ERROR'
+    response.close()
+
+
+def test_subscription_limit(app, client, hub, mock_ak):
+    """测试订阅连接数达到上限时返回 503"""
+    hub.max_subscribers = 0
+    type(mock_ak).stock_zh_a_spot_em = MagicMock(return_value=V1)
+    response = client.get('/api/stock_zh_a_spot_em/subscribe')
+    assert response.status_code == 503
+    assert response.get_json()['error_code'] == 'TOO_MANY_SUBSCRIPTIONS'
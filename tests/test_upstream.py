@@ -0,0 +1,116 @@
+"""
+上游限流测试
+"""
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+import pytest
+
+from app.exceptions import UpstreamBusyError
+from app.upstream import LazyModule, TokenBucket, UpstreamGroup, UpstreamLimiter
+
+
+def test_group_matching():
+    """测试函数名映射到上游分组"""
+    limiter = UpstreamLimiter([
+        UpstreamGroup('eastmoney', ['*_em', 'stock_zh_a_hist']),
+        UpstreamGroup('sina', ['*_sina']),
+    ])
+    assert limiter.group_for('stock_zh_a_spot_em').name == 'eastmoney'
+    assert limiter.group_for('stock_zh_a_hist').name == 'eastmoney'
+    assert limiter.group_for('futures_zh_daily_sina').name == 'sina'
+    assert limiter.group_for('macro_china_cpi') is None
+
+
+def test_limits_split_across_workers():
+    """测试分组限额按工作进程数平分"""
+    limiter = UpstreamLimiter.from_config({
+        'UPSTREAM_WORKERS': 4,
+        'UPSTREAM_LIMITS': {
+            'eastmoney': {'patterns': ['*_em'], 'max_concurrency': 4, 'rate': 5, 'burst': 10},
+            'sina': {'patterns': ['*_sina'], 'max_concurrency': 2, 'rate': 2, 'burst': 5},
+        },
+    })
+    eastmoney, sina = limiter.groups
+    assert (eastmoney.max_concurrency, eastmoney.rate, eastmoney._bucket.burst) == (1, 1.25, 2)
+    assert (sina.max_concurrency, sina.rate, sina._bucket.burst) == (1, 0.5, 1)
+    assert limiter.stats()['workers'] == 4
+
+
+def test_token_bucket_reserve():
+    """测试令牌桶按速率放行"""
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve(0) == 0
+    assert bucket.reserve(0) == 0
+    assert bucket.reserve(0) is None
+    wait = bucket.reserve(1)
+    assert 0 < wait <= 0.1
+
+
+def test_concurrency_limit_rejects_after_max_wait():
+    """测试并发数达到上限后排队超时被拒绝"""
+    group = UpstreamGroup('eastmoney', ['*_em'], max_concurrency=1)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with group.acquire(timeout=1):
+            entered.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait(5)
+
+    start = time.monotonic()
+    with pytest.raises(UpstreamBusyError):
+        with group.acquire(timeout=0.05):
+            pass
+    assert time.monotonic() - start >= 0.05
+
+    release.set()
+    holder.join(5)
+    stats = group.stats()
+    assert stats['rejected'] == 1
+    assert stats['calls'] == 1
+    assert stats['in_flight'] == 0
+    assert stats['queue_depth'] == 0
+
+
+def test_api_upstream_busy(mock_ak, app, client):
+    """测试上游繁忙时返回 503"""
+    type(mock_ak).quote_em = MagicMock(return_value=pd.DataFrame({'value': [1]}))
+    app.config['UPSTREAM_LIMITS'] = {'eastmoney': {'patterns': ['*_em'], 'rate': 1, 'burst': 1}}
+    app.config['UPSTREAM_MAX_WAIT'] = 0
+    app.config['CACHE_ENABLED'] = False
+    from app.cache import init_cache
+    from app.upstream import init_limiter
+    init_cache(app)
+    init_limiter(app)
+
+    assert client.get('/api/quote_em').status_code == 200
+    response = client.get('/api/quote_em')
+    assert response.status_code == 503
+    assert response.get_json()['error_code'] == 'UPSTREAM_BUSY'
+
+
+def test_lazy_module_loads_on_first_access():
+    """测试延迟加载代理在首次访问属性时才导入模块"""
+    module = LazyModule('colorsys')
+    assert not module.is_loaded
+    assert repr(module) == "<LazyModule 'colorsys' (not loaded)>"
+
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1.0)
+    assert module.is_loaded
+    assert module.load_seconds is not None
+    assert not hasattr(module, 'missing_function')
+
+
+def test_health_detail_does_not_load_akshare(client):
+    """测试延迟加载模式下详细健康检查不会触发 akshare 导入"""
+    with patch('app.health.views.ak', LazyModule('akshare')):
+        data = client.get('/health/detail').get_json()
+    assert data['dependencies']['akshare']['loaded'] is False
+    assert data['dependencies']['akshare']['version']